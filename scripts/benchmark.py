@@ -0,0 +1,364 @@
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from emoji_carousel.carousel import ENGINES, create_carousel
+from emoji_carousel.emoji_catalog import (
+    EmojiCatalog,
+    find_by_name,
+    find_by_symbol,
+    find_many_by_symbol,
+    search_catalog,
+    search_many,
+)
+from emoji_carousel.parallel import ShardedSearch
+from emoji_carousel.renderer import FrameRenderer
+from emoji_carousel.ui import current_frame, fuzzy_suggestions
+
+# Bump when result names or units change; baselines of another format are
+# not compared.
+FORMAT = 1
+
+CAROUSEL_SIZES = [5, 100, 10_000, 1_000_000]
+CATALOG_SIZES = [200, 10_000, 100_000]
+QUICK_CAROUSEL_SIZES = [5, 1_000]
+QUICK_CATALOG_SIZES = [200, 2_000]
+
+# A case runs one round: it returns (seconds spent, operations done). Setup
+# and cleanup happen outside the timed part.
+Round = Callable[[], Tuple[float, int]]
+
+# Case names are "<group>.<op>/n=<size>" (render cases have no size).
+CAROUSEL_OPS = ("insert", "seek", "move", "remove", "to_list", "replace_items")
+CATALOG_OPS = (
+    "build", "find_by_name", "find_by_symbol", "find_many_by_symbol",
+    "search_catalog", "search_many", "fuzzy_suggestions",
+)
+PARALLEL_OPS = ("build", "search_many")
+RENDER_OPS = ("diff", "full")
+
+SYLLABLES = ["ba", "ko", "ri", "mu", "sel", "tan", "po", "vi", "ga", "lun", "dre", "fo"]
+
+
+def wanted(prefix: str, ops: Sequence[str], suffix: str, only: Optional[str]) -> List[str]:
+    # The ops whose case names contain only (all when only is empty), so a
+    # group with nothing selected can skip its setup.
+    return [op for op in ops if not only or only in f"{prefix}.{op}{suffix}"]
+
+
+def timed(operation: Callable[[], object], count: int = 1) -> Round:
+    def run() -> Tuple[float, int]:
+        start = time.perf_counter()
+        for _ in range(count):
+            operation()
+        return time.perf_counter() - start, count
+
+    return run
+
+
+def carousel_cases(
+    engine: str, size: int, only: Optional[str] = None
+) -> Iterator[Tuple[str, Round]]:
+    # Operations on a carousel holding size items; each round leaves the
+    # carousel as it found it.
+    prefix, suffix = f"carousel.{engine}", f"/n={size}"
+    ops = wanted(prefix, CAROUSEL_OPS, suffix, only)
+    if not ops:
+        return
+    items = [f"item{index}" for index in range(size)]
+    # Fewer operations per round on huge carousels, where an O(n) insert
+    # or remove would otherwise take minutes.
+    batch = min(size, 1_000 if size <= 100_000 else 100)
+    carousel = create_carousel(size + batch, engine)
+    carousel.replace_items(items)
+
+    def insert() -> Tuple[float, int]:
+        start = time.perf_counter()
+        for index in range(batch):
+            carousel.insert("right" if index & 1 else "left", "x")
+        elapsed = time.perf_counter() - start
+        carousel.replace_items(items)
+        return elapsed, batch
+
+    def remove() -> Tuple[float, int]:
+        start = time.perf_counter()
+        for _ in range(batch):
+            carousel.remove()
+        elapsed = time.perf_counter() - start
+        carousel.replace_items(items)
+        return elapsed, batch
+
+    def seek() -> Tuple[float, int]:
+        # Positional jumps with no edits in between.
+        start = time.perf_counter()
+        for index in range(batch):
+            carousel.seek(index * 7919 % size)
+        return time.perf_counter() - start, batch
+
+    cases = {
+        "insert": insert,
+        "seek": seek,
+        "move": timed(carousel.move_right, batch),
+        "remove": remove,
+        "to_list": timed(carousel.to_list),
+        "replace_items": timed(lambda: carousel.replace_items(items)),
+    }
+    for op in ops:
+        yield f"{prefix}.{op}{suffix}", cases[op]
+
+
+def synthetic_groups(size: int, seed: int = 0) -> List[dict]:
+    # size emojis with pronounceable names, in categories of 100, each with
+    # an alias and a keyword. Symbols come from the private use planes so
+    # they are unique for any size the benchmark uses.
+    rng = random.Random(seed)
+    groups: List[dict] = []
+    for start in range(0, size, 100):
+        emojis: Dict[str, str] = {}
+        aliases: Dict[str, List[str]] = {}
+        keywords: Dict[str, List[str]] = {}
+        for index in range(start, min(start + 100, size)):
+            name = "".join(rng.choice(SYLLABLES) for _ in range(3)) + str(index)
+            emojis[name] = chr(0xF0000 + index)
+            aliases[name] = [name[::-1]]
+            keywords[name] = [rng.choice(SYLLABLES) * 2]
+        groups.append(
+            {"class": f"group{start // 100}", "emojis": emojis, "aliases": aliases, "keywords": keywords}
+        )
+    return groups
+
+
+def catalog_cases(size: int, only: Optional[str] = None) -> Iterator[Tuple[str, Round]]:
+    suffix = f"/n={size}"
+    ops = wanted("catalog", CATALOG_OPS, suffix, only)
+    if not ops:
+        return
+    groups = synthetic_groups(size)
+    rng = random.Random(1)
+
+    def build() -> Tuple[float, int]:
+        start = time.perf_counter()
+        catalog = EmojiCatalog(groups)
+        catalog.search_index()
+        catalog.fuzzy_matcher()
+        return time.perf_counter() - start, 1
+
+    catalog = EmojiCatalog(groups)
+    catalog.search_index()
+    catalog.fuzzy_matcher()
+    entries = catalog.entries
+    names = [rng.choice(entries).name for _ in range(1_000)]
+    symbols = [rng.choice(entries).symbol for _ in range(1_000)]
+    queries = [rng.choice(SYLLABLES) + rng.choice(SYLLABLES) for _ in range(20)]
+    # Misspelled names: one character dropped.
+    typos = [name[:2] + name[3:] for name in names[:20]]
+
+    def over(words: List[str], lookup: Callable[[str], object]) -> Round:
+        def run() -> Tuple[float, int]:
+            start = time.perf_counter()
+            for word in words:
+                lookup(word)
+            return time.perf_counter() - start, len(words)
+
+        return run
+
+    def batched(words: List[str], lookup: Callable[[List[str]], object]) -> Round:
+        # Same work as over(), as one batch call; reported per item.
+        def run() -> Tuple[float, int]:
+            start = time.perf_counter()
+            lookup(words)
+            return time.perf_counter() - start, len(words)
+
+        return run
+
+    cases = {
+        "build": build,
+        "find_by_name": over(names, lambda name: find_by_name(catalog, name)),
+        "find_by_symbol": over(symbols, lambda symbol: find_by_symbol(catalog, symbol)),
+        "find_many_by_symbol": batched(
+            symbols, lambda chunk: find_many_by_symbol(catalog, chunk)
+        ),
+        "search_catalog": over(queries, lambda query: search_catalog(catalog, query, 20)),
+        "search_many": batched(queries, lambda chunk: search_many(catalog, chunk, 20)),
+        "fuzzy_suggestions": over(typos, lambda query: fuzzy_suggestions(catalog, query)),
+    }
+    for op in ops:
+        yield f"catalog.{op}{suffix}", cases[op]
+
+
+def parallel_cases(size: int, only: Optional[str] = None) -> Iterator[Tuple[str, Round]]:
+    # Sharded index building and batch search, beside catalog_cases' serial
+    # build and search_many. Worker start-up is part of the build time.
+    suffix = f"/n={size}"
+    ops = wanted("parallel", PARALLEL_OPS, suffix, only)
+    if not ops:
+        return
+    groups = synthetic_groups(size)
+    rng = random.Random(1)
+    queries = [rng.choice(SYLLABLES) + rng.choice(SYLLABLES) for _ in range(20)]
+
+    def build() -> Tuple[float, int]:
+        start = time.perf_counter()
+        sharded = ShardedSearch(groups)
+        elapsed = time.perf_counter() - start
+        sharded.close()
+        return elapsed, 1
+
+    def search() -> Tuple[float, int]:
+        with ShardedSearch(groups) as sharded:
+            start = time.perf_counter()
+            sharded.search_many(queries, 20)
+            return time.perf_counter() - start, len(queries)
+
+    cases = {"build": build, "search_many": search}
+    for op in ops:
+        yield f"parallel.{op}{suffix}", cases[op]
+
+
+def render_cases(
+    stream: io.TextIOBase, only: Optional[str] = None
+) -> Iterator[Tuple[str, Round]]:
+    # Frames of a carousel being scrolled, written to a redirected stream.
+    ops = wanted("render", RENDER_OPS, "", only)
+    if not ops:
+        return
+    carousel = create_carousel(50, "linked")
+    carousel.replace_items([chr(0x1F345 + index) for index in range(50)])
+    frames = []
+    for _ in range(50):
+        frames.append(current_frame(carousel))
+        carousel.move_right()
+    for op in ops:
+        renderer = FrameRenderer(stream, diff=op == "diff")
+
+        def run(renderer: FrameRenderer = renderer) -> Tuple[float, int]:
+            start = time.perf_counter()
+            for frame in frames:
+                renderer.write_frame(frame)
+            return time.perf_counter() - start, len(frames)
+
+        yield f"render.{op}", run
+
+
+def all_cases(
+    quick: bool, stream: io.TextIOBase, only: Optional[str] = None
+) -> Iterator[Tuple[str, Round]]:
+    # Every case, or those whose names contain only; groups with nothing
+    # selected are not set up at all.
+    for size in QUICK_CAROUSEL_SIZES if quick else CAROUSEL_SIZES:
+        for engine in sorted(ENGINES):
+            yield from carousel_cases(engine, size, only)
+    for size in QUICK_CATALOG_SIZES if quick else CATALOG_SIZES:
+        yield from catalog_cases(size, only)
+    if not quick:
+        yield from parallel_cases(CATALOG_SIZES[-1], only)
+    yield from render_cases(stream, only)
+
+
+def measure(run: Round, rounds: int, budget: float) -> Dict[str, float]:
+    # Best and median time per operation over at least one round, stopping
+    # early once the time budget for this case is spent.
+    samples: List[float] = []
+    operations = 0
+    spent = 0.0
+    for _ in range(rounds):
+        elapsed, count = run()
+        samples.append(elapsed / count)
+        operations += count
+        spent += elapsed
+        if spent >= budget:
+            break
+    samples.sort()
+    return {
+        "best_ns": samples[0] * 1e9,
+        "median_ns": samples[len(samples) // 2] * 1e9,
+        "rounds": len(samples),
+        "ops": operations,
+    }
+
+
+def run_benchmarks(
+    quick: bool = False,
+    rounds: int = 5,
+    budget: float = 2.0,
+    only: Optional[str] = None,
+    progress: Optional[io.TextIOBase] = None,
+) -> dict:
+    results: Dict[str, Dict[str, float]] = {}
+    with open(os.devnull, "w", encoding="utf-8") as sink:
+        for name, run in all_cases(quick, sink, only):
+            results[name] = measure(run, rounds, budget)
+            if progress is not None:
+                progress.write(f"{name:45} {results[name]['best_ns']:>14,.0f} ns/op\n")
+                progress.flush()
+    return {
+        "format": FORMAT,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "quick": quick,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    # One line per case that got slower than threshold times its baseline
+    # (best time, which is least affected by noise).
+    if baseline.get("format") != FORMAT:
+        raise ValueError("Baseline was written by an incompatible benchmark version.")
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None or before["best_ns"] <= 0:
+            continue
+        ratio = result["best_ns"] / before["best_ns"]
+        if ratio > threshold:
+            regressions.append(
+                f"{name}: {before['best_ns']:,.0f} -> {result['best_ns']:,.0f} ns/op ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Time carousel engines, catalog lookups and rendering."
+    )
+    parser.add_argument("--quick", action="store_true", help="small sizes only (for CI)")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per case (best is kept)")
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds per case before stopping early")
+    parser.add_argument("--only", metavar="TEXT", help="run cases whose name contains TEXT")
+    parser.add_argument("--output", metavar="FILE", help="write the JSON results to FILE")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against earlier results")
+    parser.add_argument(
+        "--threshold", type=float, default=1.25, help="slowdown ratio reported as a regression"
+    )
+    args = parser.parse_args(argv)
+    report = run_benchmarks(args.quick, args.rounds, args.budget, args.only, sys.stderr)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            sys.stderr.write(f"REGRESSION {line}\n")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,11 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from emoji_carousel.compiled_catalog import main
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
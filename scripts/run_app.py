@@ -1,11 +1,13 @@
 import sys
+import time
 from pathlib import Path
 
+STARTED = time.perf_counter()
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "src"))
 
-from emoji_carousel.app import main
+from emoji_carousel.app import run
 
 
 if __name__ == "__main__":
-    main()
+    run(started=STARTED)
@@ -1,5 +1,10 @@
-from .app import main
+import time
+
+# Read before the app is imported, for --startup-report.
+STARTED = time.perf_counter()
+
+from .app import run
 
 
 if __name__ == "__main__":
-    main()
+    run(started=STARTED)
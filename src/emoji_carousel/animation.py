@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Optional, Sequence, Tuple
+
+# A frame and how long it stays up, in seconds.
+Frame = Tuple[str, float]
+
+
+class AnimationScheduler:
+    # Plays frames against a clock instead of sleeping between them. New
+    # animations either interrupt whatever is still pending or queue behind
+    # it, and a tick that runs late draws only the newest frame that is due,
+    # skipping the ones it fell behind on. Drawing happens on a background
+    # timer thread (start/stop), an asyncio task (drive) or wherever tick()
+    # is called from.
+    def __init__(
+        self,
+        draw: Callable[[str], None],
+        fps: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if fps <= 0:
+            raise ValueError("Frame rate must be positive.")
+        self._draw = draw
+        self._interval = 1.0 / fps
+        self._clock = clock
+        self._queue: Deque[Tuple[float, str]] = deque()
+        self._tail = 0.0
+        self._last_draw = float("-inf")
+        self._condition = threading.Condition()
+        self._draw_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._wake: Optional[Callable[[], None]] = None
+        self.drawn = 0
+        self.skipped = 0
+
+    def play(self, frames: Sequence[Frame], interrupt: bool = False) -> None:
+        # Schedule frames back to back. interrupt drops anything not yet
+        # shown so the new animation starts now; otherwise it queues behind.
+        with self._condition:
+            now = self._clock()
+            if interrupt:
+                self.skipped += len(self._queue)
+                self._queue.clear()
+            start = max(now, self._tail) if self._queue else now
+            for text, hold in frames:
+                self._queue.append((start, text))
+                start += hold
+            self._tail = start
+            self._condition.notify()
+            wake = self._wake
+        if wake is not None:
+            wake()
+
+    def pending(self) -> bool:
+        with self._condition:
+            return bool(self._queue)
+
+    def next_deadline(self) -> Optional[float]:
+        # Clock time at which tick() next has something to draw.
+        with self._condition:
+            if not self._queue:
+                return None
+            return max(self._queue[0][0], self._last_draw + self._interval)
+
+    def tick(self) -> bool:
+        # Draw the newest due frame; returns whether frames remain.
+        with self._draw_lock:
+            with self._condition:
+                now = self._clock()
+                if now < self._last_draw + self._interval:
+                    return bool(self._queue)
+                frame = None
+                while self._queue and self._queue[0][0] <= now:
+                    if frame is not None:
+                        self.skipped += 1
+                    frame = self._queue.popleft()[1]
+                remaining = bool(self._queue)
+                if frame is not None:
+                    self._last_draw = now
+            if frame is not None:
+                self._draw(frame)
+                self.drawn += 1
+            return remaining
+
+    def finish(self) -> None:
+        # Jump to the end: draw the last pending frame now, skip the rest.
+        with self._draw_lock:
+            with self._condition:
+                if not self._queue:
+                    return
+                self.skipped += len(self._queue) - 1
+                frame = self._queue[-1][1]
+                self._queue.clear()
+                self._last_draw = self._clock()
+            self._draw(frame)
+            self.drawn += 1
+
+    def start(self) -> None:
+        # Run ticks on a daemon timer thread.
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="animation", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        # Stop the timer thread; pending frames are finished first.
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.finish()
+
+    async def drive(self) -> None:
+        # Run ticks as a task on the current event loop instead of a thread;
+        # cancel the task to stop it. asyncio is only imported here: the
+        # threaded front end never loads it.
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        self._wake = lambda: loop.call_soon_threadsafe(event.set)
+        try:
+            while True:
+                deadline = self.next_deadline()
+                if deadline is None:
+                    await event.wait()
+                else:
+                    delay = deadline - self._clock()
+                    if delay > 0:
+                        try:
+                            await asyncio.wait_for(event.wait(), delay)
+                        except asyncio.TimeoutError:
+                            pass
+                event.clear()
+                self.tick()
+        finally:
+            self._wake = None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                deadline = max(self._queue[0][0], self._last_draw + self._interval)
+                delay = deadline - self._clock()
+                if delay > 0:
+                    # Re-check afterwards: play() may have replaced the queue.
+                    self._condition.wait(delay)
+                    continue
+            self.tick()
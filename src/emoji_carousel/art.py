@@ -1,20 +1,176 @@
 """ASCII art helpers for the emoji carousel UI."""
 
+import sys
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# Marks where an emoji goes in a template line.
+SLOT = "()"
+
+_LAYOUTS: Dict[str, Tuple[str, ...]] = {
+    "first_add": (
+        '                            |‾‾|',
+        '               |‾‾‾‾‾‾‾‾‾‾‾‾|  |‾‾‾‾‾‾‾‾‾‾‾‾|',
+        '               |            |  |            |',
+        '               |            |  |            |',
+        '               |           _|  |_           |',
+        '               |          \\      /          |',
+        '               |           \\    /           |',
+        '               |____________\\  /____________|',
+        '                             \\/',
+        '',
+    ),
+    "last_del": (
+        '                             /\\',
+        '               |‾‾‾‾‾‾‾‾‾‾‾‾/  \\‾‾‾‾‾‾‾‾‾‾‾‾|',
+        '               |           /    \\           |',
+        '               |          /_    _\\          |',
+        '               |            |  |            |',
+        '               |            |  |            |',
+        '               |            |  |            |',
+        '               |____________|  |____________|',
+        '                            |__|',
+        '',
+    ),
+    "not_last_del": (
+        '                             /\\ ',
+        ' __________    |‾‾‾‾‾‾‾‾‾‾‾‾/  \\‾‾‾‾‾‾‾‾‾‾‾‾|    __________',
+        '           |   |           /    \\           |   |',
+        '           |   |          /_    _\\          |   |',
+        ' ()        |   |            |  |            |   |        ()',
+        '           |   |            |  |            |   |',
+        ' __________|   |            |  |            |   |__________',
+        '               |____________|  |____________|',
+        '                            |__|',
+    ),
+    "one_item_print": (
+        '                             ↓↓',
+        '               |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾|',
+        '               |                            |',
+        '               |                            |',
+        '               |             ()             |',
+        '               |                            |',
+        '               |                            |',
+        '               |____________________________|',
+    ),
+    "three_item_print": (
+        '                             ↓↓',
+        ' __________    |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾|    __________',
+        '           |   |                            |   |          ',
+        '           |   |                            |   |          ',
+        ' ()        |   |             ()             |   |        ()',
+        '           |   |                            |   |          ',
+        ' __________|   |                            |   |__________',
+        '               |____________________________|',
+    ),
+    "print_going_left": (
+        '                 /|                      ',
+        ' __________     / |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾|    __________',
+        '           |   /  |                         |   |',
+        '           |  /    ‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾| |',
+        ' ()        | |              Left              | |        ()',
+        '           |  \\    ___________________________| |',
+        ' __________|   \\  |                         |   |__________',
+        '                \\ |_________________________|',
+        '                 \\|',
+    ),
+    "print_adding_left_one": (
+        '                 /|',
+        '                / |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾|',
+        '               /  |                         |',
+        '              /    ‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾|',
+        '             |           Adding Left          |',
+        '              \\    ___________________________|',
+        '               \\  |                         |',
+        '                \\ |_________________________|',
+        '                 \\|',
+    ),
+    "print_adding_left_two": (
+        '                 /|                      ',
+        ' __________     / |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾|    __________',
+        '           |   /  |                         |   |',
+        '           |  /    ‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾| |',
+        ' ()        | |           Adding Left          | |        ()',
+        '           |  \\    ___________________________| |',
+        ' __________|   \\  |                         |   |__________',
+        '                \\ |_________________________|',
+        '                 \\|',
+    ),
+    "print_going_right": (
+        '                                         |\\',
+        ' __________    |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾| \\     __________',
+        '           |   |                         |  \\   |',
+        '           | |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾    \\  |',
+        ' ()        | |            Right               | |        ()',
+        '           | |___________________________    /  |',
+        ' __________|   |                         |  /   |__________',
+        '               |_________________________| /',
+        '                                         |/',
+    ),
+    "print_adding_right_one": (
+        '                                         |\\',
+        '               |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾| \\',
+        '               |                         |  \\',
+        '             |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾    \\',
+        '             |        Adding Right            |',
+        '             |___________________________    /',
+        '               |                         |  /',
+        '               |_________________________| /',
+        '                                         |/',
+        '',
+    ),
+    "print_adding_right_two": (
+        '                                         |\\',
+        ' __________    |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾| \\     __________',
+        '           |   |                         |  \\   |',
+        '           | |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾    \\  |',
+        ' ()        | |        Adding Right            | |        ()',
+        '           | |___________________________    /  |',
+        ' __________|   |                         |  /   |__________',
+        '               |_________________________| /',
+        '                                         |/',
+        '',
+    ),
+}
+
+
+def _compile(lines: Tuple[str, ...]) -> Tuple[str, ...]:
+    # Split a layout at its slots once, so rendering is a single join.
+    return tuple("".join(line + "\n" for line in lines).split(SLOT))
+
+
+TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    name: _compile(lines) for name, lines in _LAYOUTS.items()
+}
+
+
+@lru_cache(maxsize=1024)
+def render(template: str, *slots: str) -> str:
+    '''
+        builds a complete frame from a template and
+        its emojis (cached per template and emojis)
+        return: str
+    '''
+    chunks = TEMPLATES[template]
+    if len(slots) != len(chunks) - 1:
+        raise ValueError(f"Template {template!r} takes {len(chunks) - 1} emojis.")
+    parts = [chunks[0]]
+    for slot, chunk in zip(slots, chunks[1:]):
+        parts.append(slot)
+        parts.append(chunk)
+    return "".join(parts)
+
+
+def _emit(frame: str) -> None:
+    sys.stdout.write(frame)
+
+
 def first_add():
     '''
         prints the first item adding sequence
         return: None
     '''
-    print("                            |‾‾|")
-    print("               |‾‾‾‾‾‾‾‾‾‾‾‾|  |‾‾‾‾‾‾‾‾‾‾‾‾|")
-    print("               |            |  |            |")
-    print("               |            |  |            |")
-    print("               |           _|  |_           |")
-    print("               |          \      /          |")
-    print("               |           \    /           |")
-    print("               |____________\  /____________|")
-    print("                             \/")
-    print("")
+    _emit(render("first_add"))
 
 
 def last_del():
@@ -23,169 +179,80 @@ def last_del():
         deleting sequence
         return: None
     '''
-    print("                             /\\")
-    print("               |‾‾‾‾‾‾‾‾‾‾‾‾/  \‾‾‾‾‾‾‾‾‾‾‾‾|")
-    print("               |           /    \           |")
-    print("               |          /_    _\          |")
-    print("               |            |  |            |")
-    print("               |            |  |            |")
-    print("               |            |  |            |")
-    print("               |____________|  |____________|")
-    print("                            |__|")
-    print("")
-    
-    
+    _emit(render("last_del"))
+
+
 def not_last_del(first: str,second: str):
     '''
         prints an item deleting sequence(not the last)
         return: None
     '''
-    print("                             /\ ")
-    print(" __________    |‾‾‾‾‾‾‾‾‾‾‾‾/  \‾‾‾‾‾‾‾‾‾‾‾‾|    __________")
-    print("           |   |           /    \           |   |")
-    print("           |   |          /_    _\          |   |")
-    print(" ()        |   ".replace("()",first),end='')
-    print("|            |  |            |   |        ()".replace("()",second))
-    print("           |   |            |  |            |   |")
-    print(" __________|   |            |  |            |   |__________")
-    print("               |____________|  |____________|")
-    print("                            |__|")
-    
+    _emit(render("not_last_del", first, second))
+
 
 def one_item_print(item: str):
     '''
         prints the one item board
         return: None
     '''
-    print("                             ↓↓")
-    print("               |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾|")
-    print("               |                            |")
-    print("               |                            |")
-    print("               |             ()             |".replace("()",item))
-    print("               |                            |")
-    print("               |                            |")
-    print("               |____________________________|")
-       
+    _emit(render("one_item_print", item))
+
 
 def three_item_print(first: str,current: str,second: str):
     '''
         prints the three item board
         return: None
     '''
-    print("                             ↓↓")
-    print(" __________    |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾|    __________")
-    print("           |   |                            |   |          ")
-    print("           |   |                            |   |          ")
-    print(" ()        |   ".replace("()",first),end='')
-    print("|             ()             |   ".replace("()",current),end='')
-    print("|        ()".replace("()",second))
-    print("           |   |                            |   |          ")
-    print(" __________|   |                            |   |__________")
-    print("               |____________________________|")
-    
-    
+    _emit(render("three_item_print", first, current, second))
+
+
 def print_going_left(first: str,second: str):
     '''
         prints the going left sequence
         return: None
     '''
-    print("                 /|                      ")
-    print(" __________     / |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾|    __________")
-    print("           |   /  |                         |   |")
-    print("           |  /    ‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾| |")
-    print(" ()        | ".replace("()",first,1),end='')
-    print("|              Left              | |        ()".replace("()",second,1))
-    print("           |  \    ___________________________| |")
-    print(" __________|   \  |                         |   |__________")
-    print("                \ |_________________________|")
-    print("                 \|")
-   
-   
+    _emit(render("print_going_left", first, second))
+
+
 def print_adding_left_one():
     '''
         prints the adding left sequence
         when we only have one item
         return: None
     '''
-    print("                 /|")
-    print("                / |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾|")
-    print("               /  |                         |")
-    print("              /    ‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾|")
-    print("             |           Adding Left          |")
-    print("              \    ___________________________|")
-    print("               \  |                         |")
-    print("                \ |_________________________|")
-    print("                 \|")
-    
-    
+    _emit(render("print_adding_left_one"))
+
+
 def print_adding_left_two(first: str,second: str):
     '''
         prints the adding left sequence 
         when we have more than one item
         return: None
     '''
-    print("                 /|                      ")
-    print(" __________     / |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾|    __________")
-    print("           |   /  |                         |   |")
-    print("           |  /    ‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾| |")
-    print(" ()        | ".replace("()",first,1),end='')
-    print("|           Adding Left          | |        ()".replace("()",second,1))
-    print("           |  \    ___________________________| |")
-    print(" __________|   \  |                         |   |__________")
-    print("                \ |_________________________|")
-    print("                 \|")
-    
-    
+    _emit(render("print_adding_left_two", first, second))
+
+
 def print_going_right(first: str,second: str):
     '''
         prints the going right sequence
         return: None
     '''
-    print("                                         |\\")
-    print(" __________    |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾| \     __________")
-    print("           |   |                         |  \   |")
-    print("           | |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾    \  |")
-    print(" ()        | ".replace("()",first,1),end='')
-    print("|            Right               | |        ()".replace("()",second,1))
-    print("           | |___________________________    /  |")
-    print(" __________|   |                         |  /   |__________")
-    print("               |_________________________| /")
-    print("                                         |/")
-    
-    
+    _emit(render("print_going_right", first, second))
+
+
 def print_adding_right_one():
     '''
         prints the adding right sequence
         when we only have one item
         return: None
     '''
-    print("                                         |\\")
-    print("               |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾| \\")
-    print("               |                         |  \\")
-    print("             |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾    \\")
-    print("             |        Adding Right            |")
-    print("             |___________________________    /")
-    print("               |                         |  /")
-    print("               |_________________________| /")
-    print("                                         |/")
-    print("")
-    
-    
+    _emit(render("print_adding_right_one"))
+
+
 def print_adding_right_two(first: str,second: str):
     '''
         prints the adding left sequence 
         when we have more than one item
         return: None
     '''
-    print("                                         |\\")
-    print(" __________    |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾| \     __________")
-    print("           |   |                         |  \   |")
-    print("           | |‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾    \  |")
-    print(" ()        | ".replace("()",first,1),end='')
-    print("|        Adding Right            | |        ()".replace("()",second,1))
-    print("           | |___________________________    /  |")
-    print(" __________|   |                         |  /   |__________")
-    print("               |_________________________| /")
-    print("                                         |/")
-    print("")
-    
+    _emit(render("print_adding_right_two", first, second))
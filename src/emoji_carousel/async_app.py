@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List, Optional
+
+from .app import CAROUSEL_ENGINE, finish_session, menu_frame, play, start_session
+from .commands import Command, choose, parse_line, perform
+from .keys import KEY_BACKSPACE, KEY_ENTER, KEY_EOF, KEY_LEFT, KEY_RIGHT, KeyReader
+from .session import MAX_SIZE, CarouselSession
+from .ui import RENDERER, SCHEDULER, clear_screen
+
+# Keys that act the moment they are pressed on an empty command line.
+HOTKEYS = {"l": "l", "r": "r", KEY_LEFT: "l", KEY_RIGHT: "r"}
+
+
+def _write(text: str) -> None:
+    stream = RENDERER.stream
+    stream.write(text)
+    stream.flush()
+
+
+async def read_line(
+    reader: KeyReader, prompt: str = "", hotkeys: bool = False
+) -> Optional[str]:
+    # Line editor over single keys; None when the input ends. With hotkeys,
+    # a hotkey pressed on an empty line is returned as its command at once.
+    _write(prompt)
+    buffer: List[str] = []
+    while True:
+        key = await reader.read_key()
+        if key is None or key == KEY_EOF:
+            return None
+        if hotkeys and reader.raw and not buffer and key in HOTKEYS:
+            return HOTKEYS[key]
+        # Typing ends the running animation so the echo lands on the prompt.
+        SCHEDULER.finish()
+        if key == KEY_ENTER:
+            if reader.raw:
+                _write("\n")
+            return "".join(buffer).strip().lower()
+        if key == KEY_BACKSPACE:
+            if buffer:
+                buffer.pop()
+                if reader.raw:
+                    _write("\b \b")
+        elif len(key) == 1 and key.isprintable():
+            buffer.append(key)
+            if reader.raw:
+                _write(key)
+
+
+async def read_command(
+    session: CarouselSession, reader: KeyReader, status: str = ""
+) -> Optional[str]:
+    # Queue the menu behind the running animation and read a command; l/r
+    # (and the arrow keys) navigate without Enter while there is room to.
+    SCHEDULER.play([(menu_frame(session, status), 0.0)])
+    return await read_line(reader, hotkeys=session.size() > 1)
+
+
+async def ask(
+    command: Command, session: CarouselSession, reader: KeyReader
+) -> Optional[List[str]]:
+    # Run the command's question flow on the line editor; None when the
+    # input ends half way.
+    flow = command.ask(session)
+    if flow is None:
+        return []
+    try:
+        prompt = next(flow)
+        while True:
+            answer = await read_line(reader, prompt)
+            if answer is None:
+                flow.close()
+                return None
+            prompt = flow.send(answer)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def dispatch(
+    session: CarouselSession, reader: KeyReader, command: Command, args: List[str]
+) -> str:
+    # Run one command, asking follow-up questions as needed. Returns the
+    # status line for the next menu ("" when there is nothing to report).
+    try:
+        if not args:
+            args = await ask(command, session, reader)
+            if args is None:
+                return ""
+        result = perform(session, command, command.parse(args), play)
+    except ValueError as error:
+        return str(error)
+    output = command.show(result, color=True)
+    if output:
+        RENDERER.invalidate()
+        print(output)
+        await read_line(reader, "Press enter to continue ")
+    return ""
+
+
+async def run(
+    engine: str = CAROUSEL_ENGINE,
+    reader: Optional[KeyReader] = None,
+    session_path: Optional[str] = None,
+    capacity: int = MAX_SIZE,
+) -> None:
+    # Event-loop front end: keys are read as they arrive and dispatched to
+    # the session while the animation scheduler draws on its own task.
+    clear_screen()
+    session = start_session(engine, session_path, capacity)
+    animator = asyncio.create_task(SCHEDULER.drive())
+    status = ""
+    if reader is None:
+        reader = KeyReader()
+    try:
+        async with reader as keys:
+            while True:
+                line = await read_command(session, keys, status)
+                if line is None:
+                    break
+                try:
+                    words = parse_line(line)
+                    if not words:
+                        status = ""
+                        continue
+                    command = choose(session, words)
+                except ValueError as error:
+                    status = str(error)
+                    continue
+                if command.quits:
+                    break
+                status = await dispatch(session, keys, command, words[1:])
+    finally:
+        animator.cancel()
+        SCHEDULER.finish()
+        finish_session(session, session_path)
+
+
+def main(
+    engine: str = CAROUSEL_ENGINE,
+    session_path: Optional[str] = None,
+    capacity: int = MAX_SIZE,
+) -> None:
+    asyncio.run(run(engine, session_path=session_path, capacity=capacity))
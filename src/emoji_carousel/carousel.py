@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Dict, Type, Union
+
+from .circular_doubly_linked_list import CircularDoublyLinkedList
+from .ring_buffer import RingBufferCarousel
+
+Carousel = Union[CircularDoublyLinkedList, RingBufferCarousel]
+
+ENGINES: Dict[str, Type[Carousel]] = {
+    "linked": CircularDoublyLinkedList,
+    "ring": RingBufferCarousel,
+}
+
+DEFAULT_ENGINE = "linked"
+
+
+def create_carousel(capacity: int, engine: str = DEFAULT_ENGINE) -> Carousel:
+    # Build a carousel backed by the requested storage engine.
+    try:
+        factory = ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"Unknown carousel engine: {engine!r}.") from None
+    return factory(capacity)
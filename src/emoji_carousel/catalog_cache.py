@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from .compiled_catalog import CompiledCatalog
+from .emoji_catalog import DEFAULT_CATALOG_PATH, EmojiCatalog, load_catalog
+
+# Bump when the pickled EmojiCatalog layout changes.
+DISK_FORMAT = 1
+CACHE_DIR_ENV = "EMOJI_CAROUSEL_CACHE_DIR"
+
+Signature = Tuple[int, int, str]
+
+
+class CatalogCache:
+    # Shares loaded, indexed catalogs between callers. Entries are keyed by
+    # resolved path and checked against the file's size and mtime (plus a
+    # content hash when use_hash is set) on every lookup, so an edited file
+    # is reloaded. An optional directory holds pickles of the indexed form
+    # for other processes.
+    def __init__(
+        self,
+        max_entries: int = 8,
+        disk_dir: Optional[Path] = None,
+        use_hash: bool = False,
+        loader: Callable[[Path], EmojiCatalog] = load_catalog,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("Cache size must be positive.")
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.use_hash = use_hash
+        self._loader = loader
+        self._entries: "OrderedDict[Path, Tuple[Signature, EmojiCatalog]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "disk_hits": 0, "evictions": 0}
+
+    def get(self, path: Optional[Path] = None) -> EmojiCatalog:
+        # Return the cached catalog for path, loading it on a miss.
+        path = (path or DEFAULT_CATALOG_PATH).resolve()
+        signature = self._signature(path)
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None and cached[0] == signature:
+                self._entries.move_to_end(path)
+                self._stats["hits"] += 1
+                return cached[1]
+            self._stats["misses"] += 1
+            catalog = self._read_disk(path, signature)
+            if catalog is None:
+                catalog = self._loader(path)
+                self._write_disk(path, signature, catalog)
+            else:
+                self._stats["disk_hits"] += 1
+            self._entries[path] = (signature, catalog)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+            return catalog
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        # Forget one catalog (memory and disk), or everything when path is None.
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                if self.disk_dir is not None and self.disk_dir.is_dir():
+                    for stale in self.disk_dir.glob("*.pickle"):
+                        stale.unlink()
+                return
+            path = path.resolve()
+            self._entries.pop(path, None)
+            disk_path = self._disk_path(path)
+            if disk_path is not None and disk_path.exists():
+                disk_path.unlink()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, size=len(self._entries))
+
+    def _signature(self, path: Path) -> Signature:
+        stat = path.stat()
+        digest = ""
+        if self.use_hash:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        return stat.st_size, stat.st_mtime_ns, digest
+
+    def _disk_path(self, path: Path) -> Optional[Path]:
+        if self.disk_dir is None:
+            return None
+        key = hashlib.sha1(str(path).encode("utf-8")).hexdigest()
+        return self.disk_dir / f"{key}.pickle"
+
+    def _read_disk(self, path: Path, signature: Signature) -> Optional[EmojiCatalog]:
+        disk_path = self._disk_path(path)
+        if disk_path is None:
+            return None
+        try:
+            with disk_path.open("rb") as handle:
+                stored_format, stored_signature, catalog = pickle.load(handle)
+        except (
+            OSError, EOFError, AttributeError, ImportError, pickle.UnpicklingError,
+            TypeError, ValueError,
+        ):
+            return None
+        if stored_format != DISK_FORMAT or stored_signature != signature:
+            return None
+        return catalog
+
+    def _write_disk(self, path: Path, signature: Signature, catalog: EmojiCatalog) -> None:
+        disk_path = self._disk_path(path)
+        # A compiled catalog is already a fast on-disk form (and holds an mmap).
+        if disk_path is None or isinstance(catalog, CompiledCatalog):
+            return
+        # Build the lazy indexes so the pickle carries the indexed form.
+        catalog.search_index()
+        catalog.fuzzy_matcher()
+        partial = disk_path.with_name(disk_path.name + ".tmp")
+        try:
+            disk_path.parent.mkdir(parents=True, exist_ok=True)
+            with partial.open("wb") as handle:
+                pickle.dump((DISK_FORMAT, signature, catalog), handle, pickle.HIGHEST_PROTOCOL)
+            os.replace(partial, disk_path)
+        except OSError:
+            # The disk layer is optional: keep the in-memory catalog.
+            try:
+                partial.unlink()
+            except OSError:
+                pass
+
+
+_default_cache: Optional[CatalogCache] = None
+
+
+def default_cache() -> CatalogCache:
+    # Process-wide cache; $EMOJI_CAROUSEL_CACHE_DIR turns on the disk layer.
+    global _default_cache
+    if _default_cache is None:
+        disk_dir = os.environ.get(CACHE_DIR_ENV)
+        _default_cache = CatalogCache(disk_dir=Path(disk_dir) if disk_dir else None)
+    return _default_cache
+
+
+def get_catalog(path: Optional[Path] = None) -> EmojiCatalog:
+    # Shared, indexed catalog for path (defaults to the bundled data).
+    return default_cache().get(path)
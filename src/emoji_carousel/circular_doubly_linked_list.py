@@ -1,18 +1,25 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional
+import sys
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    import random
+
+from .symbols import intern_symbol, legacy_frame_bytes, symbol_bytes
 
 
-@dataclass
 class _Node:
+    # Slotted so each frame costs three references and no __dict__.
+    __slots__ = ("data", "next", "prev")
+
     data: str
     next: "_Node"
     prev: "_Node"
 
     def __init__(self, data: str) -> None:
         # Point to self to keep the list circular even for one node.
-        self.data = data
+        self.data = intern_symbol(data)
         self.next = self
         self.prev = self
 
@@ -23,15 +30,29 @@ class CircularDoublyLinkedList:
             raise ValueError("Capacity must be positive.")
         self._capacity = capacity
         self._size = 0
+        # Bumped on every structural change so live iterators can notice.
+        self._version = 0
         self._current: Optional[_Node] = None
+        # The cursor's absolute position, kept up to date by every edit, and
+        # the nodes in head order. Edits only relink and mark the list stale
+        # (dropping a big list is itself O(n)); it is rebuilt on the next
+        # positional access, so inserts and removes stay O(1).
+        self._cursor = 0
+        self._nodes: List[_Node] = []
+        self._stale = False
 
     def add(self, item: str) -> None:
         # Add the first item to an empty list.
         if self._size != 0:
             raise ValueError("List already initialized; use insert().")
         self._ensure_space()
-        self._current = _Node(item)
+        node = _Node(item)
+        self._current = node
+        self._nodes = [node]
+        self._stale = False
+        self._cursor = 0
         self._size = 1
+        self._version += 1
 
     def insert(self, position: str, item: str) -> None:
         # Insert left or right of the current node.
@@ -56,19 +77,45 @@ class CircularDoublyLinkedList:
             node.prev = current
             right.prev = node
             current.next = node
+            self._cursor += 1
+        self._stale = True
         self._current = node
         self._size += 1
+        self._version += 1
 
     def move_left(self) -> str:
         current = self._require_current()
         self._current = current.prev
+        self._cursor = (self._cursor - 1) % self._size
         return self._current.data
 
     def move_right(self) -> str:
         current = self._require_current()
         self._current = current.next
+        self._cursor = (self._cursor + 1) % self._size
+        return self._current.data
+
+    def seek(self, index: int) -> str:
+        # Jump straight to an absolute position (negative counts from the end).
+        position = self._position(index)
+        self._current = self._node_list()[position]
+        self._cursor = position
         return self._current.data
 
+    def current_index(self) -> int:
+        self._require_current()
+        return self._cursor
+
+    def index_of(self, item: str) -> int:
+        # Absolute position of the first matching item.
+        for index, node in enumerate(self._node_list()):
+            if node.data == item:
+                return index
+        raise ValueError(f"{item!r} is not in the carousel.")
+
+    def __getitem__(self, index: int) -> str:
+        return self._node_list()[self._position(index)].data
+
     def peek_left(self) -> str:
         current = self._require_current()
         return current.prev.data
@@ -87,11 +134,17 @@ class CircularDoublyLinkedList:
         removed = current.data
         if self._size == 1:
             self._current = None
+            self._cursor = 0
+            self._nodes = []
+            self._stale = False
         else:
             current.prev.next = current.next
             current.next.prev = current.prev
             self._current = current.prev
+            self._cursor = (self._cursor - 1) % (self._size - 1)
+            self._stale = True
         self._size -= 1
+        self._version += 1
         return removed
 
     def size(self) -> int:
@@ -110,13 +163,55 @@ class CircularDoublyLinkedList:
             node = node.next
         return items
 
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[str]:
+        # Lazily walk items in absolute order from the head.
+        return self._walk(0, 1, self._size)
+
+    def __reversed__(self) -> Iterator[str]:
+        return self._walk(self._size - 1, -1, self._size)
+
+    def iter_from_current(self, reverse: bool = False) -> Iterator[str]:
+        # Lazily walk once around the ring starting at the current node.
+        self._require_current()
+        return self._walk(self._cursor, -1 if reverse else 1, self._size)
+
+    def iter_window(self, k: int) -> Iterator[str]:
+        # Up to k items centered on the current node, left to right.
+        self._require_current()
+        count = min(k, self._size)
+        return self._walk(self._cursor - (count - 1) // 2, 1, count)
+
+    def shuffle(self, rng: Optional[random.Random] = None) -> None:
+        # Permute the existing nodes in place and relink them; no new nodes.
+        if self._size == 0:
+            return
+        import random
+
+        nodes = self._node_list()
+        (rng or random).shuffle(nodes)
+        previous = nodes[-1]
+        for node in nodes:
+            previous.next = node
+            node.prev = previous
+            previous = node
+        self._current = nodes[0]
+        self._cursor = 0
+        self._version += 1
+
     def replace_items(self, items: List[str]) -> None:
         # Replace all items while keeping the carousel circular.
         if len(items) > self._capacity:
             raise ValueError("Carousel is full.")
         if not items:
             self._current = None
+            self._nodes = []
+            self._stale = False
+            self._cursor = 0
             self._size = 0
+            self._version += 1
             return
 
         nodes = [_Node(item) for item in items]
@@ -125,13 +220,182 @@ class CircularDoublyLinkedList:
             node.prev = nodes[index - 1]
             node.next = nodes[(index + 1) % count]
         self._current = nodes[0]
+        self._nodes = nodes
+        self._stale = False
+        self._cursor = 0
         self._size = count
+        self._version += 1
+
+    def insert_many(self, position: str, items: Iterable[str]) -> None:
+        # Bulk insert; same result as calling insert(position, item) per item
+        # but with one capacity check and one relink.
+        self._insert_nodes(position, [_Node(item) for item in items], stack=True)
+
+    def splice(self, other: object, position: str = "right") -> None:
+        # Move every item of another carousel next to the current node,
+        # keeping their order. Nodes from another linked list are relinked,
+        # not copied.
+        if other is self:
+            raise ValueError("Cannot splice a carousel into itself.")
+        if isinstance(other, CircularDoublyLinkedList):
+            block = other._ring_nodes()
+        else:
+            block = [_Node(item) for item in other.to_list()]
+        self._insert_nodes(position, block, stack=False)
+        other.replace_items([])
+
+    def remove_range(self, count: int, direction: str = "left") -> List[str]:
+        # Remove the current node and count - 1 neighbors in one relink.
+        # "left" matches count calls to remove(); "right" takes the current
+        # node and the ones after it. Focus lands left of the removed run.
+        if direction not in {"left", "right"}:
+            raise ValueError("Direction must be 'left' or 'right'.")
+        if count <= 0:
+            return []
+        current = self._require_current()
+        size = self._size
+        if count > size:
+            raise ValueError("Cannot remove more items than the carousel holds.")
+        # Walk the count nodes being removed, from the current one outwards.
+        removed: List[str] = []
+        node = current
+        for _ in range(count):
+            removed.append(node.data)
+            last = node
+            node = node.prev if direction == "left" else node.next
+        if count == size:
+            self.replace_items([])
+            return removed
+
+        cursor = self._cursor
+        if direction == "left":
+            left, right = last.prev, current.next
+            start = (cursor - count + 1) % size
+        else:
+            left, right = current.prev, last.next
+            start = cursor
+        left.next = right
+        right.prev = left
+        end = (start + count - 1) % size
+        kept = size - count
+        # The removed run may wrap past the head.
+        self._cursor = (start - 1) % kept if start <= end else start - end - 2
+        self._current = left
+        self._size = kept
+        self._stale = True
+        self._version += 1
+        return removed
+
+    def rotate(self, steps: int) -> str:
+        # Spin the carousel: same as steps move_right() calls (negative moves
+        # left), done as one jump.
+        self._require_current()
+        return self.seek((self._cursor + steps) % self._size)
+
+    def _insert_nodes(self, position: str, block: List[_Node], stack: bool) -> None:
+        if position not in {"left", "right"}:
+            raise ValueError("Position must be 'left' or 'right'.")
+        count = len(block)
+        if count == 0:
+            return
+        if self._size + count > self._capacity:
+            raise ValueError("Carousel is full.")
+        if stack and position == "left":
+            # Repeated left inserts stack each new item in front of the last.
+            block.reverse()
+
+        for index in range(1, count):
+            block[index - 1].next = block[index]
+            block[index].prev = block[index - 1]
+        if self._size == 0:
+            left = block[-1]
+            right = block[0]
+            focus = 0 if position == "left" else count - 1
+            self._cursor = focus
+        else:
+            current = self._require_current()
+            if position == "left":
+                left = current.prev
+                right = current
+                focus = 0
+            else:
+                left = current
+                right = current.next
+                focus = count - 1
+                self._cursor += count
+        left.next = block[0]
+        block[0].prev = left
+        right.prev = block[-1]
+        block[-1].next = right
+        self._current = block[focus]
+        self._stale = True
+        self._size += count
+        self._version += 1
+
+    def memory_report(self) -> Dict[str, int]:
+        # Bytes per frame for the slotted layout versus the old dict-backed one.
+        nodes = self._node_list()
+        frames = len(nodes)
+        items = [node.data for node in nodes]
+        total = (
+            sum(sys.getsizeof(node) for node in nodes)
+            + sys.getsizeof(nodes)
+            + symbol_bytes(items)
+        )
+        legacy = legacy_frame_bytes(items)
+        return {
+            "frames": frames,
+            "total_bytes": total,
+            "bytes_per_frame": total // frames if frames else 0,
+            "legacy_total_bytes": legacy,
+            "legacy_bytes_per_frame": legacy // frames if frames else 0,
+        }
+
+    def _walk(self, start: int, step: int, count: int) -> Iterator[str]:
+        # Capture the version now so changes before the first next() count.
+        version = self._version
+        nodes = self._node_list()
+        size = self._size
+
+        def generate() -> Iterator[str]:
+            for offset in range(count):
+                if self._version != version:
+                    raise RuntimeError("Carousel changed during iteration.")
+                yield nodes[(start + step * offset) % size].data
+
+        return generate()
+
+    def _ring_nodes(self) -> List[_Node]:
+        # Nodes once around the ring, starting at the current one.
+        if self._current is None:
+            return []
+        nodes = [self._current]
+        node = self._current.next
+        while node is not self._current:
+            nodes.append(node)
+            node = node.next
+        return nodes
+
+    def _node_list(self) -> List[_Node]:
+        # Nodes in head order; one O(n) walk after each edit, then O(1)
+        # positional access until the next one.
+        if self._stale:
+            ring = self._ring_nodes()
+            split = self._size - self._cursor
+            self._nodes = ring[split:] + ring[:split]
+            self._stale = False
+        return self._nodes
 
     def _ensure_space(self) -> None:
         # Enforce the fixed capacity.
         if self._size >= self._capacity:
             raise ValueError("Carousel is full.")
 
+    def _position(self, index: int) -> int:
+        if not -self._size <= index < self._size:
+            raise IndexError("Carousel index out of range.")
+        return index % self._size
+
     def _require_current(self) -> _Node:
         if self._current is None:
             raise IndexError("Carousel is empty.")
@@ -0,0 +1,554 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Callable, ContextManager, Dict, Generator, List, Optional, Tuple
+
+from .animation import Frame
+from .history import Record
+from .session import CarouselSession
+from .ui import (
+    PROMPT,
+    action_frame,
+    add_frame,
+    describe,
+    format_info,
+    format_matches,
+    fuzzy_suggestions,
+    render_matches,
+    sample_names,
+    transition,
+)
+
+if TYPE_CHECKING:
+    from .emoji_catalog import EmojiInfo
+
+DIRECTIONS = frozenset({"left", "right"})
+
+# Set by metrics.enable()/disable(); while False the metrics module is never
+# imported, so a plain launch does not pay for it.
+TIMED = False
+
+Request = Tuple[str, ...]
+# An interactive question flow: yields prompts, is sent the answers and
+# returns the command's arguments (None when there is nothing left to do).
+Prompts = Generator[str, str, Optional[List[str]]]
+
+
+def parse_line(line: str) -> List[str]:
+    # Split a command line into words; quotes group words, '#' starts a comment.
+    import shlex
+
+    return shlex.split(line, comments=True)
+
+
+def timer(name: str, **labels: str) -> ContextManager[object]:
+    # METRICS.timer() while metrics are on, a no-op context otherwise.
+    if not TIMED:
+        return nullcontext()
+    from .metrics import METRICS
+
+    return METRICS.timer(name, **labels)
+
+
+def render_state(session: CarouselSession) -> str:
+    # One-line view of a carousel: items in order, the current one bracketed.
+    carousel = session.carousel
+    if carousel.size() == 0:
+        return "(empty)"
+    current = carousel.current_index()
+    return " ".join(
+        f"[{item}]" if index == current else item for index, item in enumerate(carousel)
+    )
+
+
+def split_side(args: List[str]) -> Tuple[List[str], str]:
+    # Separate an optional trailing left/right from the other arguments.
+    if args and args[-1].lower() in DIRECTIONS:
+        return args[:-1], args[-1].lower()
+    return args, ""
+
+
+def side_for(session: CarouselSession, direction: str) -> str:
+    # The first frame needs no side; later ones go right unless told.
+    if session.size() == 0:
+        return ""
+    return direction or "right"
+
+
+def resolve(session: CarouselSession, query: str) -> EmojiInfo:
+    # An emoji by name or by the symbol itself.
+    catalog = session.catalog
+    emoji = catalog.find_by_name(query.lower()) or catalog.find_by_symbol(query)
+    if emoji is None:
+        raise ValueError(f"Unknown emoji: {query!r}.")
+    return emoji
+
+
+def ask_side(
+    session: CarouselSession,
+    question: Optional[str] = "On which side do you want to add emoji frame? (left/right):",
+    prompt: str = PROMPT,
+) -> Generator[str, str, str]:
+    # Ask where a new frame goes; the first frame needs no side.
+    if session.size() == 0:
+        return ""
+    if question:
+        print(question)
+    direction = yield prompt
+    if direction not in DIRECTIONS:
+        raise ValueError("Invalid direction.")
+    return direction
+
+
+class Command(ABC):
+    # One carousel command. Front ends find it by name in COMMANDS and call
+    # its hooks in order: ask (interactive questions) or parse (typed
+    # arguments), validate, render (transition frames), execute, then show
+    # to turn the result into text. Commands that change the carousel return
+    # the history Record they pushed from execute; undo takes it back. Every
+    # hook raises ValueError with a user-facing message when the command
+    # cannot run.
+    name = ""
+    help = ""
+    usage = ""
+    undoable = False
+    quits = False
+
+    def available(self, session: CarouselSession) -> bool:
+        # Whether the interactive front ends accept the command right now.
+        return True
+
+    def listed(self, session: CarouselSession) -> bool:
+        # Whether the menu offers it right now.
+        return bool(self.help) and self.available(session)
+
+    def ask(self, session: CarouselSession) -> Optional[Prompts]:
+        # Question flow for the interactive front ends; None asks nothing.
+        return None
+
+    def parse(self, args: List[str]) -> Request:
+        if args:
+            raise ValueError(f"Usage: {self.usage or self.name}.")
+        return ()
+
+    def validate(self, session: CarouselSession, request: Request) -> None:
+        pass
+
+    def render(self, session: CarouselSession, request: Request) -> List[Frame]:
+        return []
+
+    @abstractmethod
+    def execute(self, session: CarouselSession, request: Request) -> object:
+        ...
+
+    def undo(self, session: CarouselSession, result: object) -> None:
+        # Revert this command's own effect, given what execute returned.
+        # Refuses once other actions have been recorded on top of it.
+        if not self.undoable or not isinstance(result, Record):
+            raise ValueError(f"{self.name} cannot be undone.")
+        session.undo_record(result)
+
+    def show(self, result: object, color: bool = False) -> Optional[str]:
+        return None
+
+
+class MoveCommand(Command):
+    undoable = True
+
+    def __init__(self, name: str, direction: str) -> None:
+        self.name = name
+        self.direction = direction
+        self.help = f"{name.upper()}: Move {direction}"
+
+    def available(self, session: CarouselSession) -> bool:
+        return session.size() > 1
+
+    def validate(self, session: CarouselSession, request: Request) -> None:
+        if session.size() <= 1:
+            raise ValueError("Not enough items to move.")
+
+    def render(self, session: CarouselSession, request: Request) -> List[Frame]:
+        carousel = session.carousel
+        return transition(carousel, action_frame(carousel, self.name))
+
+    def execute(self, session: CarouselSession, request: Request) -> object:
+        session.move(self.direction)
+        return session.history.last()
+
+
+class AddCommand(Command):
+    name = "add"
+    help = "ADD: Add an emoji frame"
+    usage = "add NAME [left|right]"
+    undoable = True
+
+    def available(self, session: CarouselSession) -> bool:
+        return not session.is_full()
+
+    def ask(self, session: CarouselSession) -> Prompts:
+        print("What do you want to add?")
+        if session.size() == 0:
+            examples = sample_names(session.catalog)
+            if examples:
+                print(f"Examples: {', '.join(examples)}")
+        name = yield PROMPT
+        direction = yield from ask_side(session)
+        if not session.catalog.find_by_name(name):
+            # Offer close names and search results to pick from.
+            suggestions = fuzzy_suggestions(session.catalog, name)
+            if suggestions:
+                print("Did you mean:")
+                for suggestion in suggestions:
+                    print(f"  {suggestion}")
+            render_matches(session.catalog.search(name))
+            name = yield "Pick a name from the list (blank to cancel): "
+            if not name or not session.catalog.find_by_name(name):
+                raise ValueError("No emoji selected.")
+        return [name, direction] if direction else [name]
+
+    def parse(self, args: List[str]) -> Request:
+        words, direction = split_side(args)
+        if not words:
+            raise ValueError(f"Usage: {self.usage}.")
+        return " ".join(words), direction
+
+    def validate(self, session: CarouselSession, request: Request) -> None:
+        resolve(session, request[0])
+        if session.is_full():
+            raise ValueError("Carousel is full.")
+
+    def render(self, session: CarouselSession, request: Request) -> List[Frame]:
+        carousel = session.carousel
+        return transition(carousel, add_frame(carousel, side_for(session, request[1])))
+
+    def execute(self, session: CarouselSession, request: Request) -> object:
+        name, direction = request
+        session.add(resolve(session, name).symbol, side_for(session, direction))
+        return session.history.last()
+
+
+class CategoryCommand(AddCommand):
+    # Browse a category; naming an emoji from it adds that emoji.
+    name = "category"
+    help = "CATEGORY: Browse a category"
+    usage = "category NAME [EMOJI [left|right]]"
+
+    def available(self, session: CarouselSession) -> bool:
+        return True
+
+    def listed(self, session: CarouselSession) -> bool:
+        return not session.is_full()
+
+    def ask(self, session: CarouselSession) -> Prompts:
+        categories = session.catalog.list_categories()
+        print("Pick a category:")
+        if categories:
+            print(", ".join(categories))
+        category = yield PROMPT
+        matches = session.catalog.list_by_category(category)
+        render_matches(matches)
+        if not matches or session.is_full():
+            yield "Press enter to continue "
+            return None
+        selection = yield "Pick a name to add (blank to cancel): "
+        if not selection:
+            return None
+        if not session.catalog.find_by_name(selection):
+            raise ValueError("Invalid emoji name.")
+        direction = yield from ask_side(session, None, "Add left or right? (left/right): ")
+        return [category, selection, direction] if direction else [category, selection]
+
+    def parse(self, args: List[str]) -> Request:
+        words, direction = split_side(args)
+        if not words or len(words) > 2:
+            raise ValueError(f"Usage: {self.usage}.")
+        return words[0], words[1] if len(words) > 1 else "", direction
+
+    def validate(self, session: CarouselSession, request: Request) -> None:
+        if request[1]:
+            super().validate(session, request[1:])
+
+    def render(self, session: CarouselSession, request: Request) -> List[Frame]:
+        return super().render(session, request[1:]) if request[1] else []
+
+    def execute(self, session: CarouselSession, request: Request) -> object:
+        if request[1]:
+            return super().execute(session, request[1:])
+        return session.catalog.list_by_category(request[0])
+
+    def undo(self, session: CarouselSession, result: object) -> None:
+        if not isinstance(result, Record):
+            raise ValueError("Browsing a category cannot be undone.")
+        super().undo(session, result)
+
+    def show(self, result: object, color: bool = False) -> Optional[str]:
+        if result is None or isinstance(result, Record):
+            return None
+        return format_matches(result, color)
+
+
+class RandomCommand(Command):
+    name = "random"
+    help = "RANDOM: Add a random emoji"
+    usage = "random [left|right]"
+    undoable = True
+
+    def available(self, session: CarouselSession) -> bool:
+        return not session.is_full()
+
+    def ask(self, session: CarouselSession) -> Prompts:
+        direction = yield from ask_side(session)
+        return [direction] if direction else []
+
+    def parse(self, args: List[str]) -> Request:
+        words, direction = split_side(args)
+        if words:
+            raise ValueError(f"Usage: {self.usage}.")
+        return (direction,)
+
+    def validate(self, session: CarouselSession, request: Request) -> None:
+        if session.is_full():
+            raise ValueError("Carousel is full.")
+        # Raises when the catalog is empty.
+        session.random_emoji()
+
+    def render(self, session: CarouselSession, request: Request) -> List[Frame]:
+        carousel = session.carousel
+        return transition(carousel, add_frame(carousel, side_for(session, request[0])))
+
+    def execute(self, session: CarouselSession, request: Request) -> object:
+        session.add(session.random_emoji().symbol, side_for(session, request[0]))
+        return session.history.last()
+
+
+class ShuffleCommand(Command):
+    name = "shuffle"
+    help = "SHUFFLE: Randomize carousel order"
+    undoable = True
+
+    def validate(self, session: CarouselSession, request: Request) -> None:
+        if session.size() <= 1:
+            raise ValueError("Not enough items to shuffle.")
+
+    def execute(self, session: CarouselSession, request: Request) -> object:
+        session.shuffle()
+        return session.history.last()
+
+
+class SearchCommand(Command):
+    name = "search"
+    help = "SEARCH: Find emojis by name or category"
+    usage = "search QUERY"
+
+    def ask(self, session: CarouselSession) -> Prompts:
+        print("Search by emoji name or category:")
+        query = yield PROMPT
+        return [query]
+
+    def parse(self, args: List[str]) -> Request:
+        return (" ".join(args),)
+
+    def execute(self, session: CarouselSession, request: Request) -> object:
+        return session.catalog.search(request[0])
+
+    def show(self, result: object, color: bool = False) -> Optional[str]:
+        return format_matches(result, color)
+
+
+class DeleteCommand(Command):
+    name = "del"
+    help = "DEL: Delete current emoji frame"
+    undoable = True
+
+    def available(self, session: CarouselSession) -> bool:
+        return session.size() >= 1
+
+    def validate(self, session: CarouselSession, request: Request) -> None:
+        if session.size() == 0:
+            raise ValueError("Nothing to delete.")
+
+    def render(self, session: CarouselSession, request: Request) -> List[Frame]:
+        carousel = session.carousel
+        return transition(carousel, action_frame(carousel, "del"))
+
+    def execute(self, session: CarouselSession, request: Request) -> object:
+        session.delete()
+        return session.history.last()
+
+
+class InfoCommand(Command):
+    name = "info"
+    help = "INFO: Retrieve info about current frame"
+
+    def available(self, session: CarouselSession) -> bool:
+        return session.size() >= 1
+
+    def validate(self, session: CarouselSession, request: Request) -> None:
+        if session.size() == 0:
+            raise ValueError("Carousel is empty.")
+
+    def execute(self, session: CarouselSession, request: Request) -> object:
+        symbol = session.carousel.current_item()
+        return session.catalog.find_by_symbol(symbol) or symbol
+
+    def show(self, result: object, color: bool = False) -> Optional[str]:
+        if isinstance(result, str):
+            return result
+        return format_info(result) if color else describe(result)
+
+
+class HistoryCommand(Command):
+    # undo/redo with an optional step count.
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self.usage = f"{name} [N]"
+
+    def parse(self, args: List[str]) -> Request:
+        if len(args) > 1 or (args and (not args[0].isdigit() or int(args[0]) == 0)):
+            raise ValueError("Expected a positive step count.")
+        return (args[0],) if args else ("1",)
+
+    def execute(self, session: CarouselSession, request: Request) -> object:
+        steps = int(request[0])
+        return session.undo(steps) if self.name == "undo" else session.redo(steps)
+
+
+class QuitCommand(Command):
+    name = "q"
+    help = "Q: Quit the program"
+    quits = True
+
+    def execute(self, session: CarouselSession, request: Request) -> object:
+        return None
+
+
+class ShowCommand(Command):
+    name = "show"
+
+    def execute(self, session: CarouselSession, request: Request) -> object:
+        return render_state(session)
+
+    def show(self, result: object, color: bool = False) -> Optional[str]:
+        return str(result)
+
+
+class MetricsCommand(Command):
+    # Not in the menu: dumps the collected metrics on demand.
+    name = "metrics"
+    usage = "metrics [json|prometheus]"
+
+    def parse(self, args: List[str]) -> Request:
+        if len(args) > 1 or (args and args[0] not in ("json", "prometheus")):
+            raise ValueError(f"Usage: {self.usage}.")
+        return (args[0] if args else "prometheus",)
+
+    def validate(self, session: CarouselSession, request: Request) -> None:
+        if not TIMED:
+            raise ValueError("Metrics are off (start with --metrics FILE).")
+
+    def execute(self, session: CarouselSession, request: Request) -> object:
+        from .metrics import METRICS
+
+        return METRICS.to_json() if request[0] == "json" else METRICS.to_prometheus().rstrip()
+
+    def show(self, result: object, color: bool = False) -> Optional[str]:
+        return str(result)
+
+
+class ResetCommand(Command):
+    # Start over with an empty carousel (for generating several in one run).
+    name = "reset"
+
+    def execute(self, session: CarouselSession, request: Request) -> object:
+        session.reset()
+        return None
+
+
+# Registry, in menu order.
+COMMANDS: Dict[str, Command] = {
+    command.name: command
+    for command in (
+        MoveCommand("l", "left"),
+        MoveCommand("r", "right"),
+        AddCommand(),
+        CategoryCommand(),
+        RandomCommand(),
+        ShuffleCommand(),
+        SearchCommand(),
+        DeleteCommand(),
+        InfoCommand(),
+        HistoryCommand("undo", "UNDO: Undo the last action"),
+        HistoryCommand("redo", "REDO: Redo the last undone action"),
+        QuitCommand(),
+        ShowCommand(),
+        MetricsCommand(),
+        ResetCommand(),
+    )
+}
+
+
+def lookup(name: str) -> Command:
+    try:
+        return COMMANDS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown command: {name!r}.") from None
+
+
+def choose(session: CarouselSession, words: List[str]) -> Command:
+    # The command an interactive front end should run for a typed line.
+    command = COMMANDS.get(words[0].lower()) if words else None
+    if command is None or not command.available(session):
+        raise ValueError("Invalid command.")
+    return command
+
+
+def menu_lines(session: CarouselSession) -> List[str]:
+    return [command.help for command in COMMANDS.values() if command.listed(session)]
+
+
+def perform(
+    session: CarouselSession,
+    command: Command,
+    request: Request,
+    play: Optional[Callable[[List[Frame]], None]] = None,
+) -> object:
+    # Validate and execute a parsed request, handing its transition frames
+    # to play first (front ends without animation pass nothing).
+    if TIMED:
+        return _perform_timed(session, command, request, play)
+    command.validate(session, request)
+    if play is not None:
+        frames = command.render(session, request)
+        if frames:
+            play(frames)
+    return command.execute(session, request)
+
+
+def _perform_timed(
+    session: CarouselSession,
+    command: Command,
+    request: Request,
+    play: Optional[Callable[[List[Frame]], None]],
+) -> object:
+    # perform() with every phase timed and the outcome counted.
+    from .metrics import METRICS
+
+    name = command.name
+    outcome = "error"
+    try:
+        with METRICS.timer("command_seconds", command=name):
+            with METRICS.timer("phase_seconds", command=name, phase="validate"):
+                command.validate(session, request)
+            if play is not None:
+                with METRICS.timer("phase_seconds", command=name, phase="render"):
+                    frames = command.render(session, request)
+                    if frames:
+                        play(frames)
+            with METRICS.timer("phase_seconds", command=name, phase="execute"):
+                result = command.execute(session, request)
+        outcome = "ok"
+        return result
+    finally:
+        METRICS.increment("commands_total", command=name, outcome=outcome)
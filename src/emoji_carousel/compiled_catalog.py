@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .emoji_catalog import DEFAULT_CATALOG_PATH, EmojiCatalog, EmojiInfo
+from .symbols import intern_symbol
+
+# Layout (little-endian, every array is u32):
+#   header
+#   string offsets  [strings + 1]   byte offsets into the blob
+#   groups          [groups * 3]    category sid, first entry, entry count
+#   entries         [entries * 3]   name sid, symbol sid, group
+#   name order      [entries]       entry ids sorted by (name, id)
+#   symbol order    [entries]       entry ids sorted by (symbol, id)
+#   alias offsets   [entries + 1]   ranges in the extras array
+#   keyword offsets [entries + 1]   ranges in the extras array
+#   extras          [...]           alias and keyword sids
+#   blob                            utf-8 string data
+MAGIC = b"EMJC"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHQQIII")
+_U32 = struct.Struct("<I")
+
+
+def compiled_path_for(source: Path) -> Path:
+    return source.with_suffix(".bin")
+
+
+def compile_catalog(source: Optional[Path] = None, target: Optional[Path] = None) -> Path:
+    # Pack the JSON catalog into the binary format next to it.
+    if source is None:
+        source = DEFAULT_CATALOG_PATH
+    if target is None:
+        target = compiled_path_for(source)
+    with source.open("r", encoding="utf-8") as handle:
+        groups = json.load(handle)
+
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def sid(text: str) -> int:
+        if text not in string_ids:
+            string_ids[text] = len(strings)
+            strings.append(text)
+        return string_ids[text]
+
+    group_rows: List[int] = []
+    entry_rows: List[int] = []
+    names: List[str] = []
+    symbols: List[str] = []
+    alias_offsets = [0]
+    alias_ids: List[int] = []
+    keyword_lists: List[List[int]] = []
+    for group_id, group in enumerate(groups):
+        emojis = group.get("emojis", {})
+        aliases = group.get("aliases", {})
+        keywords = group.get("keywords", {})
+        group_rows += [sid(group.get("class", "")), len(names), len(emojis)]
+        for name, symbol in emojis.items():
+            entry_rows += [sid(name), sid(symbol), group_id]
+            names.append(name)
+            symbols.append(symbol)
+            alias_ids += [sid(alias) for alias in aliases.get(name, ())]
+            alias_offsets.append(len(alias_ids))
+            keyword_lists.append([sid(keyword) for keyword in keywords.get(name, ())])
+    keyword_offsets = [len(alias_ids)]
+    extras = list(alias_ids)
+    for keyword_ids in keyword_lists:
+        extras += keyword_ids
+        keyword_offsets.append(len(extras))
+
+    count = len(names)
+    name_order = sorted(range(count), key=lambda entry: (names[entry], entry))
+    symbol_order = sorted(range(count), key=lambda entry: (symbols[entry], entry))
+    encoded = [text.encode("utf-8") for text in strings]
+    string_offsets = [0]
+    for chunk in encoded:
+        string_offsets.append(string_offsets[-1] + len(chunk))
+
+    stat = source.stat()
+    arrays = (
+        string_offsets + group_rows + entry_rows + name_order + symbol_order
+        + alias_offsets + keyword_offsets + extras
+    )
+    payload = b"".join(
+        [
+            _HEADER.pack(
+                MAGIC, VERSION, 0, stat.st_size, stat.st_mtime_ns,
+                len(strings), len(groups), count,
+            ),
+            struct.pack(f"<{len(arrays)}I", *arrays),
+            b"".join(encoded),
+        ]
+    )
+    # Write then rename so readers never map a half-written file.
+    partial = target.with_name(target.name + ".tmp")
+    partial.write_bytes(payload)
+    os.replace(partial, target)
+    return target
+
+
+def load_compiled(path: Path, source: Optional[Path] = None) -> Optional["CompiledCatalog"]:
+    # Map a compiled catalog; None when missing, corrupt or older than source.
+    try:
+        with path.open("rb") as handle:
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(buffer) < _HEADER.size:
+        buffer.close()
+        return None
+    magic, version, _, size, mtime_ns, *_ = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != VERSION:
+        buffer.close()
+        return None
+    if source is not None:
+        try:
+            stat = source.stat()
+        except OSError:
+            stat = None
+        if stat is not None and (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+            buffer.close()
+            return None
+    try:
+        return CompiledCatalog(buffer)
+    except ValueError:
+        # Truncated or inconsistent with its header.
+        buffer.close()
+        return None
+
+
+class CompiledCatalog(EmojiCatalog):
+    # Memory-mapped catalog. Lookups by name or symbol binary-search the
+    # sorted arrays in the file and decode only the strings they touch; the
+    # full in-memory indexes are built on the first call that needs them.
+    _LAZY = frozenset(
+        {
+            "_groups", "_entries", "_by_name", "_by_symbol", "_by_category",
+            "_categories", "_search_index", "_fuzzy_matcher",
+        }
+    )
+
+    def __init__(self, buffer: mmap.mmap) -> None:
+        self._buffer = buffer
+        _, _, _, _, _, strings, groups, entries = _HEADER.unpack_from(buffer, 0)
+        self._string_count = strings
+        self._group_count = groups
+        self._entry_count = entries
+        offset = _HEADER.size
+        self._string_offsets = offset
+        offset += 4 * (strings + 1)
+        self._group_rows = offset
+        offset += 12 * groups
+        self._entry_rows = offset
+        offset += 12 * entries
+        self._name_order = offset
+        offset += 4 * entries
+        self._symbol_order = offset
+        offset += 4 * entries
+        self._alias_offsets = offset
+        offset += 4 * (entries + 1)
+        self._keyword_offsets = offset
+        offset += 4 * (entries + 1)
+        # Every array and the string blob must lie inside the file.
+        if offset > len(buffer):
+            raise ValueError("Compiled catalog is truncated.")
+        extras = self._u32(self._keyword_offsets + 4 * entries)
+        self._extras = offset
+        self._blob = offset + 4 * extras
+        if self._blob + self._u32(self._string_offsets + 4 * strings) > len(buffer):
+            raise ValueError("Compiled catalog is truncated.")
+
+    def __getattr__(self, name: str) -> object:
+        # Only reached for attributes EmojiCatalog sets in __init__.
+        if name not in CompiledCatalog._LAZY:
+            raise AttributeError(name)
+        EmojiCatalog.__init__(self, self._read_groups())
+        return self.__dict__[name]
+
+    def find_by_name(self, name: str) -> Optional[EmojiInfo]:
+        entry = self._bisect(self._name_order, 0, name)
+        return None if entry is None else self._info(entry)
+
+    def find_by_symbol(self, symbol: str) -> Optional[EmojiInfo]:
+        entry = self._bisect(self._symbol_order, 1, symbol)
+        return None if entry is None else self._info(entry)
+
+    def find_many_by_name(self, names: Iterable[str]) -> List[Optional[EmojiInfo]]:
+        return self._find_many(self._name_order, 0, names)
+
+    def find_many_by_symbol(self, symbols: Iterable[str]) -> List[Optional[EmojiInfo]]:
+        return self._find_many(self._symbol_order, 1, symbols)
+
+    def list_categories(self) -> List[str]:
+        categories = {self._string(self._u32(self._group_rows + 12 * group))
+                      for group in range(self._group_count)}
+        return sorted(category for category in categories if category)
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def _u32(self, offset: int) -> int:
+        return _U32.unpack_from(self._buffer, offset)[0]
+
+    def _string(self, string_id: int) -> str:
+        start, end = struct.unpack_from("<II", self._buffer, self._string_offsets + 4 * string_id)
+        return self._buffer[self._blob + start:self._blob + end].decode("utf-8")
+
+    def _string_bytes(self, string_id: int) -> bytes:
+        start, end = struct.unpack_from("<II", self._buffer, self._string_offsets + 4 * string_id)
+        return self._buffer[self._blob + start:self._blob + end]
+
+    def _entry(self, entry: int) -> Tuple[int, int, int]:
+        return struct.unpack_from("<III", self._buffer, self._entry_rows + 12 * entry)
+
+    def _bisect(self, order: int, column: int, key: str) -> Optional[int]:
+        # First entry (lowest id) whose name/symbol equals key.
+        target = key.encode("utf-8")
+        low, high = 0, self._entry_count
+        while low < high:
+            middle = (low + high) // 2
+            entry = self._u32(order + 4 * middle)
+            if self._string_bytes(self._entry(entry)[column]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._entry_count:
+            return None
+        entry = self._u32(order + 4 * low)
+        if self._string_bytes(self._entry(entry)[column]) != target:
+            return None
+        return entry
+
+    def _find_many(
+        self, order: int, column: int, keys: Iterable[str]
+    ) -> List[Optional[EmojiInfo]]:
+        # Each distinct key is resolved once, straight from the sorted column
+        # in the file: a binary search per key when there are few, otherwise
+        # one merge pass over the column with the keys sorted the same way
+        # (UTF-8 byte order is code point order).
+        keys = list(keys)
+        distinct = sorted(set(keys))
+        count = self._entry_count
+        found: Dict[str, Optional[EmojiInfo]] = {}
+        if len(distinct) * count.bit_length() < count:
+            for key in distinct:
+                entry = self._bisect(order, column, key)
+                found[key] = None if entry is None else self._info(entry)
+        else:
+            index = 0
+            for key in distinct:
+                target = key.encode("utf-8")
+                while index < count:
+                    entry = self._u32(order + 4 * index)
+                    current = self._string_bytes(self._entry(entry)[column])
+                    if current >= target:
+                        break
+                    index += 1
+                hit = index < count and current == target
+                found[key] = self._info(entry) if hit else None
+        return [found[key] for key in keys]
+
+    def _extras_range(self, offsets: int, entry: int) -> Tuple[str, ...]:
+        start, end = struct.unpack_from("<II", self._buffer, offsets + 4 * entry)
+        return tuple(self._string(self._u32(self._extras + 4 * index)) for index in range(start, end))
+
+    def _info(self, entry: int) -> EmojiInfo:
+        name_id, symbol_id, group = self._entry(entry)
+        return EmojiInfo(
+            name=self._string(name_id),
+            symbol=intern_symbol(self._string(symbol_id)),
+            category=self._string(self._u32(self._group_rows + 12 * group)),
+            aliases=self._extras_range(self._alias_offsets, entry),
+            keywords=self._extras_range(self._keyword_offsets, entry),
+        )
+
+    def _read_groups(self) -> List[dict]:
+        # Rebuild the JSON-shaped groups from the packed arrays.
+        groups: List[dict] = []
+        for group in range(self._group_count):
+            category_id, first, count = struct.unpack_from(
+                "<III", self._buffer, self._group_rows + 12 * group
+            )
+            emojis: Dict[str, str] = {}
+            aliases: Dict[str, Sequence[str]] = {}
+            keywords: Dict[str, Sequence[str]] = {}
+            for entry in range(first, first + count):
+                info = self._info(entry)
+                emojis[info.name] = info.symbol
+                if info.aliases:
+                    aliases[info.name] = list(info.aliases)
+                if info.keywords:
+                    keywords[info.name] = list(info.keywords)
+            record: dict = {"class": self._string(category_id), "emojis": emojis}
+            if aliases:
+                record["aliases"] = aliases
+            if keywords:
+                record["keywords"] = keywords
+            groups.append(record)
+        return groups
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # python -m emoji_carousel.compiled_catalog [SOURCE [TARGET]]
+    args = sys.argv[1:] if argv is None else argv
+    source = Path(args[0]) if args else None
+    target = Path(args[1]) if len(args) > 1 else None
+    print(f"Wrote {compile_catalog(source, target)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from .commands import COMMANDS, lookup, parse_line, perform
+from .session import CarouselSession
+
+
+class Dispatcher:
+    # Runs text commands ("add grape right", "l", "undo", ...) from the
+    # shared command registry against a session, without prompts,
+    # animation or terminal control. execute() returns the text a command
+    # produces (None for most) and raises ValueError when a command is
+    # unknown or cannot run; "q" marks the dispatcher finished.
+    def __init__(self, session: CarouselSession) -> None:
+        self.session = session
+        self.finished = False
+
+    def commands(self) -> List[str]:
+        return list(COMMANDS)
+
+    def execute(self, line: str) -> Optional[str]:
+        words = parse_line(line)
+        if not words:
+            return None
+        command = lookup(words[0])
+        request = command.parse(words[1:])
+        if command.quits:
+            self.finished = True
+            return None
+        return command.show(perform(self.session, command, request))
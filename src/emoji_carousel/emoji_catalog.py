@@ -1,9 +1,23 @@
 from __future__ import annotations
 
+import heapq
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .fuzzy import FuzzyMatcher
+from .search_index import (
+    FIELD_ALIAS,
+    FIELD_KEYWORD,
+    FIELD_NAME,
+    RANK_CATEGORY,
+    NGramIndex,
+    rank_match,
+)
+from .symbols import intern_symbol
+
+DEFAULT_CATALOG_PATH = Path(__file__).resolve().parent / "data" / "emojis.json"
 
 
 @dataclass(frozen=True)
@@ -11,79 +25,240 @@ class EmojiInfo:
     name: str
     symbol: str
     category: str
+    aliases: Tuple[str, ...] = ()
+    keywords: Tuple[str, ...] = ()
+
+
+class EmojiCatalog:
+    # Catalog with hash indexes by name, symbol and category, built once at
+    # load time. Iterating it still yields the raw JSON groups. Groups may
+    # carry optional "aliases" and "keywords" maps (name -> list of strings).
+    def __init__(self, groups: List[dict]) -> None:
+        self._groups = groups
+        entries: List[EmojiInfo] = []
+        by_name: Dict[str, EmojiInfo] = {}
+        by_symbol: Dict[str, EmojiInfo] = {}
+        by_category: Dict[str, List[int]] = {}
+        categories = set()
+        for group in groups:
+            category = group.get("class", "")
+            if category:
+                categories.add(category)
+            bucket = by_category.setdefault(category.lower(), [])
+            aliases = group.get("aliases", {})
+            keywords = group.get("keywords", {})
+            for name, symbol in group.get("emojis", {}).items():
+                info = EmojiInfo(
+                    name=name,
+                    symbol=intern_symbol(symbol),
+                    category=category,
+                    aliases=tuple(aliases.get(name, ())),
+                    keywords=tuple(keywords.get(name, ())),
+                )
+                entries.append(info)
+                by_name.setdefault(name, info)
+                by_symbol.setdefault(symbol, info)
+                bucket.append(len(entries) - 1)
+        self._entries = tuple(entries)
+        self._search_index: Optional[NGramIndex] = None
+        self._fuzzy_matcher: Optional[FuzzyMatcher] = None
+        self._by_name = by_name
+        self._by_symbol = by_symbol
+        self._by_category = by_category
+        self._categories = sorted(categories)
+
+    @property
+    def groups(self) -> List[dict]:
+        return self._groups
+
+    @property
+    def entries(self) -> Tuple[EmojiInfo, ...]:
+        return self._entries
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._groups)
+
+    def find_by_name(self, name: str) -> Optional[EmojiInfo]:
+        return self._by_name.get(name)
+
+    def find_by_symbol(self, symbol: str) -> Optional[EmojiInfo]:
+        return self._by_symbol.get(symbol)
+
+    def find_many_by_name(self, names: Iterable[str]) -> List[Optional[EmojiInfo]]:
+        # find_by_name for each name, in order, as one pass over the index.
+        return list(map(self._by_name.get, names))
+
+    def find_many_by_symbol(self, symbols: Iterable[str]) -> List[Optional[EmojiInfo]]:
+        return list(map(self._by_symbol.get, symbols))
+
+    def search_many(
+        self, queries: Iterable[str], limit: Optional[int] = None
+    ) -> List[List[EmojiInfo]]:
+        # search() for each query, in order. Queries that normalize to the
+        # same text are searched once and share one result list.
+        done: Dict[str, List[EmojiInfo]] = {}
+        results: List[List[EmojiInfo]] = []
+        for query in queries:
+            normalized = query.strip().lower()
+            found = done.get(normalized)
+            if found is None:
+                found = done[normalized] = self.search(normalized, limit)
+            results.append(found)
+        return results
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[EmojiInfo]:
+        # Ranked substring search over names, aliases and keywords, plus
+        # every emoji of an exactly matching category.
+        entries = self._entries
+        return [entries[position] for _, position in self.ranked_search(query, limit)]
+
+    def ranked_search(self, query: str, limit: Optional[int] = None) -> List[Tuple[int, int]]:
+        # search() as (rank, entry position) pairs, best first: the best
+        # entry per matching name, ties broken by position.
+        normalized = query.strip().lower()
+        if not normalized:
+            return []
+        index = self.search_index()
+        best: Dict[str, Tuple[int, int]] = {}
+        for term_id in index.matches(normalized):
+            position, field, term = index.term(term_id)
+            self._keep_best(best, (rank_match(field, term, normalized), position))
+        for position in self._by_category.get(normalized, ()):
+            self._keep_best(best, (RANK_CATEGORY, position))
+
+        if limit is None:
+            return sorted(best.values())
+        return heapq.nsmallest(limit, best.values())
+
+    def search_index(self) -> NGramIndex:
+        # Trigram index over names, aliases and keywords, built on first use.
+        if self._search_index is None:
+            index = NGramIndex()
+            for position, info in enumerate(self._entries):
+                index.add(position, info.name, FIELD_NAME)
+                for alias in info.aliases:
+                    index.add(position, alias, FIELD_ALIAS)
+                for keyword in info.keywords:
+                    index.add(position, keyword, FIELD_KEYWORD)
+            self._search_index = index
+        return self._search_index
+
+    def fuzzy_matcher(self) -> FuzzyMatcher:
+        # Typo-tolerant name matcher, built on first use.
+        if self._fuzzy_matcher is None:
+            self._fuzzy_matcher = FuzzyMatcher(info.name for info in self._entries)
+        return self._fuzzy_matcher
 
+    def _keep_best(self, best: Dict[str, Tuple[int, int]], match: Tuple[int, int]) -> None:
+        # One result per name, keeping its best-ranked entry.
+        name = self._entries[match[1]].name
+        current = best.get(name)
+        if current is None or match < current:
+            best[name] = match
 
-def load_catalog(path: Optional[Path] = None) -> List[dict]:
-    # Load the catalog from disk (defaults to bundled data).
+    def list_by_category(self, category: str) -> List[EmojiInfo]:
+        normalized = category.strip().lower()
+        if not normalized:
+            return []
+        entries = self._entries
+        return [entries[position] for position in self._by_category.get(normalized, ())]
+
+    def list_categories(self) -> List[str]:
+        return list(self._categories)
+
+
+def load_catalog(path: Optional[Path] = None, use_compiled: bool = True) -> EmojiCatalog:
+    # Load the catalog from disk (defaults to bundled data). A fresh compiled
+    # copy next to the JSON file is memory-mapped instead of parsed.
     if path is None:
-        path = Path(__file__).resolve().parent / "data" / "emojis.json"
+        path = DEFAULT_CATALOG_PATH
+    if use_compiled:
+        from .compiled_catalog import compiled_path_for, load_compiled
+
+        compiled = load_compiled(compiled_path_for(path), source=path)
+        if compiled is not None:
+            return compiled
     with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+        return EmojiCatalog(json.load(handle))
+
+
+def as_catalog(catalog: Iterable[dict]) -> EmojiCatalog:
+    # Accept either an indexed catalog or raw JSON groups.
+    if isinstance(catalog, EmojiCatalog):
+        return catalog
+    return EmojiCatalog(list(catalog))
 
 
 def find_by_name(catalog: Iterable[dict], name: str) -> Optional[EmojiInfo]:
     # Look up an emoji by its human-readable name.
-    for group in catalog:
-        emojis = group.get("emojis", {})
-        if name in emojis:
-            return EmojiInfo(name=name, symbol=emojis[name], category=group.get("class", ""))
-    return None
+    return as_catalog(catalog).find_by_name(name)
 
 
 def find_by_symbol(catalog: Iterable[dict], symbol: str) -> Optional[EmojiInfo]:
     # Look up an emoji by its symbol.
-    for group in catalog:
-        emojis = group.get("emojis", {})
-        for key, value in emojis.items():
-            if value == symbol:
-                return EmojiInfo(name=key, symbol=value, category=group.get("class", ""))
-    return None
+    return as_catalog(catalog).find_by_symbol(symbol)
+
+
+def find_many_by_name(catalog: Iterable[dict], names: Iterable[str]) -> List[Optional[EmojiInfo]]:
+    # Look up many names at once (None for each unknown one).
+    return as_catalog(catalog).find_many_by_name(names)
+
+
+def find_many_by_symbol(
+    catalog: Iterable[dict], symbols: Iterable[str]
+) -> List[Optional[EmojiInfo]]:
+    # Look up many symbols at once (None for each unknown one).
+    return as_catalog(catalog).find_many_by_symbol(symbols)
+
+
+def search_many(
+    catalog: Iterable[dict], queries: Iterable[str], limit: Optional[int] = None
+) -> List[List[EmojiInfo]]:
+    # search_catalog for many queries, repeated ones answered once.
+    return as_catalog(catalog).search_many(queries, limit)
+
+
+def annotate_symbols(
+    catalog: Iterable[dict], symbols: Sequence[str]
+) -> Tuple[Sequence[Optional[str]], Sequence[Optional[str]]]:
+    # Name and category columns for a run of symbols, e.g. a log (None
+    # where a symbol is unknown). A NumPy array is resolved once per
+    # distinct symbol and gathered back with array indexing, giving object
+    # arrays of the input's shape; NumPy is never imported otherwise.
+    catalog = as_catalog(catalog)
+    if type(symbols).__module__ == "numpy" and type(symbols).__name__ == "ndarray":
+        import numpy
+
+        distinct, inverse = numpy.unique(symbols.ravel(), return_inverse=True)
+        infos = catalog.find_many_by_symbol(distinct.tolist())
+        names = numpy.array([info and info.name for info in infos], dtype=object)
+        categories = numpy.array([info and info.category for info in infos], dtype=object)
+        inverse = inverse.reshape(symbols.shape)
+        return names[inverse], categories[inverse]
+    infos = catalog.find_many_by_symbol(symbols)
+    return (
+        [info and info.name for info in infos],
+        [info and info.category for info in infos],
+    )
 
 
 def iter_emojis(catalog: Iterable[dict]) -> Iterator[EmojiInfo]:
     # Yield every emoji in the catalog.
-    for group in catalog:
-        category = group.get("class", "")
-        for name, symbol in group.get("emojis", {}).items():
-            yield EmojiInfo(name=name, symbol=symbol, category=category)
-
-
-def search_catalog(catalog: Iterable[dict], query: str) -> List[EmojiInfo]:
-    # Match by category (exact) or partial name (case-insensitive).
-    normalized = query.strip().lower()
-    if not normalized:
-        return []
-
-    matches: Dict[str, EmojiInfo] = {}
-    for group in catalog:
-        category = group.get("class", "")
-        category_match = category.lower() == normalized
-        for name, symbol in group.get("emojis", {}).items():
-            name_match = normalized in name.lower()
-            if category_match or name_match:
-                matches[name] = EmojiInfo(
-                    name=name,
-                    symbol=symbol,
-                    category=category,
-                )
-    return list(matches.values())
+    return iter(as_catalog(catalog).entries)
+
+
+def search_catalog(
+    catalog: Iterable[dict], query: str, limit: Optional[int] = None
+) -> List[EmojiInfo]:
+    # Match by category (exact) or partial name/alias/keyword, best first.
+    return as_catalog(catalog).search(query, limit)
 
 
 def list_by_category(catalog: Iterable[dict], category: str) -> List[EmojiInfo]:
     # Return all emojis in a given category.
-    normalized = category.strip().lower()
-    if not normalized:
-        return []
-    matches: List[EmojiInfo] = []
-    for group in catalog:
-        if group.get("class", "").lower() != normalized:
-            continue
-        for name, symbol in group.get("emojis", {}).items():
-            matches.append(EmojiInfo(name=name, symbol=symbol, category=group.get("class", "")))
-    return matches
+    return as_catalog(catalog).list_by_category(category)
 
 
 def list_categories(catalog: Iterable[dict]) -> List[str]:
     # List available categories in the catalog.
-    categories = {group.get("class", "") for group in catalog}
-    return sorted(category for category in categories if category)
+    return as_catalog(catalog).list_categories()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Iterable, List, Tuple
+
+from .search_index import ngrams
+
+
+def _padded_grams(text: str, n: int) -> Iterable[str]:
+    # Pad so short words and word edges still produce n-grams.
+    pad = " " * (n - 1)
+    return ngrams(f"{pad}{text} ", n)
+
+
+class FuzzyMatcher:
+    # Typo-tolerant name matching, built once per catalog. A padded trigram
+    # index narrows the names down to those sharing the most n-grams with
+    # the query; only those are scored with difflib's ratio, using the same
+    # cutoff semantics as difflib.get_close_matches.
+    def __init__(self, names: Iterable[str], n: int = 3, candidates: int = 64) -> None:
+        if candidates <= 0:
+            raise ValueError("Candidate pool must be positive.")
+        self.n = n
+        self.candidates = candidates
+        self._names: List[str] = []
+        self._lower: List[str] = []
+        self._postings: Dict[str, List[int]] = {}
+        seen = set()
+        for name in names:
+            if name in seen:
+                continue
+            seen.add(name)
+            name_id = len(self._names)
+            self._names.append(name)
+            lowered = name.lower()
+            self._lower.append(lowered)
+            for gram in _padded_grams(lowered, n):
+                self._postings.setdefault(gram, []).append(name_id)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def suggestions(self, query: str, limit: int = 5, cutoff: float = 0.6) -> List[str]:
+        # Best names scoring at least cutoff, best first (at most limit).
+        return [name for _, name in self.scored(query, limit, cutoff)]
+
+    def scored(self, query: str, limit: int = 5, cutoff: float = 0.6) -> List[Tuple[float, str]]:
+        # suggestions() with each name's similarity ratio.
+        if limit <= 0:
+            raise ValueError("limit must be > 0")
+        if not 0.0 <= cutoff <= 1.0:
+            raise ValueError("cutoff must be in [0.0, 1.0]")
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        from difflib import SequenceMatcher
+
+        scored: List[Tuple[float, str]] = []
+        matcher = SequenceMatcher()
+        matcher.set_seq2(query)
+        for name_id in self._candidates(query):
+            matcher.set_seq1(self._lower[name_id])
+            # The cheap upper bounds first; ratio() only for the survivors.
+            if matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff:
+                continue
+            score = matcher.ratio()
+            if score >= cutoff:
+                scored.append((score, self._names[name_id]))
+        return heapq.nlargest(limit, scored)
+
+    def _candidates(self, query: str) -> List[int]:
+        # Names sharing the most n-grams with the query. Queries shorter than
+        # an n-gram barely overlap anything, so they are scored against all.
+        if len(query) < self.n:
+            return list(range(len(self._names)))
+        shared: Dict[int, int] = {}
+        for gram in _padded_grams(query, self.n):
+            for name_id in self._postings.get(gram, ()):
+                shared[name_id] = shared.get(name_id, 0) + 1
+        if len(shared) <= self.candidates:
+            return list(shared)
+        return heapq.nlargest(self.candidates, shared, key=shared.__getitem__)
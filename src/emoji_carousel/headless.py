@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+from typing import Iterable, Optional, TextIO
+
+from .carousel import DEFAULT_ENGINE
+from .commands import render_state
+from .dispatcher import Dispatcher
+from .persistence import close_session, open_session
+from .session import MAX_SIZE, CarouselSession
+
+
+def run_batch(
+    lines: Iterable[str],
+    dispatcher: Dispatcher,
+    out: Optional[TextIO] = None,
+    err: Optional[TextIO] = None,
+    strict: bool = False,
+) -> int:
+    # Feed command lines to the dispatcher, writing whatever they produce,
+    # until the lines run out or one of them is "q". Failing lines are
+    # reported with their line number; strict stops at the first one.
+    # Returns the number of failed lines.
+    out = out if out is not None else sys.stdout
+    err = err if err is not None else sys.stderr
+    failures = 0
+    for number, line in enumerate(lines, 1):
+        try:
+            output = dispatcher.execute(line)
+        except ValueError as error:
+            failures += 1
+            err.write(f"line {number}: {error}\n")
+            if strict:
+                break
+            continue
+        if output is not None:
+            out.write(output + "\n")
+        if dispatcher.finished:
+            break
+    return failures
+
+
+def main(
+    source: str,
+    engine: str = DEFAULT_ENGINE,
+    capacity: int = MAX_SIZE,
+    seed: Optional[int] = None,
+    strict: bool = False,
+    session_path: Optional[str] = None,
+) -> int:
+    # Run a command file ('-' for stdin) and print the final state. With a
+    # session file the batch continues that session and saves it back.
+    if seed is not None:
+        random.seed(seed)
+    if session_path:
+        session = open_session(Path(session_path), engine, capacity)
+    else:
+        session = CarouselSession(capacity, engine)
+    dispatcher = Dispatcher(session)
+    if source == "-":
+        failures = run_batch(sys.stdin, dispatcher, strict=strict)
+    else:
+        with Path(source).open("r", encoding="utf-8") as handle:
+            failures = run_batch(handle, dispatcher, strict=strict)
+    if session_path:
+        close_session(session, Path(session_path))
+    print(render_state(dispatcher.session))
+    return 1 if failures else 0
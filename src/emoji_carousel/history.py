@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from .carousel import Carousel
+
+OP_ADD = 0
+OP_DELETE = 1
+OP_MOVE = 2
+OP_SHUFFLE = 3
+
+OP_NAMES = {OP_ADD: "add", OP_DELETE: "delete", OP_MOVE: "move", OP_SHUFFLE: "shuffle"}
+
+# Items in head order plus the cursor.
+Snapshot = Tuple[Tuple[str, ...], int]
+
+
+class Record(NamedTuple):
+    # One applied operation. index is where it acted: the new item (add),
+    # the removed item (delete) or the new cursor (move, shuffle). cursor is
+    # the cursor before the operation; order is the shuffled item order.
+    op: int
+    index: int
+    cursor: int
+    symbol: str = ""
+    order: Tuple[str, ...] = ()
+
+
+def encode_record(record: Record) -> list:
+    # Compact JSON-friendly form: [op, index, cursor, symbol, order].
+    return [record.op, record.index, record.cursor, record.symbol, list(record.order)]
+
+
+def decode_record(row: list) -> Record:
+    op, index, cursor, symbol, order = row
+    return Record(int(op), int(index), int(cursor), str(symbol), tuple(order))
+
+
+def apply(carousel: Carousel, record: Record) -> None:
+    # Replay a record onto the state it was recorded from.
+    op = record.op
+    if op == OP_ADD:
+        if carousel.size() == 0:
+            carousel.add(record.symbol)
+        else:
+            carousel.seek(record.cursor)
+            carousel.insert("left" if record.index == record.cursor else "right", record.symbol)
+    elif op == OP_DELETE:
+        carousel.seek(record.index)
+        carousel.remove()
+    elif op == OP_MOVE:
+        carousel.seek(record.index)
+    elif op == OP_SHUFFLE:
+        carousel.replace_items(list(record.order))
+        carousel.seek(record.index)
+
+
+def revert(carousel: Carousel, record: Record) -> None:
+    # Undo a record in place. Shuffles have no cheap inverse; History
+    # restores them from the snapshot taken just before.
+    op = record.op
+    if op == OP_ADD:
+        carousel.seek(record.index)
+        carousel.remove()
+        if carousel.size():
+            carousel.seek(record.cursor)
+    elif op == OP_DELETE:
+        if carousel.size() == 0:
+            carousel.add(record.symbol)
+        elif record.index == 0:
+            # Put the frame back at the head, not after the tail.
+            carousel.seek(0)
+            carousel.insert("left", record.symbol)
+        else:
+            carousel.seek(record.index - 1)
+            carousel.insert("right", record.symbol)
+    elif op == OP_MOVE:
+        carousel.seek(record.cursor)
+    else:
+        raise ValueError(f"Cannot revert {OP_NAMES.get(op, op)!r} in place.")
+
+
+def take_snapshot(carousel: Carousel) -> Snapshot:
+    if carousel.size() == 0:
+        return (), 0
+    return tuple(carousel), carousel.current_index()
+
+
+def restore_snapshot(carousel: Carousel, snapshot: Snapshot) -> None:
+    items, cursor = snapshot
+    carousel.replace_items(list(items))
+    if items:
+        carousel.seek(cursor)
+
+
+class History:
+    # Bounded undo/redo log. Only the newest `limit` records are kept. Every
+    # `snapshot_every` records (and before each shuffle) the whole carousel
+    # is captured, so a shuffle, or a long undo, restores the nearest
+    # snapshot and replays forward instead of reversing each step.
+    # Positions ("seq") count records applied since the history started.
+    def __init__(self, limit: int = 1000, snapshot_every: int = 32) -> None:
+        if limit <= 0 or snapshot_every <= 0:
+            raise ValueError("History limit and snapshot interval must be positive.")
+        self.limit = limit
+        self.snapshot_every = snapshot_every
+        self._done: Deque[Record] = deque(maxlen=limit)
+        self._undone: List[Record] = []
+        self._base = 0
+        self._snapshots: Dict[int, Snapshot] = {}
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    @property
+    def seq(self) -> int:
+        return self._base + len(self._done)
+
+    def can_undo(self) -> bool:
+        return bool(self._done)
+
+    def can_redo(self) -> bool:
+        return bool(self._undone)
+
+    def records(self) -> List[Record]:
+        return list(self._done)
+
+    def last(self) -> Optional[Record]:
+        # The most recently applied record (the next one undo reverts).
+        return self._done[-1] if self._done else None
+
+    def snapshot(self, carousel: Carousel) -> None:
+        # Capture the current state at the current position.
+        self._snapshots[self.seq] = take_snapshot(carousel)
+
+    def push(self, carousel: Carousel, record: Record) -> None:
+        # Log a record that was just applied to carousel; drops the redo
+        # branch and everything that no longer fits.
+        seq = self.seq
+        if self._undone:
+            self._undone.clear()
+            self._snapshots = {key: value for key, value in self._snapshots.items() if key <= seq}
+        if record.op == OP_SHUFFLE and seq not in self._snapshots:
+            raise ValueError("Take a snapshot before logging a shuffle.")
+        self._append(record)
+        if self.seq % self.snapshot_every == 0:
+            self.snapshot(carousel)
+
+    def undo(self, carousel: Carousel, steps: int = 1) -> int:
+        # Undo up to steps records; returns how many were undone.
+        if not self._done:
+            raise ValueError("Nothing to undo.")
+        steps = min(steps, len(self._done))
+        target = self.seq - steps
+        start = self._nearest_snapshot(target)
+        undone = [self._done.pop() for _ in range(steps)]
+        self._undone.extend(undone)
+        if start is not None and target - start < steps:
+            # Fewer records to replay from the snapshot than to reverse.
+            restore_snapshot(carousel, self._snapshots[start])
+            for record in list(self._done)[start - self._base:]:
+                apply(carousel, record)
+            return steps
+        for offset, record in enumerate(undone):
+            if record.op == OP_SHUFFLE:
+                # Every shuffle has a snapshot of the state before it.
+                restore_snapshot(carousel, self._snapshots[target + steps - offset - 1])
+            else:
+                revert(carousel, record)
+        return steps
+
+    def redo(self, carousel: Carousel, steps: int = 1) -> int:
+        # Reapply up to steps undone records; returns how many were redone.
+        if not self._undone:
+            raise ValueError("Nothing to redo.")
+        steps = min(steps, len(self._undone))
+        for _ in range(steps):
+            record = self._undone.pop()
+            apply(carousel, record)
+            self._append(record)
+        return steps
+
+    def export(self) -> dict:
+        # Everything needed to rebuild this history, in JSON-friendly form.
+        return {
+            "limit": self.limit,
+            "snapshot_every": self.snapshot_every,
+            "base": self._base,
+            "done": [encode_record(record) for record in self._done],
+            "undone": [encode_record(record) for record in self._undone],
+            "snapshots": [
+                [seq, list(items), cursor] for seq, (items, cursor) in self._snapshots.items()
+            ],
+        }
+
+    @classmethod
+    def from_export(cls, state: dict) -> "History":
+        history = cls(int(state["limit"]), int(state["snapshot_every"]))
+        history._base = int(state["base"])
+        history._done.extend(decode_record(row) for row in state["done"])
+        history._undone = [decode_record(row) for row in state["undone"]]
+        history._snapshots = {
+            int(seq): (tuple(items), int(cursor)) for seq, items, cursor in state["snapshots"]
+        }
+        return history
+
+    def clear(self) -> None:
+        self._done.clear()
+        self._undone.clear()
+        self._snapshots.clear()
+        self._base = 0
+
+    def _append(self, record: Record) -> None:
+        if len(self._done) == self.limit:
+            # The deque drops the oldest record; snapshots before the new
+            # oldest state can never be reached again.
+            self._base += 1
+            self._snapshots = {
+                key: value for key, value in self._snapshots.items() if key >= self._base
+            }
+        self._done.append(record)
+
+    def _nearest_snapshot(self, target: int) -> Optional[int]:
+        best = None
+        for key in self._snapshots:
+            if self._base <= key <= target and (best is None or key > best):
+                best = key
+        return best
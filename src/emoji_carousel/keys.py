@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import codecs
+import os
+import sys
+import threading
+from typing import List, Optional, TextIO, Tuple
+
+try:
+    import termios
+    import tty
+except ImportError:  # pragma: no cover - Windows
+    termios = tty = None
+
+try:
+    import msvcrt
+except ImportError:  # pragma: no cover - POSIX
+    msvcrt = None
+
+KEY_ENTER = "\n"
+KEY_BACKSPACE = "\x7f"
+KEY_EOF = "\x04"
+KEY_LEFT = "\x1b[D"
+KEY_RIGHT = "\x1b[C"
+KEY_UP = "\x1b[A"
+KEY_DOWN = "\x1b[B"
+
+_ESCAPES = {"A": KEY_UP, "B": KEY_DOWN, "C": KEY_RIGHT, "D": KEY_LEFT}
+# Windows console scan codes that follow a "\x00"/"\xe0" prefix.
+_SCAN_CODES = {"H": KEY_UP, "P": KEY_DOWN, "M": KEY_RIGHT, "K": KEY_LEFT}
+
+
+def split_keys(text: str) -> Tuple[List[str], str]:
+    # Split raw terminal input into keys; returns (keys, unfinished tail).
+    # Arrow keys arrive as ESC [ X, possibly spread over two reads.
+    keys: List[str] = []
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if char == "\x1b":
+            if index + 2 >= len(text) and text[index + 1:] in ("", "["):
+                return keys, text[index:]
+            if text[index + 1] == "[":
+                keys.append(_ESCAPES.get(text[index + 2], ""))
+                index += 3
+                continue
+            keys.append(char)
+        elif char == "\r":
+            keys.append(KEY_ENTER)
+        elif char == "\x08":
+            keys.append(KEY_BACKSPACE)
+        else:
+            keys.append(char)
+        index += 1
+    return [key for key in keys if key], ""
+
+
+class KeyReader:
+    # Asynchronous keystrokes from a stream (stdin by default). A terminal
+    # is switched to cbreak mode and watched by the event loop, so every key
+    # arrives as soon as it is pressed; anything else (a pipe, a file, the
+    # Windows console) is read on a daemon thread. read_key() returns None
+    # once the input is exhausted.
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self._stream = stream if stream is not None else sys.stdin
+        self._queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._tail = ""
+        self._fd: Optional[int] = None
+        self._saved: Optional[list] = None
+        self.raw = False
+
+    async def __aenter__(self) -> "KeyReader":
+        self._loop = asyncio.get_running_loop()
+        fd = self._fileno()
+        if fd is not None and termios is not None and os.isatty(fd):
+            self._fd = fd
+            self._saved = termios.tcgetattr(fd)
+            tty.setcbreak(fd)
+            self._loop.add_reader(fd, self._on_readable)
+            self.raw = True
+        else:
+            console = msvcrt is not None and self._stream is sys.stdin and sys.stdin.isatty()
+            self.raw = console
+            target = self._pump_console if console else self._pump_lines
+            threading.Thread(target=target, name="keys", daemon=True).start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._fd is not None and self._loop is not None:
+            self._loop.remove_reader(self._fd)
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, self._saved)
+            self._fd = None
+
+    async def read_key(self) -> Optional[str]:
+        return await self._queue.get()
+
+    def _fileno(self) -> Optional[int]:
+        try:
+            return self._stream.fileno()
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    def _feed(self, text: str) -> None:
+        keys, self._tail = split_keys(self._tail + text)
+        for key in keys:
+            self._queue.put_nowait(key)
+
+    def _on_readable(self) -> None:
+        data = os.read(self._fd, 1024)
+        if not data:
+            self._loop.remove_reader(self._fd)
+            self._queue.put_nowait(None)
+            return
+        self._feed(self._decoder.decode(data))
+
+    def _pump_lines(self) -> None:
+        # Line-buffered input; each line is delivered as its keys.
+        while True:
+            line = self._stream.readline()
+            if not line:
+                self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+                return
+            self._loop.call_soon_threadsafe(self._feed, line)
+
+    def _pump_console(self) -> None:  # pragma: no cover - Windows
+        while True:
+            char = msvcrt.getwch()
+            if char in ("\x00", "\xe0"):
+                char = _SCAN_CODES.get(msvcrt.getwch(), "")
+            elif char == "\x1a":
+                self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+                return
+            if char:
+                self._loop.call_soon_threadsafe(self._feed, char)
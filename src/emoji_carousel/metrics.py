@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# Upper bounds (seconds) of the latency buckets, Prometheus style.
+DEFAULT_BUCKETS = (
+    1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0,
+)
+PROMETHEUS_PREFIX = "emoji_carousel_"
+
+# A metric is keyed by name plus its sorted label pairs.
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, str]) -> Key:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self, size: int) -> None:
+        # One slot per bucket plus the +Inf overflow.
+        self.counts = [0] * (size + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+
+class _NullTimer:
+    # What timer() hands out while metrics are off: does nothing, allocates
+    # nothing.
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("_metrics", "_key", "_start")
+
+    def __init__(self, metrics: "Metrics", key: Key) -> None:
+        self._metrics = metrics
+        self._key = key
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._metrics.record(self._key, time.perf_counter() - self._start)
+
+
+class Metrics:
+    # Counters and latency histograms, off by default. While disabled,
+    # timer() returns a shared no-op and increment/observe return at once,
+    # so instrumented code pays one attribute check.
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.enabled = False
+        self.buckets = tuple(buckets)
+        self._counters: Dict[Key, float] = {}
+        self._histograms: Dict[Key, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def timer(self, name: str, **labels: str) -> object:
+        # Context manager adding the time spent inside it to a histogram.
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self, _key(name, labels))
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        if self.enabled:
+            self.record(_key(name, labels), seconds)
+
+    def increment(self, name: str, amount: float = 1, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def record(self, key: Key, seconds: float) -> None:
+        # observe() with a prebuilt key (used by the method wrappers).
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(len(self.buckets))
+            histogram.counts[bisect_left(self.buckets, seconds)] += 1
+            histogram.count += 1
+            histogram.sum += seconds
+            if seconds > histogram.max:
+                histogram.max = seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict:
+        # Plain-data copy: {"counters": {name: [...]}, "histograms": {name: [...]}}
+        # with cumulative bucket counts keyed by their upper bound.
+        with self._lock:
+            counters: Dict[str, List[dict]] = {}
+            for (name, labels), value in sorted(self._counters.items()):
+                counters.setdefault(name, []).append({"labels": dict(labels), "value": value})
+            histograms: Dict[str, List[dict]] = {}
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                buckets = {}
+                for bound, count in zip(self.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    buckets["+Inf" if bound == float("inf") else repr(bound)] = cumulative
+                histograms.setdefault(name, []).append(
+                    {
+                        "labels": dict(labels),
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "max": histogram.max,
+                        "buckets": buckets,
+                    }
+                )
+        return {"counters": counters, "histograms": histograms}
+
+    def to_json(self) -> str:
+        import json
+
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        # Prometheus text exposition format.
+        state = self.snapshot()
+        lines: List[str] = []
+        for name, series in state["counters"].items():
+            lines.append(f"# TYPE {prefix}{name} counter")
+            for item in series:
+                lines.append(f"{prefix}{name}{_labels(item['labels'])} {item['value']}")
+        for name, series in state["histograms"].items():
+            lines.append(f"# TYPE {prefix}{name} histogram")
+            for item in series:
+                labels = item["labels"]
+                for bound, count in item["buckets"].items():
+                    lines.append(f"{prefix}{name}_bucket{_labels(labels, le=bound)} {count}")
+                lines.append(f"{prefix}{name}_sum{_labels(labels)} {item['sum']!r}")
+                lines.append(f"{prefix}{name}_count{_labels(labels)} {item['count']}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _labels(labels: Dict[str, str], **extra: str) -> str:
+    pairs = dict(labels, **extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs.items()
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+# Process-wide registry used by the instrumented code paths.
+METRICS = Metrics()
+
+CAROUSEL_METHODS = (
+    "add", "insert", "remove", "move_left", "move_right", "seek",
+    "shuffle", "replace_items", "to_list", "insert_many", "remove_range",
+    "splice", "rotate", "index_of", "__getitem__",
+)
+CATALOG_METHODS = (
+    "find_by_name", "find_by_symbol", "search", "list_by_category",
+    "find_many_by_name", "find_many_by_symbol", "search_many",
+)
+
+# Installed wrappers: (class, attribute, original function).
+_installed: List[Tuple[type, str, Callable]] = []
+
+
+def _targets() -> List[Tuple[type, Sequence[str], str, Dict[str, str]]]:
+    # Imported here so that importing metrics stays cheap.
+    from .circular_doubly_linked_list import CircularDoublyLinkedList
+    from .compiled_catalog import CompiledCatalog
+    from .emoji_catalog import EmojiCatalog
+    from .fuzzy import FuzzyMatcher
+    from .renderer import FrameRenderer
+    from .ring_buffer import RingBufferCarousel
+
+    return [
+        (CircularDoublyLinkedList, CAROUSEL_METHODS, "carousel_seconds", {"engine": "linked"}),
+        (RingBufferCarousel, CAROUSEL_METHODS, "carousel_seconds", {"engine": "ring"}),
+        (EmojiCatalog, CATALOG_METHODS, "catalog_seconds", {}),
+        (CompiledCatalog, CATALOG_METHODS, "catalog_seconds", {}),
+        (FuzzyMatcher, ("suggestions",), "catalog_seconds", {}),
+        (FrameRenderer, ("write_frame", "clear"), "render_seconds", {}),
+    ]
+
+
+def _timed(function: Callable, key: Key) -> Callable:
+    record = METRICS.record
+    clock = time.perf_counter
+
+    @functools.wraps(function)
+    def wrapper(*args: object, **kwargs: object) -> object:
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record(key, clock() - start)
+
+    return wrapper
+
+
+def instrument(cls: type, methods: Sequence[str], name: str, **labels: str) -> None:
+    # Time the listed methods of cls (those it defines itself) into the
+    # histogram name, labelled op=<method>. Callers are untouched: the class
+    # attribute is swapped, so existing instances and imported names use it.
+    for method in methods:
+        original = cls.__dict__.get(method)
+        if original is None or not callable(original):
+            continue
+        key = _key(name, dict(labels, op=method))
+        setattr(cls, method, _timed(original, key))
+        _installed.append((cls, method, original))
+
+
+def enable() -> None:
+    # Start collecting and wrap the carousel, catalog and renderer hot paths.
+    if METRICS.enabled:
+        return
+    from . import commands
+
+    for cls, methods, name, labels in _targets():
+        instrument(cls, methods, name, **labels)
+    METRICS.enabled = True
+    commands.TIMED = True
+
+
+def disable() -> None:
+    # Stop collecting and put the original methods back (data is kept).
+    from . import commands
+
+    METRICS.enabled = False
+    commands.TIMED = False
+    while _installed:
+        cls, method, original = _installed.pop()
+        setattr(cls, method, original)
+
+
+def dump(path: Path, fmt: Optional[str] = None) -> None:
+    # Write the metrics to path: Prometheus text for a .prom/.txt file (or
+    # fmt="prometheus"), JSON otherwise.
+    if fmt is None:
+        fmt = "prometheus" if path.suffix in (".prom", ".txt") else "json"
+    text = METRICS.to_prometheus() if fmt == "prometheus" else METRICS.to_json() + "\n"
+    path.write_text(text, encoding="utf-8")
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import heapq
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .emoji_catalog import EmojiCatalog, EmojiInfo
+
+# Below this many entries per shard, process overhead outweighs the gain.
+MIN_SHARD_ENTRIES = 5_000
+
+# (rank, position in the whole catalog, entry), best first.
+Ranked = List[Tuple[int, int, EmojiInfo]]
+
+# The shard a worker process serves: its catalog and the global position of
+# its first entry. Set by _load_shard when the worker starts.
+_shard: Optional[Tuple[EmojiCatalog, int]] = None
+
+
+def split_groups(groups: List[dict], shards: int) -> List[Tuple[int, List[dict]]]:
+    # Cut catalog groups into up to shards runs of about equal entry counts,
+    # as (position of the run's first entry, groups). Entry order is kept,
+    # so shard position + offset is the position in the whole catalog. A
+    # large group is split; each part keeps its category, aliases and
+    # keywords.
+    total = sum(len(group.get("emojis", {})) for group in groups)
+    size = max(1, -(-total // shards))
+    result: List[Tuple[int, List[dict]]] = []
+    current: List[dict] = []
+    offset = filled = 0
+    for group in groups:
+        items = list(group.get("emojis", {}).items())
+        start = 0
+        while start < len(items):
+            chunk = items[start:start + size - filled]
+            part = dict(group, emojis=dict(chunk))
+            for extra in ("aliases", "keywords"):
+                if extra in group:
+                    part[extra] = {
+                        name: group[extra][name] for name, _ in chunk if name in group[extra]
+                    }
+            current.append(part)
+            start += len(chunk)
+            filled += len(chunk)
+            if filled == size:
+                result.append((offset, current))
+                offset += filled
+                current, filled = [], 0
+    if current:
+        result.append((offset, current))
+    return result
+
+
+def _load_shard(groups: List[dict], offset: int) -> None:
+    # Worker initializer: build this shard's indexes up front.
+    global _shard
+    catalog = EmojiCatalog(groups)
+    catalog.search_index()
+    catalog.fuzzy_matcher()
+    _shard = (catalog, offset)
+
+
+def _ready() -> bool:
+    return _shard is not None
+
+
+def _search_shard(queries: List[str], limit: Optional[int]) -> List[Ranked]:
+    catalog, offset = _shard
+    entries = catalog.entries
+    done: Dict[str, Ranked] = {}
+    results: List[Ranked] = []
+    for query in queries:
+        ranked = done.get(query)
+        if ranked is None:
+            ranked = done[query] = [
+                (rank, position + offset, entries[position])
+                for rank, position in catalog.ranked_search(query, limit)
+            ]
+        results.append(ranked)
+    return results
+
+
+def _fuzzy_shard(query: str, limit: int, cutoff: float) -> List[Tuple[float, str]]:
+    return _shard[0].fuzzy_matcher().scored(query, limit, cutoff)
+
+
+class ShardedSearch:
+    # Substring and fuzzy search over a catalog split into shards, one
+    # worker process per shard. Only the raw groups are split here; each
+    # worker builds the catalog and the trigram and fuzzy indexes of its own
+    # shard, so building runs in parallel, and answers queries for it.
+    # Results are merged here into the order EmojiCatalog.search gives for
+    # the whole catalog. Fuzzy matching considers candidates per shard, so
+    # it may find close names a single matcher's candidate pool would miss.
+    # Workers are spawned, not forked, by default: the caller may already
+    # run animation or timer threads. Close it (or use it as a context
+    # manager) to stop the workers.
+    def __init__(
+        self,
+        catalog: Iterable[dict],
+        shards: Optional[int] = None,
+        context: Optional[object] = None,
+    ) -> None:
+        groups = catalog.groups if isinstance(catalog, EmojiCatalog) else list(catalog)
+        if shards is None:
+            total = sum(len(group.get("emojis", {})) for group in groups)
+            shards = max(1, min(os.cpu_count() or 1, total // MIN_SHARD_ENTRIES))
+        if shards <= 0:
+            raise ValueError("Shard count must be positive.")
+        if context is None:
+            context = multiprocessing.get_context("spawn")
+        self._pools: List[ProcessPoolExecutor] = []
+        try:
+            for offset, part in split_groups(groups, shards):
+                self._pools.append(
+                    ProcessPoolExecutor(
+                        1, mp_context=context, initializer=_load_shard, initargs=(part, offset)
+                    )
+                )
+            # Block until every shard has its indexes.
+            for future in [pool.submit(_ready) for pool in self._pools]:
+                future.result()
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def shards(self) -> int:
+        return len(self._pools)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[EmojiInfo]:
+        return self.search_many([query], limit)[0]
+
+    def search_many(
+        self, queries: Iterable[str], limit: Optional[int] = None
+    ) -> List[List[EmojiInfo]]:
+        # One round trip per shard for the whole batch.
+        queries = [query.strip().lower() for query in queries]
+        futures = [pool.submit(_search_shard, queries, limit) for pool in self._pools]
+        per_shard = [future.result() for future in futures]
+        results: List[List[EmojiInfo]] = []
+        for index in range(len(queries)):
+            # Each shard's list is best first, so a merge keeps the global
+            # order (positions are unique, so entries are never compared); a
+            # name found in several shards keeps its best entry.
+            seen = set()
+            merged: List[EmojiInfo] = []
+            for _, _, info in heapq.merge(*(ranked[index] for ranked in per_shard)):
+                if info.name in seen:
+                    continue
+                seen.add(info.name)
+                merged.append(info)
+                if limit is not None and len(merged) == limit:
+                    break
+            results.append(merged)
+        return results
+
+    def fuzzy_suggestions(self, query: str, limit: int = 5, cutoff: float = 0.6) -> List[str]:
+        futures = [pool.submit(_fuzzy_shard, query, limit, cutoff) for pool in self._pools]
+        best: Dict[str, float] = {}
+        for future in futures:
+            for ratio, name in future.result():
+                if ratio > best.get(name, -1.0):
+                    best[name] = ratio
+        return [name for _, name in heapq.nlargest(limit, ((r, n) for n, r in best.items()))]
+
+    def close(self) -> None:
+        for pool in self._pools:
+            pool.shutdown()
+        self._pools = []
+
+    def __enter__(self) -> "ShardedSearch":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from .carousel import DEFAULT_ENGINE
+from .emoji_catalog import EmojiCatalog
+from .history import OP_SHUFFLE, History, apply, decode_record
+from .session import MAX_SIZE, CarouselSession
+
+# Bump when the saved layout changes.
+FORMAT = 1
+
+# A saved session is one JSON document:
+#   {"format", "generation", "engine", "capacity", "items", "cursor", "history"}
+# and its journal (same name plus ".journal") holds one JSON array per line:
+# a header [FORMAT, generation], then every change since the save (history
+# records as [op, index, cursor, symbol, order], or ["undo", n], ["redo", n],
+# ["reset"]). Saving bumps the generation, so a journal left over from an
+# interrupted save is recognised as stale and ignored.
+
+
+def journal_path_for(path: Path) -> Path:
+    return path.with_name(path.name + ".journal")
+
+
+def _dump(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _complete_lines(data: bytes) -> List[str]:
+    # Lines that were fully written; a torn last line (crash mid-write)
+    # is left out.
+    return data[: data.rfind(b"\n") + 1].decode("utf-8").splitlines()
+
+
+class Journal:
+    # Append-only change log for a session; each change costs one line.
+    # Opening keeps the entries written for generation and drops a stale
+    # log or a torn last line, so appends always follow complete entries.
+    def __init__(self, path: Path, generation: int = 0) -> None:
+        self.path = path
+        self.generation = generation
+        self._handle = path.open("ab+")
+        self._handle.seek(0)
+        data = self._handle.read()
+        header = (_dump([FORMAT, generation]) + "\n").encode("utf-8")
+        if not data.startswith(header):
+            self.restart(generation)
+        elif not data.endswith(b"\n"):
+            self._handle.truncate(data.rfind(b"\n") + 1)
+
+    def __call__(self, entry: list) -> None:
+        self._write(entry)
+
+    def restart(self, generation: int) -> None:
+        # Empty the log, e.g. after a full save.
+        self.generation = generation
+        self._handle.truncate(0)
+        self._write([FORMAT, generation])
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def _write(self, entry: list) -> None:
+        self._handle.write((_dump(entry) + "\n").encode("utf-8"))
+        self._handle.flush()
+
+
+def read_journal(path: Path, generation: int) -> Iterator[list]:
+    # Entries of a journal written for generation; nothing when it is
+    # missing or stale.
+    try:
+        lines = _complete_lines(path.read_bytes())
+    except FileNotFoundError:
+        return
+    if not lines or lines[0] != _dump([FORMAT, generation]):
+        return
+    for number, line in enumerate(lines[1:], 2):
+        try:
+            yield json.loads(line)
+        except ValueError:
+            raise ValueError(f"{path}: bad journal line {number}.") from None
+
+
+def replay(session: CarouselSession, entry: list) -> None:
+    # Reapply one journal entry without journaling it again.
+    journal, session.journal = session.journal, None
+    try:
+        kind = entry[0]
+        if kind == "undo":
+            session.undo(int(entry[1]))
+        elif kind == "redo":
+            session.redo(int(entry[1]))
+        elif kind == "reset":
+            session.reset()
+        else:
+            record = decode_record(entry)
+            if record.op == OP_SHUFFLE:
+                session.history.snapshot(session.carousel)
+            apply(session.carousel, record)
+            session.history.push(session.carousel, record)
+    finally:
+        session.journal = journal
+
+
+def _read_state(path: Path) -> Optional[dict]:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            state = json.load(handle)
+    except FileNotFoundError:
+        return None
+    if not isinstance(state, dict) or state.get("format") != FORMAT:
+        raise ValueError(f"{path} is not a saved carousel session.")
+    return state
+
+
+def load_session(
+    path: Path,
+    engine: str = DEFAULT_ENGINE,
+    capacity: int = MAX_SIZE,
+    catalog: Optional[EmojiCatalog] = None,
+) -> CarouselSession:
+    # Rebuild a session from its save plus journal. engine and capacity
+    # only apply when nothing has been saved yet.
+    state = _read_state(path)
+    generation = 0
+    if state is None:
+        session = CarouselSession(capacity, engine, catalog)
+    else:
+        generation = int(state["generation"])
+        session = CarouselSession(int(state["capacity"]), str(state["engine"]), catalog)
+        items: List[str] = state["items"]
+        # One bulk rebuild instead of an insert per item.
+        session.carousel.replace_items(items)
+        if items:
+            session.carousel.seek(int(state["cursor"]))
+        session.history = History.from_export(state["history"])
+    session.generation = generation
+    for entry in read_journal(journal_path_for(path), generation):
+        replay(session, entry)
+    return session
+
+
+def save_session(session: CarouselSession, path: Path) -> None:
+    # Write the whole session (atomically) and restart its journal.
+    generation = session.generation + 1
+    carousel = session.carousel
+    state = {
+        "format": FORMAT,
+        "generation": generation,
+        "engine": session.engine,
+        "capacity": session.capacity,
+        "items": list(carousel),
+        "cursor": carousel.current_index() if carousel.size() else 0,
+        "history": session.history.export(),
+    }
+    partial = path.with_name(path.name + ".tmp")
+    partial.write_text(_dump(state), encoding="utf-8")
+    os.replace(partial, path)
+    session.generation = generation
+    if isinstance(session.journal, Journal):
+        session.journal.restart(generation)
+
+
+def open_session(
+    path: Path,
+    engine: str = DEFAULT_ENGINE,
+    capacity: int = MAX_SIZE,
+    catalog: Optional[EmojiCatalog] = None,
+) -> CarouselSession:
+    # Load (or start) a session whose every change is journaled to disk.
+    session = load_session(path, engine, capacity, catalog)
+    session.journal = Journal(journal_path_for(path), session.generation)
+    return session
+
+
+def close_session(session: CarouselSession, path: Path) -> None:
+    # Compact the journal into a full save and stop journaling.
+    save_session(session, path)
+    if isinstance(session.journal, Journal):
+        session.journal.close()
+    session.journal = None
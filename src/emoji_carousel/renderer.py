@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import os
+import sys
+from typing import Optional, TextIO
+
+from .screen import CLEAR, Screen
+
+
+def enable_ansi() -> None:
+    # Windows consoles need virtual terminal processing switched on for ANSI
+    # escapes; everywhere else they already work.
+    if os.name != "nt":
+        return
+    try:
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)
+        mode = ctypes.c_uint32()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)
+    except (AttributeError, OSError):  # pragma: no cover - platform specific
+        pass
+
+
+class FrameRenderer:
+    # Builds each frame in memory and emits it with a single write and
+    # flush. With diff on, only the cells that changed since the previous
+    # frame are sent; otherwise every frame is a clear plus full redraw.
+    def __init__(self, stream: Optional[TextIO] = None, diff: bool = True) -> None:
+        # None means "whatever sys.stdout is at write time".
+        self._stream = stream
+        self._screen = Screen() if diff else None
+        enable_ansi()
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream if self._stream is not None else sys.stdout
+
+    def clear(self) -> None:
+        stream = self.stream
+        stream.write(CLEAR)
+        stream.flush()
+        if self._screen is not None:
+            self._screen.reset()
+
+    def invalidate(self) -> None:
+        # Call after output the renderer did not see (e.g. a long, scrolling
+        # listing); the next frame is then redrawn in full.
+        if self._screen is not None:
+            self._screen.invalidate()
+
+    def write_frame(self, text: str) -> None:
+        stream = self.stream
+        if self._screen is None:
+            stream.write(CLEAR + text)
+        else:
+            stream.write(self._screen.update(text))
+        stream.flush()
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    import random
+
+from .symbols import intern_symbol, legacy_frame_bytes, symbol_bytes
+
+
+class RingBufferCarousel:
+    # Array-backed carousel: items live in preallocated contiguous slots
+    # (slots[0:size] in ring order) and the focus is a cursor index.
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+        self._capacity = capacity
+        self._slots: List[Optional[str]] = [None] * capacity
+        self._size = 0
+        # Bumped on every structural change so live iterators can notice.
+        self._version = 0
+        self._cursor = 0
+
+    def add(self, item: str) -> None:
+        # Add the first item to an empty carousel.
+        if self._size != 0:
+            raise ValueError("List already initialized; use insert().")
+        self._ensure_space()
+        self._slots[0] = intern_symbol(item)
+        self._cursor = 0
+        self._size = 1
+        self._version += 1
+
+    def insert(self, position: str, item: str) -> None:
+        # Insert left or right of the current slot and focus the new item.
+        if self._size == 0:
+            self.add(item)
+            return
+        self._ensure_space()
+        if position not in {"left", "right"}:
+            raise ValueError("Position must be 'left' or 'right'.")
+
+        index = self._cursor if position == "left" else self._cursor + 1
+        slots = self._slots
+        size = self._size
+        # Shift the tail one slot to the right; both slices have equal length
+        # so the preallocated list never grows.
+        slots[index + 1:size + 1] = slots[index:size]
+        slots[index] = intern_symbol(item)
+        self._cursor = index
+        self._size = size + 1
+        self._version += 1
+
+    def move_left(self) -> str:
+        self._require_current()
+        self._cursor = (self._cursor - 1) % self._size
+        return self._slots[self._cursor]
+
+    def move_right(self) -> str:
+        self._require_current()
+        self._cursor = (self._cursor + 1) % self._size
+        return self._slots[self._cursor]
+
+    def seek(self, index: int) -> str:
+        # Jump straight to an absolute position (negative counts from the end).
+        self._cursor = self._position(index)
+        return self._slots[self._cursor]
+
+    def current_index(self) -> int:
+        self._require_current()
+        return self._cursor
+
+    def index_of(self, item: str) -> int:
+        # Absolute position of the first matching item.
+        try:
+            return self._slots.index(item, 0, self._size)
+        except ValueError:
+            raise ValueError(f"{item!r} is not in the carousel.") from None
+
+    def __getitem__(self, index: int) -> str:
+        return self._slots[self._position(index)]
+
+    def peek_left(self) -> str:
+        self._require_current()
+        return self._slots[(self._cursor - 1) % self._size]
+
+    def peek_right(self) -> str:
+        self._require_current()
+        return self._slots[(self._cursor + 1) % self._size]
+
+    def current_item(self) -> str:
+        return self._require_current()
+
+    def remove(self) -> str:
+        # Remove the current item and move focus to the left neighbor.
+        removed = self._require_current()
+        slots = self._slots
+        size = self._size
+        index = self._cursor
+        slots[index:size - 1] = slots[index + 1:size]
+        slots[size - 1] = None
+        self._size = size - 1
+        self._version += 1
+        self._cursor = (index - 1) % self._size if self._size else 0
+        return removed
+
+    def size(self) -> int:
+        return self._size
+
+    def to_list(self) -> List[str]:
+        # Snapshot items starting from the current slot.
+        if self._size == 0:
+            return []
+        slots = self._slots
+        return slots[self._cursor:self._size] + slots[:self._cursor]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[str]:
+        # Lazily walk items in absolute order from the head.
+        return self._walk(0, 1, self._size)
+
+    def __reversed__(self) -> Iterator[str]:
+        return self._walk(self._size - 1, -1, self._size)
+
+    def iter_from_current(self, reverse: bool = False) -> Iterator[str]:
+        # Lazily walk once around the ring starting at the current slot.
+        self._require_current()
+        return self._walk(self._cursor, -1 if reverse else 1, self._size)
+
+    def iter_window(self, k: int) -> Iterator[str]:
+        # Up to k items centered on the current slot, left to right.
+        self._require_current()
+        count = min(k, self._size)
+        return self._walk(self._cursor - (count - 1) // 2, 1, count)
+
+    def shuffle(self, rng: Optional[random.Random] = None) -> None:
+        # Fisher-Yates over the occupied slots, in place.
+        import random
+
+        randrange = (rng or random).randrange
+        slots = self._slots
+        for index in range(self._size - 1, 0, -1):
+            other = randrange(index + 1)
+            slots[index], slots[other] = slots[other], slots[index]
+        self._cursor = 0
+        self._version += 1
+
+    def replace_items(self, items: List[str]) -> None:
+        # Replace all items in one slice assignment.
+        count = len(items)
+        if count > self._capacity:
+            raise ValueError("Carousel is full.")
+        slots = self._slots
+        slots[:count] = [intern_symbol(item) for item in items]
+        for index in range(count, self._size):
+            slots[index] = None
+        self._size = count
+        self._version += 1
+        self._cursor = 0
+
+    def insert_many(self, position: str, items: Iterable[str]) -> None:
+        # Bulk insert; same result as calling insert(position, item) per item
+        # but with one capacity check and one shift of the tail.
+        self._insert_block(position, items, stack=True)
+
+    def splice(self, other: object, position: str = "right") -> None:
+        # Move every item of another carousel next to the current slot,
+        # keeping their order.
+        if other is self:
+            raise ValueError("Cannot splice a carousel into itself.")
+        self._insert_block(position, other.to_list(), stack=False)
+        other.replace_items([])
+
+    def _insert_block(self, position: str, items: Iterable[str], stack: bool) -> None:
+        if position not in {"left", "right"}:
+            raise ValueError("Position must be 'left' or 'right'.")
+        block = [intern_symbol(item) for item in items]
+        count = len(block)
+        if count == 0:
+            return
+        size = self._size
+        if size + count > self._capacity:
+            raise ValueError("Carousel is full.")
+        if stack and position == "left":
+            # Repeated left inserts stack each new item in front of the last.
+            block.reverse()
+
+        slots = self._slots
+        if size == 0:
+            index = 0
+            self._cursor = 0 if position == "left" else count - 1
+        elif position == "left":
+            index = self._cursor
+        else:
+            index = self._cursor + 1
+            self._cursor = index + count - 1
+        slots[index + count:size + count] = slots[index:size]
+        slots[index:index + count] = block
+        self._size = size + count
+        self._version += 1
+
+    def remove_range(self, count: int, direction: str = "left") -> List[str]:
+        # Remove the current item and count - 1 neighbors in one compaction.
+        # "left" matches count calls to remove(); "right" takes the current
+        # item and the ones after it. Focus lands left of the removed run.
+        if direction not in {"left", "right"}:
+            raise ValueError("Direction must be 'left' or 'right'.")
+        if count <= 0:
+            return []
+        self._require_current()
+        slots = self._slots
+        size = self._size
+        if count > size:
+            raise ValueError("Cannot remove more items than the carousel holds.")
+        cursor = self._cursor
+        if direction == "left":
+            removed = [slots[(cursor - offset) % size] for offset in range(count)]
+            start = (cursor - count + 1) % size
+        else:
+            removed = [slots[(cursor + offset) % size] for offset in range(count)]
+            start = cursor
+        if count == size:
+            self.replace_items([])
+            return removed
+
+        end = (start + count - 1) % size
+        if start <= end:
+            kept = slots[:start] + slots[end + 1:size]
+            cursor = (start - 1) % len(kept)
+        else:
+            kept = slots[end + 1:start]
+            cursor = len(kept) - 1
+        kept_size = len(kept)
+        slots[:kept_size] = kept
+        for index in range(kept_size, size):
+            slots[index] = None
+        self._size = kept_size
+        self._version += 1
+        self._cursor = cursor
+        return removed
+
+    def rotate(self, steps: int) -> str:
+        # Spin the carousel: same as steps move_right() calls (negative moves
+        # left), done as one jump.
+        self._require_current()
+        return self.seek((self._cursor + steps) % self._size)
+
+    def memory_report(self) -> Dict[str, int]:
+        # Bytes per frame for the slot array versus the old dict-backed nodes.
+        frames = self._size
+        items = self._slots[:frames]
+        total = sys.getsizeof(self._slots) + symbol_bytes(items)
+        legacy = legacy_frame_bytes(items)
+        return {
+            "frames": frames,
+            "total_bytes": total,
+            "bytes_per_frame": total // frames if frames else 0,
+            "legacy_total_bytes": legacy,
+            "legacy_bytes_per_frame": legacy // frames if frames else 0,
+        }
+
+    def _walk(self, start: int, step: int, count: int) -> Iterator[str]:
+        # Capture the version now so changes before the first next() count.
+        version = self._version
+        slots = self._slots
+        size = self._size
+
+        def generate() -> Iterator[str]:
+            for offset in range(count):
+                if self._version != version:
+                    raise RuntimeError("Carousel changed during iteration.")
+                yield slots[(start + step * offset) % size]
+
+        return generate()
+
+    def _ensure_space(self) -> None:
+        # Enforce the fixed capacity.
+        if self._size >= self._capacity:
+            raise ValueError("Carousel is full.")
+
+    def _position(self, index: int) -> int:
+        if not -self._size <= index < self._size:
+            raise IndexError("Carousel index out of range.")
+        return index % self._size
+
+    def _require_current(self) -> str:
+        if self._size == 0:
+            raise IndexError("Carousel is empty.")
+        return self._slots[self._cursor]
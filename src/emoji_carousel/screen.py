@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+CLEAR = "\x1b[H\x1b[2J"
+ERASE_LINE = "\x1b[K"
+ERASE_BELOW = "\x1b[J"
+
+
+def move_to(row: int, column: int) -> str:
+    # 0-based row/column to an ANSI cursor position.
+    return f"\x1b[{row + 1};{column + 1}H"
+
+
+def _safe_prefix(old: str, new: str) -> int:
+    # Length of the shared prefix we can skip. Only ASCII counts: emoji and
+    # box-drawing characters have terminal-dependent widths, so the cursor
+    # column past them is unknown and the rest of the line is rewritten.
+    limit = min(len(old), len(new))
+    index = 0
+    while index < limit and old[index] == new[index] and old[index] < "\x80":
+        index += 1
+    return index
+
+
+class Screen:
+    # Remembers the last frame on the terminal and turns the next one into
+    # cursor moves plus the changed part of each changed row. Rows that did
+    # not change cost nothing; everything below the frame (prompt echoes,
+    # messages) is erased so stale text never survives.
+    def __init__(self) -> None:
+        self._lines: Optional[List[str]] = None
+
+    def invalidate(self) -> None:
+        # Forget the terminal contents; the next frame is a full redraw.
+        self._lines = None
+
+    def reset(self) -> None:
+        # The terminal was just cleared.
+        self._lines = [""]
+
+    def update(self, text: str) -> str:
+        # Escape sequence that turns the previous frame into text.
+        new = text.split("\n")
+        old = self._lines
+        self._lines = new
+        if old is None:
+            return CLEAR + text
+
+        parts: List[str] = []
+        last = len(new) - 1
+        for row, line in enumerate(new[:last]):
+            previous = old[row] if row < len(old) else ""
+            if line == previous:
+                continue
+            column = _safe_prefix(previous, line)
+            parts.append(move_to(row, column) + line[column:] + ERASE_LINE)
+        # Park the cursor where writing the whole frame would have left it
+        # and clear whatever was printed after the previous frame.
+        parts.append(move_to(last, 0) + new[last] + ERASE_BELOW)
+        return "".join(parts)
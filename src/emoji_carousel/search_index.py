@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Set, Tuple
+
+FIELD_NAME = 0
+FIELD_ALIAS = 1
+FIELD_KEYWORD = 2
+
+# Lower rank sorts first.
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_WORD_PREFIX = 2
+RANK_SUBSTRING = 3
+RANK_ALIAS = 4
+RANK_KEYWORD = 5
+RANK_CATEGORY = 6
+
+
+def ngrams(text: str, n: int) -> Set[str]:
+    return {text[index:index + n] for index in range(len(text) - n + 1)}
+
+
+def rank_match(field: int, term: str, query: str) -> int:
+    # Order name hits by how well they match; aliases and keywords follow.
+    if field == FIELD_ALIAS:
+        return RANK_ALIAS
+    if field == FIELD_KEYWORD:
+        return RANK_KEYWORD
+    if term == query:
+        return RANK_EXACT
+    if term.startswith(query):
+        return RANK_PREFIX
+    if f" {query}" in f" {term}":
+        return RANK_WORD_PREFIX
+    return RANK_SUBSTRING
+
+
+class NGramIndex:
+    # Inverted n-gram index over lower-cased terms. A substring query is
+    # answered by intersecting the posting lists of its n-grams and then
+    # checking the few surviving terms.
+    def __init__(self, n: int = 3) -> None:
+        if n <= 0:
+            raise ValueError("N-gram size must be positive.")
+        self.n = n
+        self._terms: List[str] = []
+        self._owners: List[int] = []
+        self._fields: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+
+    def add(self, owner: int, term: str, field: int = FIELD_NAME) -> None:
+        # Index one term for an owner (an entry position in the catalog).
+        term = term.lower()
+        term_id = len(self._terms)
+        self._terms.append(term)
+        self._owners.append(owner)
+        self._fields.append(field)
+        postings = self._postings
+        for gram in ngrams(term, self.n):
+            postings.setdefault(gram, []).append(term_id)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def term(self, term_id: int) -> Tuple[int, int, str]:
+        return self._owners[term_id], self._fields[term_id], self._terms[term_id]
+
+    def matches(self, query: str) -> Iterator[int]:
+        # Yield ids of terms containing the (already lower-cased) query.
+        terms = self._terms
+        if len(query) < self.n:
+            # Too short to have an n-gram; fall back to the prebuilt terms.
+            return (term_id for term_id, term in enumerate(terms) if query in term)
+        postings = [self._postings.get(gram) for gram in ngrams(query, self.n)]
+        if not all(postings):
+            return iter(())
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return (term_id for term_id in sorted(candidates) if query in terms[term_id])
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .carousel import DEFAULT_ENGINE, Carousel, create_carousel
+from .history import OP_ADD, OP_DELETE, OP_MOVE, OP_SHUFFLE, History, Record, encode_record
+
+if TYPE_CHECKING:
+    from .emoji_catalog import EmojiCatalog, EmojiInfo
+
+MAX_SIZE = 5
+
+
+class CarouselSession:
+    # State behind one running carousel: the frames, the shared catalog and
+    # the undo history. Operations only change state; front ends do the
+    # prompting and animation around them and report the ValueError raised
+    # when an operation cannot run. When journal is set it is called with
+    # every change in journal form (see persistence).
+    def __init__(
+        self,
+        capacity: int = MAX_SIZE,
+        engine: str = DEFAULT_ENGINE,
+        catalog: Optional[EmojiCatalog] = None,
+        history: Optional[History] = None,
+    ) -> None:
+        self.capacity = capacity
+        self.engine = engine
+        self.carousel: Carousel = create_carousel(capacity, engine)
+        self._catalog = catalog
+        self.history = history if history is not None else History()
+        self.history.snapshot(self.carousel)
+        self.journal: Optional[Callable[[list], None]] = None
+        # Bumped by every full save (see persistence).
+        self.generation = 0
+
+    @property
+    def catalog(self) -> EmojiCatalog:
+        # Loaded (from the shared cache) by the first command that needs it,
+        # not before the first prompt.
+        if self._catalog is None:
+            from .catalog_cache import get_catalog
+
+            self._catalog = get_catalog()
+        return self._catalog
+
+    def size(self) -> int:
+        return self.carousel.size()
+
+    def is_full(self) -> bool:
+        return self.carousel.size() >= self.capacity
+
+    def add(self, symbol: str, direction: str = "") -> None:
+        # The first frame needs no side; later ones go left or right.
+        carousel = self.carousel
+        if carousel.size() == 0:
+            cursor = 0
+            carousel.add(symbol)
+        else:
+            cursor = carousel.current_index()
+            carousel.insert(direction, symbol)
+        self._push(Record(OP_ADD, carousel.current_index(), cursor, symbol))
+
+    def delete(self) -> str:
+        carousel = self.carousel
+        if carousel.size() == 0:
+            raise ValueError("Nothing to delete.")
+        index = carousel.current_index()
+        removed = carousel.remove()
+        self._push(Record(OP_DELETE, index, index, removed))
+        return removed
+
+    def move(self, direction: str) -> None:
+        carousel = self.carousel
+        cursor = carousel.current_index()
+        if direction == "left":
+            carousel.move_left()
+        elif direction == "right":
+            carousel.move_right()
+        else:
+            raise ValueError("Invalid direction.")
+        self._push(Record(OP_MOVE, carousel.current_index(), cursor))
+
+    def shuffle(self) -> None:
+        carousel = self.carousel
+        if carousel.size() <= 1:
+            raise ValueError("Not enough items to shuffle.")
+        cursor = carousel.current_index()
+        self.history.snapshot(carousel)
+        carousel.shuffle()
+        self._push(Record(OP_SHUFFLE, carousel.current_index(), cursor, order=tuple(carousel)))
+
+    def random_emoji(self) -> EmojiInfo:
+        # Drawn from the catalog's own entry table, shared by every session.
+        import random
+
+        entries = self.catalog.entries
+        if not entries:
+            raise ValueError("No emojis available.")
+        return random.choice(entries)
+
+    def undo(self, steps: int = 1) -> int:
+        steps = self.history.undo(self.carousel, steps)
+        if self.journal is not None:
+            self.journal(["undo", steps])
+        return steps
+
+    def undo_record(self, record: Record) -> None:
+        # Undo one specific record, which must still be the newest applied
+        # one; anything recorded on top of it has to be undone first.
+        if self.history.last() is not record:
+            raise ValueError("Only the last action can be undone.")
+        self.undo()
+
+    def redo(self, steps: int = 1) -> int:
+        steps = self.history.redo(self.carousel, steps)
+        if self.journal is not None:
+            self.journal(["redo", steps])
+        return steps
+
+    def reset(self) -> None:
+        # Start over with an empty carousel and history.
+        self.carousel = create_carousel(self.capacity, self.engine)
+        self.history.clear()
+        self.history.snapshot(self.carousel)
+        if self.journal is not None:
+            self.journal(["reset"])
+
+    def _push(self, record: Record) -> None:
+        self.history.push(self.carousel, record)
+        if self.journal is not None:
+            self.journal(encode_record(record))
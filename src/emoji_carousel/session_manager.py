@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from .carousel import DEFAULT_ENGINE
+from .catalog_cache import get_catalog
+from .emoji_catalog import EmojiCatalog
+from .persistence import load_session, save_session
+from .session import MAX_SIZE, CarouselSession
+
+# Session ids double as file names in the session directory.
+_SESSION_ID = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]{0,127}")
+SESSION_SUFFIX = ".carousel"
+
+
+class _Live:
+    # A session held in memory: when it was last used and how many hold()
+    # blocks are using it right now (held sessions are never evicted).
+    __slots__ = ("last_used", "session", "holds")
+
+    def __init__(self, last_used: float, session: CarouselSession) -> None:
+        self.last_used = last_used
+        self.session = session
+        self.holds = 0
+
+
+class SessionManager:
+    # Hosts many independent carousel sessions in one process. Sessions are
+    # created (or loaded from directory) on first use, all share one indexed
+    # catalog, and their frames share the process-wide symbol table. Sessions
+    # idle for longer than idle_timeout, or the least recently used ones
+    # beyond max_live, are saved to directory and dropped from memory until
+    # they are asked for again. Without a directory nothing is evicted.
+    # Use hold() while working on a session so it cannot be evicted midway;
+    # a session from get() that is evicted while its caller still uses it
+    # is handed out again (not reloaded) and saved again by save_all/close.
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        capacity: int = MAX_SIZE,
+        engine: str = DEFAULT_ENGINE,
+        catalog: Optional[EmojiCatalog] = None,
+        idle_timeout: Optional[float] = 300.0,
+        max_live: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+        if max_live is not None and max_live <= 0:
+            raise ValueError("max_live must be positive.")
+        self.directory = directory
+        self.capacity = capacity
+        self.engine = engine
+        self.catalog = catalog if catalog is not None else get_catalog()
+        self.idle_timeout = idle_timeout
+        self.max_live = max_live
+        self._clock = clock
+        # Least recently used first.
+        self._live: "OrderedDict[str, _Live]" = OrderedDict()
+        # Evicted sessions that something outside the manager still holds.
+        self._dropped: "weakref.WeakValueDictionary[str, CarouselSession]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._lock = threading.Lock()
+        self._stats = {"created": 0, "loaded": 0, "evicted": 0, "revived": 0}
+        if directory is not None:
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, session_id: str, capacity: Optional[int] = None) -> CarouselSession:
+        # The session for session_id, creating it with capacity (default:
+        # the manager's) when it has never been seen. A saved session keeps
+        # the capacity it was created with.
+        path = self._path(session_id)
+        with self._lock:
+            entry = self._touch(session_id, path, capacity)
+            self._evict(entry.last_used)
+            return entry.session
+
+    @contextmanager
+    def hold(self, session_id: str, capacity: Optional[int] = None) -> Iterator[CarouselSession]:
+        # get() for the length of a with block: the session is not evicted
+        # until the block ends, and counts as used at that point.
+        path = self._path(session_id)
+        with self._lock:
+            entry = self._touch(session_id, path, capacity)
+            entry.holds += 1
+            self._evict(entry.last_used)
+        try:
+            yield entry.session
+        finally:
+            with self._lock:
+                entry.holds -= 1
+                entry.last_used = self._clock()
+                if self._live.get(session_id) is entry:
+                    self._live.move_to_end(session_id)
+                    self._evict(entry.last_used)
+                elif path is not None:
+                    # close() saved it while held; save the later changes.
+                    save_session(entry.session, path)
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._live
+
+    def __len__(self) -> int:
+        # Sessions currently held in memory.
+        with self._lock:
+            return len(self._live)
+
+    def live_ids(self) -> List[str]:
+        # In-memory sessions, least recently used first.
+        with self._lock:
+            return list(self._live)
+
+    def saved_ids(self) -> List[str]:
+        # Sessions with a file in the directory (evicted or saved).
+        if self.directory is None:
+            return []
+        return sorted(path.stem for path in self.directory.glob("*" + SESSION_SUFFIX))
+
+    def evict(self, session_id: str) -> bool:
+        # Save one session and drop it from memory. False when it is not live
+        # or there is nowhere to save it.
+        with self._lock:
+            entry = self._live.get(session_id)
+            if self.directory is None or entry is None or entry.holds:
+                return False
+            self._drop(session_id)
+            return True
+
+    def evict_idle(self) -> int:
+        # Evict every session past the idle timeout; returns how many.
+        with self._lock:
+            return self._evict(self._clock())
+
+    def save_all(self) -> None:
+        # Write every live session without evicting it, and evicted ones
+        # still in use elsewhere.
+        if self.directory is None:
+            return
+        with self._lock:
+            for session_id, entry in self._live.items():
+                save_session(entry.session, self._path(session_id))
+            self._save_dropped()
+
+    def close(self) -> None:
+        # Save and drop everything (live sessions are simply discarded when
+        # there is no directory). Sessions still held are saved again when
+        # their hold() block ends.
+        with self._lock:
+            if self.directory is None:
+                self._live.clear()
+                return
+            self._save_dropped()
+            while self._live:
+                self._drop(next(iter(self._live)))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, live=len(self._live))
+
+    def _path(self, session_id: str) -> Optional[Path]:
+        if not _SESSION_ID.fullmatch(session_id):
+            raise ValueError(f"Invalid session id: {session_id!r}.")
+        if self.directory is None:
+            return None
+        return self.directory / (session_id + SESSION_SUFFIX)
+
+    def _touch(
+        self, session_id: str, path: Optional[Path], capacity: Optional[int]
+    ) -> _Live:
+        # The live entry for session_id, opened if needed and marked as the
+        # most recently used.
+        if capacity is not None and capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+        now = self._clock()
+        entry = self._live.pop(session_id, None)
+        if entry is None:
+            session = self._dropped.pop(session_id, None)
+            if session is not None:
+                # Evicted while its caller kept using it: that copy is newer
+                # than the file.
+                self._stats["revived"] += 1
+            else:
+                session = self._open(session_id, path, capacity or self.capacity)
+            entry = _Live(now, session)
+        entry.last_used = now
+        self._live[session_id] = entry
+        return entry
+
+    def _open(self, session_id: str, path: Optional[Path], capacity: int) -> CarouselSession:
+        if path is not None and path.exists():
+            self._stats["loaded"] += 1
+            return load_session(path, catalog=self.catalog)
+        self._stats["created"] += 1
+        return CarouselSession(capacity, self.engine, self.catalog)
+
+    def _evict(self, now: float) -> int:
+        # Oldest first, so the scan stops at the first unheld session still
+        # in use; held ones are skipped.
+        if self.directory is None:
+            return 0
+        victims: List[str] = []
+        remaining = len(self._live)
+        for session_id, entry in self._live.items():
+            if entry.holds:
+                continue
+            idle = self.idle_timeout is not None and now - entry.last_used > self.idle_timeout
+            crowded = self.max_live is not None and remaining > self.max_live
+            if not (idle or crowded):
+                break
+            victims.append(session_id)
+            remaining -= 1
+        for session_id in victims:
+            self._drop(session_id)
+        return len(victims)
+
+    def _drop(self, session_id: str) -> None:
+        session = self._live.pop(session_id).session
+        save_session(session, self._path(session_id))
+        self._dropped[session_id] = session
+        self._stats["evicted"] += 1
+
+    def _save_dropped(self) -> None:
+        for session_id, session in list(self._dropped.items()):
+            save_session(session, self._path(session_id))
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+# Process-wide table so equal symbols share one string object across every
+# carousel, whatever engine or catalog they came from. Entries are never
+# dropped, so the table is capped: real emoji sets are a few thousand
+# symbols, and past the cap new symbols are kept as given.
+MAX_INTERNED = 16_384
+_SYMBOLS: Dict[str, str] = {}
+
+
+def intern_symbol(symbol: str) -> str:
+    # Return the canonical string object for a symbol.
+    canonical = _SYMBOLS.get(symbol)
+    if canonical is not None:
+        return canonical
+    if len(_SYMBOLS) < MAX_INTERNED:
+        _SYMBOLS[symbol] = symbol
+    return symbol
+
+
+def symbol_bytes(items: Iterable[str]) -> int:
+    # Bytes held by the distinct string objects behind a run of items.
+    unique = {id(item): item for item in items}
+    return sum(sys.getsizeof(item) for item in unique.values())
+
+
+@lru_cache(maxsize=None)
+def legacy_node_bytes() -> int:
+    # Size of one dict-backed dataclass node, including its __dict__. The
+    # class is built here so carousels load without dataclasses.
+    from dataclasses import dataclass
+
+    @dataclass
+    class _DictNode:
+        # The original node layout (per-instance __dict__), kept for comparison.
+        data: str
+        next: Optional[object] = None
+        prev: Optional[object] = None
+
+    probe = _DictNode("")
+    return sys.getsizeof(probe) + sys.getsizeof(probe.__dict__)
+
+
+def legacy_frame_bytes(items: Iterable[str]) -> int:
+    # Bytes the old layout needed: one dict-backed node per frame. Its items
+    # were the catalog's shared symbol objects too, so strings are counted
+    # once per distinct object, as for the current layouts.
+    items = list(items)
+    return legacy_node_bytes() * len(items) + symbol_bytes(items)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from . import art
+from .animation import AnimationScheduler, Frame
+from .carousel import Carousel
+from .renderer import FrameRenderer
+
+if TYPE_CHECKING:
+    # Only for annotations: the catalog module loads with the first lookup.
+    from .emoji_catalog import EmojiCatalog, EmojiInfo
+
+FRAME_DELAY = 0.2
+ANIMATION_FPS = 30.0
+PROMPT = ">> "
+
+RENDERER = FrameRenderer()
+SCHEDULER = AnimationScheduler(RENDERER.write_frame, fps=ANIMATION_FPS)
+
+
+def clear_screen() -> None:
+    RENDERER.clear()
+
+
+def current_frame(carousel: Carousel) -> str:
+    # The board for the current carousel state ("" when empty).
+    size = carousel.size()
+    if size == 0:
+        return ""
+    if size == 1:
+        return art.render("one_item_print", carousel.current_item())
+    return art.render(
+        "three_item_print",
+        carousel.peek_left(),
+        carousel.current_item(),
+        carousel.peek_right(),
+    )
+
+
+def action_frame(carousel: Carousel, action: str) -> str:
+    # Transition art for a move/delete action.
+    size = carousel.size()
+    if action == "del" and size == 1:
+        return art.render("last_del")
+    if action == "del" and size >= 2:
+        return art.render("not_last_del", carousel.peek_left(), carousel.peek_right())
+    if action == "l" and size >= 2:
+        return art.render("print_going_left", carousel.peek_left(), carousel.peek_right())
+    if action == "r" and size >= 2:
+        return art.render("print_going_right", carousel.peek_left(), carousel.peek_right())
+    return ""
+
+
+def add_frame(carousel: Carousel, position: str) -> str:
+    # Transition art for an add action.
+    size = carousel.size()
+    if size == 0:
+        return art.render("first_add")
+    if position == "left" and size == 1:
+        return art.render("print_adding_left_one")
+    if position == "left" and size >= 2:
+        return art.render("print_adding_left_two", carousel.peek_left(), carousel.peek_right())
+    if position == "right" and size == 1:
+        return art.render("print_adding_right_one")
+    if position == "right" and size >= 2:
+        return art.render("print_adding_right_two", carousel.peek_left(), carousel.peek_right())
+    return ""
+
+
+def transition(carousel: Carousel, art_frame: str) -> List[Frame]:
+    # The current board, then the transition art held a little longer.
+    frames = [(art_frame, FRAME_DELAY * 3)]
+    if carousel.size():
+        frames.insert(0, (current_frame(carousel), FRAME_DELAY))
+    return frames
+
+
+def sample_names(catalog: EmojiCatalog, limit: int = 8) -> List[str]:
+    # Grab a small set of example names for the prompt.
+    names: List[str] = []
+    for group in catalog:
+        for name in group.get("emojis", {}).keys():
+            names.append(name)
+            if len(names) >= limit:
+                return names
+    return names
+
+
+@lru_cache(maxsize=None)
+def _palette() -> Optional[Tuple[str, str, Dict[str, str]]]:
+    # colorama is optional and probed on the first colored output rather
+    # than at import. Returns (default color, reset, color per category).
+    try:
+        from colorama import Fore, Style, init as colorama_init
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    colorama_init(autoreset=True)
+    return Fore.CYAN, Style.RESET_ALL, {"food": Fore.GREEN, "animals": Fore.YELLOW}
+
+
+def colorize(text: str, category: str) -> str:
+    palette = _palette()
+    if palette is None:
+        return text
+    default, reset, colors = palette
+    return f"{colors.get(category.lower(), default)}{text}{reset}"
+
+
+def describe(item: EmojiInfo, color: bool = False) -> str:
+    label = f"{item.name} {item.symbol} ({item.category})"
+    return colorize(label, item.category) if color else label
+
+
+def format_info(item: EmojiInfo) -> str:
+    # Details about one emoji, as shown by the interactive info command.
+    return (
+        f"Object: {colorize(item.name, item.category)}\n"
+        f"Sym: {colorize(item.symbol, item.category)}\n"
+        f"Class: {colorize(item.category, item.category)}\n"
+    )
+
+
+def format_matches(matches: List[EmojiInfo], color: bool = False) -> str:
+    if not matches:
+        return "No matches found."
+    if not color:
+        return "\n".join(describe(item) for item in matches)
+    return "Matches:\n" + "\n".join(f"  {describe(item, True)}" for item in matches)
+
+
+def render_matches(matches: List[EmojiInfo]) -> None:
+    # Show matches in a compact list for selection.
+    # A long listing may scroll the terminal, so redraw the next frame fully.
+    RENDERER.invalidate()
+    print(format_matches(matches, color=True))
+
+
+def fuzzy_suggestions(
+    catalog: EmojiCatalog, query: str, limit: int = 5, cutoff: float = 0.6
+) -> List[str]:
+    # Close name matches from the catalog's prebuilt fuzzy matcher.
+    return catalog.fuzzy_matcher().suggestions(query, limit, cutoff)
@@ -0,0 +1,101 @@
+import threading
+import unittest
+from typing import List
+
+from emoji_carousel.animation import AnimationScheduler
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestAnimationScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = _Clock()
+        self.drawn: List[str] = []
+        self.scheduler = AnimationScheduler(self.drawn.append, fps=10.0, clock=self.clock)
+
+    def test_frames_follow_the_clock(self) -> None:
+        self.scheduler.play([("a", 0.5), ("b", 0.5)])
+        self.assertTrue(self.scheduler.tick())
+        self.clock.now = 0.2
+        self.scheduler.tick()
+        self.assertEqual(self.drawn, ["a"])
+        self.assertEqual(self.scheduler.next_deadline(), 0.5)
+        self.clock.now = 0.5
+        self.assertFalse(self.scheduler.tick())
+        self.assertEqual(self.drawn, ["a", "b"])
+
+    def test_late_tick_skips_to_newest_due_frame(self) -> None:
+        self.scheduler.play([("a", 0.1), ("b", 0.1), ("c", 0.1), ("d", 0.1)])
+        self.clock.now = 0.25
+        self.assertTrue(self.scheduler.tick())
+        self.assertEqual(self.drawn, ["c"])
+        self.assertEqual(self.scheduler.skipped, 2)
+
+    def test_frame_rate_caps_draws(self) -> None:
+        self.scheduler.play([("a", 0.01), ("b", 0.01)])
+        self.scheduler.tick()
+        self.clock.now = 0.05
+        self.scheduler.tick()
+        self.assertEqual(self.drawn, ["a"])
+        self.assertEqual(self.scheduler.next_deadline(), 0.1)
+
+    def test_queue_plays_after_pending_frames(self) -> None:
+        self.scheduler.play([("a", 1.0)])
+        self.scheduler.play([("b", 0.0)])
+        self.scheduler.tick()
+        self.clock.now = 0.5
+        self.scheduler.tick()
+        self.assertEqual(self.drawn, ["a"])
+        self.clock.now = 1.0
+        self.scheduler.tick()
+        self.assertEqual(self.drawn, ["a", "b"])
+
+    def test_interrupt_drops_pending_frames(self) -> None:
+        self.scheduler.play([("a", 1.0), ("b", 1.0)])
+        self.scheduler.tick()
+        self.clock.now = 0.5
+        self.scheduler.play([("c", 0.0)], interrupt=True)
+        self.scheduler.tick()
+        self.assertEqual(self.drawn, ["a", "c"])
+        self.assertEqual(self.scheduler.skipped, 1)
+        self.assertFalse(self.scheduler.pending())
+
+    def test_finish_draws_last_frame(self) -> None:
+        self.scheduler.play([("a", 1.0), ("b", 1.0), ("menu", 0.0)])
+        self.scheduler.finish()
+        self.assertEqual(self.drawn, ["menu"])
+        self.assertFalse(self.scheduler.pending())
+        self.scheduler.finish()
+        self.assertEqual(self.drawn, ["menu"])
+
+    def test_timer_thread_draws_frames(self) -> None:
+        done = threading.Event()
+        drawn: List[str] = []
+
+        def draw(text: str) -> None:
+            drawn.append(text)
+            if text == "b":
+                done.set()
+
+        scheduler = AnimationScheduler(draw, fps=100.0)
+        scheduler.start()
+        try:
+            scheduler.play([("a", 0.01), ("b", 0.0)])
+            self.assertTrue(done.wait(2.0))
+        finally:
+            scheduler.stop()
+        self.assertEqual(drawn[-1], "b")
+
+    def test_rejects_bad_frame_rate(self) -> None:
+        with self.assertRaises(ValueError):
+            AnimationScheduler(self.drawn.append, fps=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
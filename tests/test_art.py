@@ -0,0 +1,35 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from emoji_carousel import art
+
+
+class TestArtTemplates(unittest.TestCase):
+    def test_render_fills_slots_in_order(self) -> None:
+        frame = art.render("three_item_print", "L", "C", "R")
+        line = frame.splitlines()[4]
+        self.assertLess(line.index("L"), line.index("C"))
+        self.assertLess(line.index("C"), line.index("R"))
+        self.assertNotIn(art.SLOT, frame)
+
+    def test_print_helpers_write_one_frame(self) -> None:
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            art.not_last_del("A", "B")
+        self.assertEqual(buffer.getvalue(), art.render("not_last_del", "A", "B"))
+        self.assertEqual(len(buffer.getvalue().splitlines()), 9)
+
+    def test_render_is_cached(self) -> None:
+        art.render.cache_clear()
+        first = art.render("one_item_print", "X")
+        self.assertIs(art.render("one_item_print", "X"), first)
+        self.assertEqual(art.render.cache_info().hits, 1)
+
+    def test_wrong_slot_count(self) -> None:
+        with self.assertRaises(ValueError):
+            art.render("first_add", "X")
+
+
+if __name__ == "__main__":
+    unittest.main()
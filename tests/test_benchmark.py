@@ -0,0 +1,51 @@
+import importlib.util
+import io
+import unittest
+from unittest import mock
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "benchmark.py"
+spec = importlib.util.spec_from_file_location("benchmark", SCRIPT)
+benchmark = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(benchmark)
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_quick_run_reports_every_case(self) -> None:
+        report = benchmark.run_benchmarks(quick=True, rounds=1, budget=0.0, only="n=5")
+        self.assertEqual(report["format"], benchmark.FORMAT)
+        self.assertIn("carousel.linked.insert/n=5", report["results"])
+        self.assertIn("carousel.ring.replace_items/n=5", report["results"])
+        for result in report["results"].values():
+            self.assertEqual(result["rounds"], 1)
+            self.assertGreater(result["best_ns"], 0)
+
+    def test_only_skips_setup_of_unselected_groups(self) -> None:
+        with mock.patch.object(benchmark, "synthetic_groups", side_effect=AssertionError):
+            names = [name for name, _ in benchmark.all_cases(False, io.StringIO(), "render.")]
+        self.assertEqual(names, ["render.diff", "render.full"])
+        names = [name for name, _ in benchmark.all_cases(True, io.StringIO(), "seek/n=5")]
+        self.assertEqual(names, ["carousel.linked.seek/n=5", "carousel.ring.seek/n=5"])
+
+    def test_compare_flags_slowdowns(self) -> None:
+        def report(**times):
+            results = {name: {"best_ns": value} for name, value in times.items()}
+            return {"format": benchmark.FORMAT, "results": results}
+
+        baseline = report(fast=100.0, slow=100.0)
+        current = report(fast=110.0, slow=200.0, new=5.0)
+        regressions = benchmark.compare(current, baseline, 1.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("slow:"))
+        with self.assertRaises(ValueError):
+            benchmark.compare(current, {"format": 0, "results": {}}, 1.25)
+
+    def test_synthetic_catalog_is_unique(self) -> None:
+        groups = benchmark.synthetic_groups(250)
+        symbols = [symbol for group in groups for symbol in group["emojis"].values()]
+        self.assertEqual(len(groups), 3)
+        self.assertEqual(len(set(symbols)), 250)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from emoji_carousel.catalog_cache import CatalogCache
+from emoji_carousel.emoji_catalog import DEFAULT_CATALOG_PATH, load_catalog
+
+
+class TestCatalogCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        root = Path(self.directory.name)
+        self.source = root / "emojis.json"
+        shutil.copyfile(DEFAULT_CATALOG_PATH, self.source)
+        self.disk_dir = root / "cache"
+
+    def test_hits_share_one_catalog(self) -> None:
+        cache = CatalogCache()
+        first = cache.get(self.source)
+        self.assertIs(cache.get(self.source), first)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_modified_file_is_reloaded(self) -> None:
+        cache = CatalogCache()
+        first = cache.get(self.source)
+        stat = self.source.stat()
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertIsNot(cache.get(self.source), first)
+        cache.invalidate(self.source)
+        cache.get(self.source)
+        self.assertEqual(cache.stats()["misses"], 3)
+
+    def test_lru_eviction(self) -> None:
+        other = Path(self.directory.name) / "other.json"
+        shutil.copyfile(DEFAULT_CATALOG_PATH, other)
+        cache = CatalogCache(max_entries=1)
+        cache.get(self.source)
+        cache.get(other)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(cache.stats()["size"], 1)
+
+    def test_disk_cache_shared_between_instances(self) -> None:
+        loader = lambda path: load_catalog(path, use_compiled=False)
+        CatalogCache(disk_dir=self.disk_dir, loader=loader).get(self.source)
+        second = CatalogCache(disk_dir=self.disk_dir, loader=loader)
+        catalog = second.get(self.source)
+        self.assertEqual(second.stats()["disk_hits"], 1)
+        self.assertEqual(catalog.find_by_name("grape").symbol, "🍇")
+        self.assertEqual(catalog.search("apple"), load_catalog(self.source).search("apple"))
+        second.invalidate()
+        self.assertEqual(list(self.disk_dir.glob("*.pickle")), [])
+
+    def test_unwritable_disk_dir_keeps_memory_cache(self) -> None:
+        # A regular file where the cache directory should be.
+        cache = CatalogCache(disk_dir=self.source / "cache")
+        catalog = cache.get(self.source)
+        self.assertEqual(catalog.find_by_name("grape").symbol, "🍇")
+        self.assertIs(cache.get(self.source), catalog)
+
+    def test_malformed_pickle_is_ignored(self) -> None:
+        loader = lambda path: load_catalog(path, use_compiled=False)
+        CatalogCache(disk_dir=self.disk_dir, loader=loader).get(self.source)
+        for stored in self.disk_dir.glob("*.pickle"):
+            stored.write_bytes(pickle.dumps(42))
+        cache = CatalogCache(disk_dir=self.disk_dir, loader=loader)
+        self.assertEqual(cache.get(self.source).find_by_name("grape").symbol, "🍇")
+        self.assertEqual(cache.stats()["disk_hits"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from typing import List, Optional
+
+from emoji_carousel.commands import COMMANDS, Command, choose, lookup, menu_lines, perform
+from emoji_carousel.emoji_catalog import EmojiCatalog
+from emoji_carousel.session import CarouselSession
+
+GROUPS = [
+    {"class": "food", "emojis": {"grape": "🍇", "lemon": "🍋"}},
+    {"class": "animals", "emojis": {"ant": "🐜"}},
+]
+
+
+def answer(command: Command, session: CarouselSession, *answers: str) -> Optional[List[str]]:
+    # Drive a question flow with canned answers, hiding what it prints.
+    flow = command.ask(session)
+    replies = iter(answers)
+    with redirect_stdout(io.StringIO()):
+        try:
+            next(flow)
+            while True:
+                flow.send(next(replies))
+        except StopIteration as stop:
+            return stop.value
+
+
+class TestCommands(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session = CarouselSession(capacity=2, catalog=EmojiCatalog(GROUPS))
+
+    def run_command(self, name: str, *args: str) -> object:
+        command = lookup(name)
+        return perform(self.session, command, command.parse(list(args)))
+
+    def test_menu_follows_state(self) -> None:
+        self.assertNotIn("L: Move left", menu_lines(self.session))
+        self.assertNotIn("DEL: Delete current emoji frame", menu_lines(self.session))
+        self.run_command("add", "grape")
+        self.run_command("add", "lemon", "left")
+        lines = menu_lines(self.session)
+        self.assertEqual(lines[:2], ["L: Move left", "R: Move right"])
+        self.assertNotIn("ADD: Add an emoji frame", lines)
+        self.assertNotIn("CATEGORY: Browse a category", lines)
+        self.assertEqual(lines[-1], "Q: Quit the program")
+
+    def test_choose_rejects_unavailable(self) -> None:
+        for words in (["l"], ["bogus"], []):
+            with self.subTest(words=words), self.assertRaises(ValueError):
+                choose(self.session, words)
+        self.assertIs(choose(self.session, ["ADD"]), COMMANDS["add"])
+
+    def test_add_questions(self) -> None:
+        add = lookup("add")
+        self.assertEqual(answer(add, self.session, "grape"), ["grape"])
+        self.run_command("add", "grape")
+        self.assertEqual(answer(add, self.session, "lemon", "left"), ["lemon", "left"])
+        self.assertEqual(answer(add, self.session, "lemn", "left", "lemon"), ["lemon", "left"])
+        with self.assertRaises(ValueError):
+            answer(add, self.session, "lemon", "up")
+        with self.assertRaises(ValueError):
+            answer(add, self.session, "lemn", "left", "")
+
+    def test_category_browse_and_add(self) -> None:
+        category = lookup("category")
+        self.assertIsNone(answer(category, self.session, "food", ""))
+        self.assertEqual(answer(category, self.session, "animals", "ant"), ["animals", "ant"])
+        result = self.run_command("category", "food")
+        self.assertEqual([item.name for item in result], ["grape", "lemon"])
+        self.assertEqual(category.show(result), "grape 🍇 (food)\nlemon 🍋 (food)")
+        self.run_command("category", "animals", "ant")
+        self.assertEqual(self.session.carousel.current_item(), "🐜")
+
+    def test_render_hook(self) -> None:
+        self.run_command("add", "grape")
+        add = lookup("add")
+        request = add.parse(["lemon", "right"])
+        frames = add.render(self.session, request)
+        self.assertEqual(len(frames), 2)
+        perform(self.session, add, request)
+        self.run_command("undo")
+        self.assertEqual(list(self.session.carousel), ["🍇"])
+
+    def test_undo_hook_reverts_its_own_record(self) -> None:
+        self.run_command("add", "grape")
+        add = lookup("add")
+        record = perform(self.session, add, add.parse(["lemon", "right"]))
+        self.assertIsNone(add.show(record))
+        # Something else was recorded on top: refuse rather than revert it.
+        self.run_command("l")
+        with self.assertRaises(ValueError):
+            add.undo(self.session, record)
+        self.assertEqual(list(self.session.carousel), ["🍇", "🍋"])
+        self.run_command("undo")
+        add.undo(self.session, record)
+        self.assertEqual(list(self.session.carousel), ["🍇"])
+        with self.assertRaises(ValueError):
+            add.undo(self.session, record)
+
+    def test_browsing_and_queries_cannot_be_undone(self) -> None:
+        category = lookup("category")
+        listing = perform(self.session, category, category.parse(["food"]))
+        with self.assertRaisesRegex(ValueError, "Browsing a category"):
+            category.undo(self.session, listing)
+        for name, args in (("search", ["grape"]), ("show", [])):
+            command = lookup(name)
+            result = perform(self.session, command, command.parse(args))
+            with self.assertRaisesRegex(ValueError, "cannot be undone"):
+                command.undo(self.session, result)
+        # Adding from a category is undoable like add.
+        record = perform(self.session, category, category.parse(["food", "grape"]))
+        info = lookup("info")
+        with self.assertRaisesRegex(ValueError, "info cannot be undone"):
+            info.undo(self.session, perform(self.session, info, ()))
+        category.undo(self.session, record)
+        self.assertEqual(self.session.size(), 0)
+
+    def test_parse_errors(self) -> None:
+        for name, args in (("add", []), ("del", ["x"]), ("undo", ["0"]), ("random", ["up"])):
+            with self.subTest(name=name), self.assertRaises(ValueError):
+                lookup(name).parse(args)
+
+
+if __name__ == "__main__":
+    unittest.main()
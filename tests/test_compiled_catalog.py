@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from emoji_carousel.compiled_catalog import CompiledCatalog, compile_catalog, load_compiled
+from emoji_carousel.emoji_catalog import DEFAULT_CATALOG_PATH, load_catalog
+
+
+class TestCompiledCatalog(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.source = Path(self.directory.name) / "emojis.json"
+        with DEFAULT_CATALOG_PATH.open("r", encoding="utf-8") as handle:
+            groups = json.load(handle)
+        groups[0]["aliases"] = {"grape": ["vine fruit"]}
+        self.source.write_text(json.dumps(groups), encoding="utf-8")
+        self.target = compile_catalog(self.source)
+
+    def test_matches_json_catalog(self) -> None:
+        compiled = load_catalog(self.source)
+        self.addCleanup(compiled.close)
+        plain = load_catalog(self.source, use_compiled=False)
+        self.assertIsInstance(compiled, CompiledCatalog)
+        self.assertEqual(compiled.find_by_name("grape"), plain.find_by_name("grape"))
+        self.assertEqual(compiled.find_by_symbol("🐶"), plain.find_by_symbol("🐶"))
+        self.assertIsNone(compiled.find_by_name("not an emoji"))
+        self.assertEqual(compiled.list_categories(), plain.list_categories())
+        self.assertEqual(compiled.search("vine"), plain.search("vine"))
+        self.assertEqual(compiled.entries, plain.entries)
+
+    def test_batch_lookups(self) -> None:
+        compiled = load_catalog(self.source)
+        self.addCleanup(compiled.close)
+        plain = load_catalog(self.source, use_compiled=False)
+        names = [info.name for info in plain.entries] + ["not an emoji", "", "zzz"]
+        symbols = [info.symbol for info in plain.entries] + ["?"]
+        # Many keys take the merge pass, a couple the binary searches.
+        for keys in (names, names[:1] + names[-1:]):
+            self.assertEqual(compiled.find_many_by_name(keys), plain.find_many_by_name(keys))
+        for keys in (symbols, symbols[-2:]):
+            self.assertEqual(compiled.find_many_by_symbol(keys), plain.find_many_by_symbol(keys))
+        self.assertNotIn("_by_name", vars(compiled))
+
+    def test_stale_compiled_file_falls_back_to_json(self) -> None:
+        stat = self.source.stat()
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertIsNone(load_compiled(self.target, source=self.source))
+        self.assertNotIsInstance(load_catalog(self.source), CompiledCatalog)
+
+    def test_corrupt_file_is_ignored(self) -> None:
+        self.target.write_bytes(b"not a catalog")
+        self.assertIsNone(load_compiled(self.target))
+
+    def test_truncated_file_falls_back_to_json(self) -> None:
+        # The header is intact and still matches the source.
+        data = self.target.read_bytes()
+        for length in (len(data) // 2, len(data) - 1, 40):
+            self.target.write_bytes(data[:length])
+            self.assertIsNone(load_compiled(self.target, source=self.source))
+            catalog = load_catalog(self.source)
+            self.assertNotIsInstance(catalog, CompiledCatalog)
+            self.assertEqual(catalog.find_by_name("grape").symbol, "🍇")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import io
+import unittest
+from contextlib import redirect_stderr
+
+from emoji_carousel.app import run
+from emoji_carousel.commands import parse_line
+from emoji_carousel.dispatcher import Dispatcher
+from emoji_carousel.emoji_catalog import EmojiCatalog
+from emoji_carousel.headless import run_batch
+from emoji_carousel.session import CarouselSession
+
+GROUPS = [
+    {"class": "Food", "emojis": {"grape": "🍇", "lemon": "🍋", "red apple": "🍎"}},
+]
+
+
+class TestDispatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dispatcher = Dispatcher(CarouselSession(capacity=3, catalog=EmojiCatalog(GROUPS)))
+
+    def run_lines(self, *lines: str) -> None:
+        for line in lines:
+            self.dispatcher.execute(line)
+
+    def test_parse_line(self) -> None:
+        self.assertEqual(parse_line('add "red apple" left  # note'), ["add", "red apple", "left"])
+        self.assertEqual(parse_line("   # only a comment"), [])
+
+    def test_commands_change_state(self) -> None:
+        self.run_lines("add grape", "add red apple left", "add 🍋 right", "l")
+        self.assertEqual(self.dispatcher.execute("show"), "[🍎] 🍋 🍇")
+        self.run_lines("del", "undo")
+        self.assertEqual(self.dispatcher.execute("show"), "[🍎] 🍋 🍇")
+        self.assertEqual(self.dispatcher.execute("info"), "red apple 🍎 (Food)")
+
+    def test_errors(self) -> None:
+        for line in ("bogus", "add", "add nothing", "del", "l", "undo", "info"):
+            with self.subTest(line=line), self.assertRaises(ValueError):
+                self.dispatcher.execute(line)
+        self.run_lines("add grape", "add grape", "add grape")
+        with self.assertRaises(ValueError):
+            self.dispatcher.execute("random")
+
+    def test_reset(self) -> None:
+        self.run_lines("add grape", "reset")
+        self.assertEqual(self.dispatcher.execute("show"), "(empty)")
+
+
+class TestRunBatch(unittest.TestCase):
+    def test_reports_failures_and_output(self) -> None:
+        dispatcher = Dispatcher(CarouselSession(catalog=EmojiCatalog(GROUPS)))
+        out, err = io.StringIO(), io.StringIO()
+        failures = run_batch(["add grape", "", "l", "show"], dispatcher, out, err)
+        self.assertEqual(failures, 1)
+        self.assertEqual(out.getvalue(), "[🍇]\n")
+        self.assertEqual(err.getvalue(), "line 3: Not enough items to move.\n")
+
+    def test_strict_stops(self) -> None:
+        dispatcher = Dispatcher(CarouselSession(catalog=EmojiCatalog(GROUPS)))
+        out, err = io.StringIO(), io.StringIO()
+        run_batch(["bogus", "add grape"], dispatcher, out, err, strict=True)
+        self.assertEqual(dispatcher.session.size(), 0)
+
+
+class TestCommandLine(unittest.TestCase):
+    def test_capacity_must_be_positive(self) -> None:
+        for value in ("0", "-3", "five"):
+            with redirect_stderr(io.StringIO()) as err, self.assertRaises(SystemExit) as exit:
+                run(["--batch", "-", "--capacity", value])
+            self.assertEqual(exit.exception.code, 2)
+            self.assertIn("--capacity", err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
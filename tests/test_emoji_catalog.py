@@ -1,13 +1,25 @@
 import unittest
 
 from emoji_carousel.emoji_catalog import (
+    EmojiCatalog,
+    annotate_symbols,
     find_by_name,
     find_by_symbol,
+    find_many_by_name,
+    find_many_by_symbol,
+    iter_emojis,
     list_by_category,
+    list_categories,
     load_catalog,
     search_catalog,
+    search_many,
 )
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
 
 class TestEmojiCatalog(unittest.TestCase):
     def test_find_by_name(self) -> None:
@@ -42,6 +54,78 @@ class TestEmojiCatalog(unittest.TestCase):
         results = list_by_category(catalog, "animals")
         self.assertTrue(any(item.category == "animals" for item in results))
 
+    def test_load_catalog_builds_indexed_catalog(self) -> None:
+        catalog = load_catalog()
+        self.assertIsInstance(catalog, EmojiCatalog)
+        self.assertEqual(catalog.find_by_symbol("🍇").name, "grape")
+        self.assertEqual(catalog.list_by_category("FOOD"), list_by_category(catalog, "food"))
+        self.assertEqual(len(catalog.entries), len(list(iter_emojis(catalog))))
+
+    def test_free_functions_accept_raw_groups(self) -> None:
+        groups = [
+            {"class": "Food", "emojis": {"grape": "🍇"}},
+            {"class": "animals", "emojis": {"dog face": "🐶", "grape": "🐙"}},
+        ]
+        self.assertEqual(find_by_name(groups, "grape").symbol, "🍇")
+        self.assertEqual(find_by_symbol(groups, "🐶").name, "dog face")
+        self.assertEqual(list_categories(groups), ["Food", "animals"])
+        self.assertEqual([item.name for item in list_by_category(groups, "food")], ["grape"])
+
+    def test_search_ranks_and_limits(self) -> None:
+        groups = [
+            {
+                "class": "food",
+                "emojis": {"pineapple": "🍍", "red apple": "🍎", "apple": "🍏", "pie": "🥧"},
+                "aliases": {"pie": ["apple pie"]},
+                "keywords": {"pineapple": ["tropical"]},
+            }
+        ]
+        catalog = EmojiCatalog(groups)
+        names = [item.name for item in search_catalog(catalog, "apple")]
+        self.assertEqual(names, ["apple", "red apple", "pineapple", "pie"])
+        limited = search_catalog(catalog, "apple", limit=2)
+        self.assertEqual([item.name for item in limited], ["apple", "red apple"])
+        self.assertEqual([item.name for item in search_catalog(catalog, "tropic")], ["pineapple"])
+        self.assertEqual(catalog.find_by_name("pie").aliases, ("apple pie",))
+
+    def test_fuzzy_matcher(self) -> None:
+        catalog = load_catalog()
+        matcher = catalog.fuzzy_matcher()
+        self.assertIs(matcher, catalog.fuzzy_matcher())
+        self.assertEqual(matcher.suggestions("grpe")[0], "grape")
+        self.assertEqual(matcher.suggestions("dog fase", limit=1), ["dog face"])
+        self.assertEqual(matcher.suggestions("zzzzzz"), [])
+        self.assertLessEqual(len(matcher.suggestions("apple", limit=2, cutoff=0.3)), 2)
+
+    def test_batch_lookups_match_single_ones(self) -> None:
+        catalog = load_catalog()
+        names = ["grape", "not an emoji", "dog face", "grape"]
+        self.assertEqual(
+            find_many_by_name(catalog, names), [find_by_name(catalog, name) for name in names]
+        )
+        symbols = ["🐶", "?", "🍇"]
+        self.assertEqual(
+            find_many_by_symbol(catalog, symbols),
+            [find_by_symbol(catalog, symbol) for symbol in symbols],
+        )
+        results = search_many(catalog, ["gra", " GRA", "zzz"], limit=3)
+        self.assertEqual(results[0], search_catalog(catalog, "gra", limit=3))
+        self.assertIs(results[0], results[1])
+        self.assertEqual(results[2], [])
+
+    def test_annotate_symbols(self) -> None:
+        names, categories = annotate_symbols(load_catalog(), ["🍇", "?", "🐶"])
+        self.assertEqual(names, ["grape", None, "dog face"])
+        self.assertEqual(categories, ["food", None, "animals"])
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_annotate_numpy_array(self) -> None:
+        symbols = numpy.array([["🍇", "?"], ["🐶", "🍇"]])
+        names, categories = annotate_symbols(load_catalog(), symbols)
+        self.assertEqual(names.shape, (2, 2))
+        self.assertEqual(names.tolist(), [["grape", None], ["dog face", "grape"]])
+        self.assertEqual(categories[1, 0], "animals")
+
 
 if __name__ == "__main__":
     unittest.main()
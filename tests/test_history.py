@@ -0,0 +1,97 @@
+import random
+import unittest
+
+from emoji_carousel.carousel import ENGINES
+from emoji_carousel.emoji_catalog import EmojiCatalog
+from emoji_carousel.history import OP_SHUFFLE, History
+from emoji_carousel.session import CarouselSession
+
+
+def state(session: CarouselSession) -> tuple:
+    carousel = session.carousel
+    if carousel.size() == 0:
+        return ()
+    return tuple(carousel), carousel.current_index()
+
+
+def random_step(session: CarouselSession, rng: random.Random) -> bool:
+    # Apply one random operation; False when it could not run.
+    choice = rng.randrange(4)
+    try:
+        if choice == 0 and not session.is_full():
+            session.add(str(rng.randrange(100)), rng.choice(["left", "right"]))
+        elif choice == 1:
+            session.delete()
+        elif choice == 2 and session.size():
+            session.move(rng.choice(["left", "right"]))
+        elif choice == 3:
+            session.shuffle()
+        else:
+            return False
+    except ValueError:
+        return False
+    return True
+
+
+class TestHistory(unittest.TestCase):
+    def make(self, engine: str, **options: int) -> CarouselSession:
+        return CarouselSession(8, engine, EmojiCatalog([]), History(**options))
+
+    def test_undo_redo_match_recorded_states(self) -> None:
+        for engine in ENGINES:
+            for steps in (1, 3, 20):
+                with self.subTest(engine=engine, steps=steps):
+                    rng = random.Random(steps)
+                    session = self.make(engine, snapshot_every=4)
+                    states = [state(session)]
+                    while len(states) < 60:
+                        if random_step(session, rng):
+                            states.append(state(session))
+                    position = len(states) - 1
+                    while position > 0:
+                        position -= session.undo(steps)
+                        self.assertEqual(state(session), states[position])
+                    while position < len(states) - 1:
+                        position += session.redo(steps)
+                        self.assertEqual(state(session), states[position])
+
+    def test_shuffle_undo(self) -> None:
+        session = self.make("linked")
+        for symbol in "ABCDE":
+            session.add(symbol, "right")
+        session.move("left")
+        before = state(session)
+        session.shuffle()
+        self.assertEqual(session.history.records()[-1].op, OP_SHUFFLE)
+        after = state(session)
+        session.undo()
+        self.assertEqual(state(session), before)
+        session.redo()
+        self.assertEqual(state(session), after)
+
+    def test_limit_bounds_history(self) -> None:
+        session = self.make("ring", limit=5, snapshot_every=2)
+        session.add("A")
+        for _ in range(20):
+            session.add("B", "right")
+            session.delete()
+        self.assertEqual(len(session.history), 5)
+        self.assertEqual(session.undo(10), 5)
+        with self.assertRaises(ValueError):
+            session.undo()
+
+    def test_new_action_clears_redo(self) -> None:
+        session = self.make("linked")
+        session.add("A")
+        session.undo()
+        session.add("B")
+        with self.assertRaises(ValueError):
+            session.redo()
+
+    def test_rejects_bad_options(self) -> None:
+        with self.assertRaises(ValueError):
+            History(limit=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
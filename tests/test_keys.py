@@ -0,0 +1,40 @@
+import asyncio
+import io
+import unittest
+
+from emoji_carousel.keys import KEY_BACKSPACE, KEY_ENTER, KEY_LEFT, KEY_RIGHT, KeyReader, split_keys
+
+
+class TestSplitKeys(unittest.TestCase):
+    def test_plain_and_special_keys(self) -> None:
+        keys, tail = split_keys("ab\r\x08\x1b[D\x1b[C")
+        self.assertEqual(keys, ["a", "b", KEY_ENTER, KEY_BACKSPACE, KEY_LEFT, KEY_RIGHT])
+        self.assertEqual(tail, "")
+
+    def test_escape_split_across_reads(self) -> None:
+        keys, tail = split_keys("l\x1b[")
+        self.assertEqual((keys, tail), (["l"], "\x1b["))
+        keys, tail = split_keys(tail + "Dr")
+        self.assertEqual((keys, tail), ([KEY_LEFT, "r"], ""))
+
+    def test_unknown_escape_is_dropped(self) -> None:
+        self.assertEqual(split_keys("\x1b[Zx"), (["x"], ""))
+
+
+class TestKeyReader(unittest.TestCase):
+    def test_stream_input_is_line_mode(self) -> None:
+        async def read_all() -> list:
+            keys = []
+            async with KeyReader(io.StringIO("l\nok\n")) as reader:
+                self.assertFalse(reader.raw)
+                while True:
+                    key = await reader.read_key()
+                    if key is None:
+                        return keys
+                    keys.append(key)
+
+        self.assertEqual(asyncio.run(read_all()), ["l", "\n", "o", "k", "\n"])
+
+
+if __name__ == "__main__":
+    unittest.main()
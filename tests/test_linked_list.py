@@ -1,6 +1,11 @@
+import random
+import sys
 import unittest
+from unittest import mock
 
+from emoji_carousel import symbols
 from emoji_carousel.circular_doubly_linked_list import CircularDoublyLinkedList
+from emoji_carousel.ring_buffer import RingBufferCarousel
 
 
 class TestCircularDoublyLinkedList(unittest.TestCase):
@@ -52,6 +57,177 @@ class TestCircularDoublyLinkedList(unittest.TestCase):
         self.assertEqual(carousel.size(), 3)
         self.assertEqual(set(carousel.to_list()), {"A", "B", "C"})
 
+    def test_positions_track_inserts(self) -> None:
+        carousel = CircularDoublyLinkedList(5)
+        carousel.add("A")
+        carousel.insert("right", "B")
+        carousel.insert("left", "C")
+        self.assertEqual([carousel[i] for i in range(3)], ["A", "C", "B"])
+        self.assertEqual(carousel.current_index(), 1)
+        carousel.move_left()
+        self.assertEqual(carousel.current_index(), 0)
+        carousel.move_left()
+        self.assertEqual(carousel.current_index(), 2)
+        carousel.remove()
+        self.assertEqual(carousel.current_index(), 1)
+        self.assertEqual(carousel.current_item(), "C")
+
+    def test_seek_and_index_of(self) -> None:
+        carousel = CircularDoublyLinkedList(4)
+        carousel.replace_items(["A", "B", "C", "D"])
+        self.assertEqual(carousel.seek(2), "C")
+        self.assertEqual(carousel.peek_left(), "B")
+        self.assertEqual(carousel.peek_right(), "D")
+        self.assertEqual(carousel.seek(-1), "D")
+        self.assertEqual(carousel.current_index(), 3)
+        self.assertEqual(carousel.index_of("B"), 1)
+        self.assertEqual(carousel[-4], "A")
+        with self.assertRaises(IndexError):
+            carousel.seek(4)
+        with self.assertRaises(ValueError):
+            carousel.index_of("Z")
+
+    def test_positions_match_ring_buffer_after_random_edits(self) -> None:
+        # Edits only relink nodes; the positions rebuilt afterwards must
+        # agree with the array-backed engine.
+        rng = random.Random(3)
+        linked = CircularDoublyLinkedList(60)
+        ring = RingBufferCarousel(60)
+        for step in range(400):
+            action = rng.choice(["insert", "insert", "remove", "range", "seek", "move"])
+            for carousel in (linked, ring):
+                state = random.Random(step)
+                if action == "insert" and carousel.size() < 60:
+                    carousel.insert(state.choice(["left", "right"]), f"x{step}")
+                elif action == "remove" and carousel.size():
+                    carousel.remove()
+                elif action == "range" and carousel.size():
+                    count = state.randint(1, carousel.size())
+                    carousel.remove_range(count, state.choice(["left", "right"]))
+                elif action == "seek" and carousel.size():
+                    carousel.seek(state.randrange(carousel.size()))
+                elif action == "move" and carousel.size():
+                    carousel.move_left()
+            self.assertEqual(list(linked), list(ring))
+            if ring.size():
+                self.assertEqual(linked.current_index(), ring.current_index())
+                self.assertEqual(linked.current_item(), ring.current_item())
+
+    def test_symbols_are_interned_across_carousels(self) -> None:
+        first = CircularDoublyLinkedList(2)
+        second = RingBufferCarousel(2)
+        first.add("".join(["gr", "ape"]))
+        second.add("".join(["gra", "pe"]))
+        self.assertIs(first.current_item(), second.current_item())
+
+    def test_intern_table_is_capped(self) -> None:
+        with mock.patch.object(symbols, "MAX_INTERNED", len(symbols._SYMBOLS)):
+            carousel = CircularDoublyLinkedList(2)
+            carousel.add("".join(["not ", "interned"]))
+            self.assertNotIn("not interned", symbols._SYMBOLS)
+            self.assertEqual(carousel.current_item(), "not interned")
+
+    def test_memory_report(self) -> None:
+        carousel = CircularDoublyLinkedList(4)
+        carousel.replace_items(["A", "B", "A", "B"])
+        report = carousel.memory_report()
+        self.assertEqual(report["frames"], 4)
+        self.assertLess(report["bytes_per_frame"], report["legacy_bytes_per_frame"])
+        # Both layouts share the two distinct strings.
+        shared = sys.getsizeof("A") + sys.getsizeof("B")
+        self.assertEqual(
+            report["legacy_total_bytes"], 4 * symbols.legacy_node_bytes() + shared
+        )
+        self.assertFalse(hasattr(carousel._require_current(), "__dict__"))
+
+    def test_insert_many_matches_single_inserts(self) -> None:
+        for position in ("left", "right"):
+            bulk = CircularDoublyLinkedList(6)
+            single = CircularDoublyLinkedList(6)
+            for carousel in (bulk, single):
+                carousel.replace_items(["A", "B"])
+                carousel.move_right()
+            bulk.insert_many(position, ["C", "D", "E"])
+            for item in ["C", "D", "E"]:
+                single.insert(position, item)
+            self.assertEqual(bulk.to_list(), single.to_list())
+            self.assertEqual(bulk.current_index(), single.current_index())
+            self.assertEqual(bulk.peek_left(), single.peek_left())
+
+    def test_insert_many_checks_capacity_once(self) -> None:
+        carousel = CircularDoublyLinkedList(3)
+        carousel.add("A")
+        with self.assertRaises(ValueError):
+            carousel.insert_many("right", ["B", "C", "D"])
+        self.assertEqual(carousel.to_list(), ["A"])
+
+    def test_remove_range(self) -> None:
+        carousel = CircularDoublyLinkedList(5)
+        carousel.replace_items(["A", "B", "C", "D", "E"])
+        carousel.seek(1)
+        self.assertEqual(carousel.remove_range(3, "left"), ["B", "A", "E"])
+        self.assertEqual(carousel.current_item(), "D")
+        self.assertEqual([carousel[i] for i in range(2)], ["C", "D"])
+        self.assertEqual(carousel.peek_right(), "C")
+        self.assertEqual(carousel.remove_range(2, "right"), ["D", "C"])
+        self.assertEqual(carousel.size(), 0)
+
+    def test_splice_and_rotate(self) -> None:
+        carousel = CircularDoublyLinkedList(5)
+        carousel.replace_items(["A", "B"])
+        other = CircularDoublyLinkedList(3)
+        other.replace_items(["X", "Y", "Z"])
+        other.move_right()
+        carousel.splice(other)
+        self.assertEqual(other.size(), 0)
+        self.assertEqual([carousel[i] for i in range(5)], ["A", "Y", "Z", "X", "B"])
+        self.assertEqual(carousel.current_item(), "X")
+        self.assertEqual(carousel.peek_right(), "B")
+        self.assertEqual(carousel.rotate(2), "A")
+        self.assertEqual(carousel.rotate(-1), "B")
+
+    def test_splice_left_keeps_order(self) -> None:
+        for engine in (CircularDoublyLinkedList, RingBufferCarousel):
+            for source in (CircularDoublyLinkedList, RingBufferCarousel):
+                carousel = engine(4)
+                carousel.add("X")
+                other = source(3)
+                other.replace_items(["a", "b", "c"])
+                carousel.splice(other, "left")
+                self.assertEqual(list(carousel), ["a", "b", "c", "X"])
+                self.assertEqual(carousel.current_item(), "a")
+                self.assertEqual(carousel.current_index(), 0)
+
+    def test_lazy_iteration(self) -> None:
+        carousel = CircularDoublyLinkedList(5)
+        carousel.replace_items(["A", "B", "C", "D"])
+        carousel.seek(1)
+        self.assertEqual(list(carousel), ["A", "B", "C", "D"])
+        self.assertEqual(list(reversed(carousel)), ["D", "C", "B", "A"])
+        self.assertEqual(list(carousel.iter_from_current()), ["B", "C", "D", "A"])
+        self.assertEqual(list(carousel.iter_from_current(reverse=True)), ["B", "A", "D", "C"])
+        self.assertEqual(list(carousel.iter_window(3)), ["A", "B", "C"])
+        self.assertEqual(list(carousel.iter_window(10)), ["A", "B", "C", "D"])
+
+    def test_iteration_detects_changes(self) -> None:
+        carousel = CircularDoublyLinkedList(5)
+        carousel.replace_items(["A", "B", "C"])
+        iterator = carousel.iter_from_current()
+        next(iterator)
+        carousel.insert("right", "D")
+        with self.assertRaises(RuntimeError):
+            next(iterator)
+
+    def test_shuffle_in_place(self) -> None:
+        carousel = CircularDoublyLinkedList(6)
+        carousel.replace_items(["A", "B", "C", "D", "E", "F"])
+        nodes = set(map(id, carousel._node_list()))
+        carousel.shuffle(random.Random(7))
+        self.assertEqual(set(map(id, carousel._node_list())), nodes)
+        self.assertEqual(sorted(carousel), ["A", "B", "C", "D", "E", "F"])
+        self.assertEqual(carousel.to_list(), list(carousel))
+        self.assertEqual(carousel.peek_left(), carousel[-1])
+
 
 if __name__ == "__main__":
     unittest.main()
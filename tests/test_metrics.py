@@ -0,0 +1,104 @@
+import json
+import unittest
+
+from emoji_carousel import metrics
+from emoji_carousel.circular_doubly_linked_list import CircularDoublyLinkedList
+from emoji_carousel.commands import lookup, perform
+from emoji_carousel.emoji_catalog import EmojiCatalog, find_by_name
+from emoji_carousel.metrics import METRICS, NULL_TIMER, Metrics
+from emoji_carousel.ring_buffer import RingBufferCarousel
+from emoji_carousel.session import CarouselSession
+
+GROUPS = [{"class": "Food", "emojis": {"grape": "🍇", "lemon": "🍋"}}]
+
+
+class TestMetrics(unittest.TestCase):
+    def test_disabled_records_nothing(self) -> None:
+        registry = Metrics()
+        self.assertIs(registry.timer("x"), NULL_TIMER)
+        registry.increment("calls")
+        registry.observe("x", 0.5)
+        self.assertEqual(registry.snapshot(), {"counters": {}, "histograms": {}})
+
+    def test_histograms_and_exports(self) -> None:
+        registry = Metrics(buckets=(0.001, 0.1))
+        registry.enabled = True
+        for seconds in (0.0005, 0.001, 0.05, 3.0):
+            registry.observe("latency", seconds, op="add")
+        registry.increment("calls", op='say "hi"')
+        histogram = registry.snapshot()["histograms"]["latency"][0]
+        self.assertEqual(histogram["count"], 4)
+        self.assertEqual(histogram["max"], 3.0)
+        self.assertEqual(histogram["buckets"], {"0.001": 2, "0.1": 3, "+Inf": 4})
+        self.assertEqual(json.loads(registry.to_json())["counters"]["calls"][0]["value"], 1)
+        text = registry.to_prometheus("app_")
+        self.assertIn("# TYPE app_latency histogram", text)
+        self.assertIn('app_latency_bucket{op="add",le="0.1"} 3', text)
+        self.assertIn('app_latency_count{op="add"} 4', text)
+        self.assertIn('app_calls{op="say \\"hi\\""} 1', text)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self) -> None:
+        original = CircularDoublyLinkedList.insert
+        metrics.enable()
+        self.addCleanup(METRICS.reset)
+        self.addCleanup(metrics.disable)
+        self.assertIsNot(CircularDoublyLinkedList.insert, original)
+        self.original = original
+
+    def counts(self, name: str) -> dict:
+        series = METRICS.snapshot()["histograms"].get(name, [])
+        return {tuple(sorted(item["labels"].items())): item["count"] for item in series}
+
+    def test_wrapped_methods_are_timed_without_caller_changes(self) -> None:
+        carousel = CircularDoublyLinkedList(3)
+        carousel.add("A")
+        carousel.insert("left", "B")
+        self.assertEqual(find_by_name(EmojiCatalog(GROUPS), "grape").symbol, "🍇")
+        carousel_counts = self.counts("carousel_seconds")
+        self.assertEqual(carousel_counts[(("engine", "linked"), ("op", "insert"))], 1)
+        self.assertEqual(self.counts("catalog_seconds")[(("op", "find_by_name"),)], 1)
+        metrics.disable()
+        self.assertIs(CircularDoublyLinkedList.insert, self.original)
+
+    def test_bulk_and_positional_calls_are_timed(self) -> None:
+        for engine, carousel in (
+            ("linked", CircularDoublyLinkedList(6)),
+            ("ring", RingBufferCarousel(6)),
+        ):
+            carousel.insert_many("right", ["A", "B", "C"])
+            carousel.rotate(1)
+            self.assertEqual(carousel[0], "A")
+            counts = self.counts("carousel_seconds")
+            for op in ("insert_many", "rotate", "__getitem__"):
+                self.assertEqual(counts[(("engine", engine), ("op", op))], 1)
+
+    def test_commands_count_outcomes_and_phases(self) -> None:
+        session = CarouselSession(catalog=EmojiCatalog(GROUPS))
+        add = lookup("add")
+        perform(session, add, add.parse(["grape"]), play=lambda frames: None)
+        delete = lookup("del")
+        perform(session, delete, ())
+        with self.assertRaises(ValueError):
+            perform(session, delete, ())
+        counters = METRICS.snapshot()["counters"]["commands_total"]
+        values = {(item["labels"]["command"], item["labels"]["outcome"]): item["value"] for item in counters}
+        self.assertEqual(values, {("add", "ok"): 1, ("del", "ok"): 1, ("del", "error"): 1})
+        phases = self.counts("phase_seconds")
+        self.assertEqual(phases[(("command", "add"), ("phase", "render"))], 1)
+        self.assertNotIn((("command", "del"), ("phase", "render")), phases)
+
+    def test_disable_stops_command_timing(self) -> None:
+        session = CarouselSession(catalog=EmojiCatalog(GROUPS))
+        show = lookup("metrics")
+        perform(session, show, show.parse([]))
+        metrics.disable()
+        with self.assertRaises(ValueError):
+            perform(session, show, show.parse([]))
+        counters = METRICS.snapshot()["counters"]["commands_total"]
+        self.assertEqual([item["labels"]["outcome"] for item in counters], ["ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
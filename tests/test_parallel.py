@@ -0,0 +1,61 @@
+import unittest
+from unittest import mock
+
+from emoji_carousel.emoji_catalog import EmojiCatalog, load_catalog
+from emoji_carousel.parallel import ShardedSearch, split_groups
+
+GROUPS = [
+    {
+        "class": "Food",
+        "emojis": {"pineapple": "🍍", "red apple": "🍎", "apple": "🍏", "pie": "🥧"},
+        "aliases": {"pie": ["apple pie"]},
+        "keywords": {"pineapple": ["tropical"]},
+    },
+    {"class": "Animals", "emojis": {"ape": "🦍", "apple": "🍏", "cat": "🐱"}},
+]
+
+
+class TestSplitGroups(unittest.TestCase):
+    def test_shards_keep_entry_order(self) -> None:
+        catalog = EmojiCatalog(GROUPS)
+        for shards in (1, 2, 3, 7, 20):
+            parts = split_groups(GROUPS, shards)
+            self.assertLessEqual(len(parts), shards)
+            rebuilt = []
+            for offset, groups in parts:
+                self.assertEqual(offset, len(rebuilt))
+                rebuilt.extend(EmojiCatalog(groups).entries)
+            self.assertEqual(tuple(rebuilt), catalog.entries)
+
+
+class TestShardedSearch(unittest.TestCase):
+    def test_matches_single_catalog(self) -> None:
+        catalog = load_catalog()
+        queries = ["apple", "a", "face", "food", "zzz", "", "cat", "Dog"]
+        with ShardedSearch(catalog, shards=3) as sharded:
+            self.assertEqual(sharded.shards, 3)
+            for limit in (None, 3):
+                expected = [catalog.search(query, limit) for query in queries]
+                self.assertEqual(sharded.search_many(queries, limit), expected)
+            self.assertEqual(sharded.search("grape"), catalog.search("grape"))
+            self.assertEqual(sharded.fuzzy_suggestions("grpe")[0], "grape")
+            self.assertEqual(sharded.fuzzy_suggestions("zzzzzz"), [])
+            with self.assertRaises(ValueError):
+                sharded.fuzzy_suggestions("grape", limit=0)
+
+    def test_parent_does_not_build_the_catalog(self) -> None:
+        # Workers are spawned, so the patch only affects this process.
+        with mock.patch.object(EmojiCatalog, "__init__", side_effect=AssertionError):
+            with ShardedSearch(GROUPS, shards=2) as sharded:
+                names = [info.name for info in sharded.search("apple")]
+        self.assertEqual(names, ["apple", "red apple", "pineapple", "pie"])
+
+    def test_duplicate_names_across_shards(self) -> None:
+        catalog = EmojiCatalog(GROUPS)
+        with ShardedSearch(catalog, shards=2) as sharded:
+            self.assertEqual(sharded.search("ap"), catalog.search("ap"))
+            self.assertEqual(sharded.search("animals"), catalog.search("animals"))
+
+
+if __name__ == "__main__":
+    unittest.main()
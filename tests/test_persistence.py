@@ -0,0 +1,98 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from emoji_carousel.carousel import ENGINES
+from emoji_carousel.emoji_catalog import EmojiCatalog
+from emoji_carousel.persistence import (
+    close_session,
+    journal_path_for,
+    load_session,
+    open_session,
+    save_session,
+)
+
+GROUPS = [{"class": "Food", "emojis": {"grape": "🍇", "lemon": "🍋"}}]
+CATALOG = EmojiCatalog(GROUPS)
+
+
+def build(session) -> None:
+    random.seed(7)
+    session.add("A")
+    session.add("B", "right")
+    session.add("C", "left")
+    session.move("right")
+    session.shuffle()
+    session.delete()
+
+
+def state(session):
+    return list(session.carousel), session.carousel.current_index()
+
+
+class TestPersistence(unittest.TestCase):
+    def setUp(self) -> None:
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = Path(folder.name) / "s.carousel"
+
+    def test_save_and_load_round_trip(self) -> None:
+        for engine in sorted(ENGINES):
+            with self.subTest(engine=engine):
+                session = load_session(self.path, engine, 4, CATALOG)
+                build(session)
+                save_session(session, self.path)
+                loaded = load_session(self.path, catalog=CATALOG)
+                self.assertEqual(loaded.engine, engine)
+                self.assertEqual(loaded.capacity, 4)
+                self.assertEqual(state(loaded), state(session))
+                # The history came along: undo the delete, then the shuffle.
+                loaded.undo(2)
+                session.undo(2)
+                self.assertEqual(state(loaded), state(session))
+                self.path.unlink()
+
+    def test_journal_replays_unsaved_changes(self) -> None:
+        session = open_session(self.path, catalog=CATALOG)
+        build(session)
+        session.undo()
+        session.redo()
+        session.undo()
+        # No save yet: the journal alone rebuilds the session.
+        loaded = load_session(self.path, catalog=CATALOG)
+        self.assertEqual(state(loaded), state(session))
+        self.assertTrue(loaded.history.can_redo())
+        close_session(session, self.path)
+        self.assertEqual(journal_path_for(self.path).read_text(encoding="utf-8"), "[1,1]\n")
+
+    def test_stale_journal_is_ignored(self) -> None:
+        session = open_session(self.path, catalog=CATALOG)
+        session.add("A")
+        stale = journal_path_for(self.path).read_bytes()
+        session.add("B", "right")
+        close_session(session, self.path)
+        # A journal from before the save must not be replayed on top of it.
+        journal_path_for(self.path).write_bytes(stale)
+        loaded = load_session(self.path, catalog=CATALOG)
+        self.assertEqual(list(loaded.carousel), ["A", "B"])
+
+    def test_torn_last_line_is_dropped(self) -> None:
+        session = open_session(self.path, catalog=CATALOG)
+        session.add("A")
+        session.journal._handle.write('[0,1,0,"B"'.encode("utf-8"))
+        session.journal.close()
+        reopened = open_session(self.path, catalog=CATALOG)
+        self.assertEqual(list(reopened.carousel), ["A"])
+        reopened.add("C", "left")
+        reopened.journal.close()
+        self.assertEqual(list(load_session(self.path, catalog=CATALOG).carousel), ["C", "A"])
+
+    def test_rejects_other_files(self) -> None:
+        self.path.write_text("[]", encoding="utf-8")
+        with self.assertRaises(ValueError):
+            load_session(self.path, catalog=CATALOG)
+
+
+if __name__ == "__main__":
+    unittest.main()
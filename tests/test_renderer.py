@@ -0,0 +1,37 @@
+import io
+import unittest
+
+from emoji_carousel.renderer import CLEAR, FrameRenderer
+
+
+class _CountingStream(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+    def flush(self) -> None:
+        self.flushes += 1
+        super().flush()
+
+
+class TestFrameRenderer(unittest.TestCase):
+    def test_frame_is_one_write(self) -> None:
+        stream = _CountingStream()
+        renderer = FrameRenderer(stream)
+        renderer.write_frame("line one\nline two\n")
+        self.assertEqual(stream.getvalue(), CLEAR + "line one\nline two\n")
+        self.assertEqual((stream.writes, stream.flushes), (1, 1))
+
+    def test_clear(self) -> None:
+        stream = _CountingStream()
+        FrameRenderer(stream).clear()
+        self.assertEqual(stream.getvalue(), CLEAR)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import random
+import unittest
+
+from emoji_carousel.carousel import create_carousel
+from emoji_carousel.circular_doubly_linked_list import CircularDoublyLinkedList
+from emoji_carousel.ring_buffer import RingBufferCarousel
+
+
+class TestRingBufferCarousel(unittest.TestCase):
+    def test_add_and_insert(self) -> None:
+        carousel = RingBufferCarousel(3)
+        carousel.add("A")
+        carousel.insert("left", "B")
+        carousel.insert("right", "C")
+        self.assertEqual(carousel.size(), 3)
+        self.assertEqual(carousel.to_list(), ["C", "A", "B"])
+
+    def test_move_and_remove(self) -> None:
+        carousel = RingBufferCarousel(3)
+        carousel.replace_items(["A", "B", "C"])
+        self.assertEqual(carousel.move_left(), "C")
+        self.assertEqual(carousel.peek_right(), "A")
+        self.assertEqual(carousel.remove(), "C")
+        self.assertEqual(carousel.current_item(), "B")
+        self.assertEqual(carousel.to_list(), ["B", "A"])
+
+    def test_capacity_limit(self) -> None:
+        carousel = RingBufferCarousel(1)
+        carousel.add("A")
+        with self.assertRaises(ValueError):
+            carousel.insert("right", "B")
+
+    def test_empty_raises(self) -> None:
+        carousel = RingBufferCarousel(2)
+        with self.assertRaises(IndexError):
+            carousel.current_item()
+
+    def test_seek_and_index_of(self) -> None:
+        carousel = RingBufferCarousel(4)
+        carousel.replace_items(["A", "B", "C"])
+        self.assertEqual(carousel.seek(-1), "C")
+        self.assertEqual(carousel.current_index(), 2)
+        self.assertEqual(carousel.index_of("B"), 1)
+        self.assertEqual(carousel[0], "A")
+        with self.assertRaises(IndexError):
+            carousel[3]
+
+    def test_iteration_and_shuffle(self) -> None:
+        carousel = RingBufferCarousel(5)
+        carousel.replace_items(["A", "B", "C", "D"])
+        carousel.seek(3)
+        self.assertEqual(list(carousel.iter_from_current()), ["D", "A", "B", "C"])
+        self.assertEqual(list(carousel.iter_window(3)), ["C", "D", "A"])
+        iterator = iter(carousel)
+        carousel.shuffle(random.Random(3))
+        with self.assertRaises(RuntimeError):
+            next(iterator)
+        self.assertEqual(sorted(carousel), ["A", "B", "C", "D"])
+        self.assertEqual(carousel.current_index(), 0)
+
+    def test_matches_linked_list(self) -> None:
+        ring = RingBufferCarousel(8)
+        linked = CircularDoublyLinkedList(8)
+        script = [
+            ("insert", "left", "A"),
+            ("insert", "right", "B"),
+            ("insert", "left", "C"),
+            ("move_left",),
+            ("insert", "right", "D"),
+            ("remove",),
+            ("move_right",),
+            ("insert", "left", "E"),
+            ("remove",),
+            ("remove",),
+        ]
+        for step in script:
+            for carousel in (ring, linked):
+                getattr(carousel, step[0])(*step[1:])
+            self.assertEqual(ring.to_list(), linked.to_list())
+            if ring.size():
+                self.assertEqual(ring.current_index(), linked.current_index())
+
+    def test_bulk_operations_match_linked_list(self) -> None:
+        ring = RingBufferCarousel(12)
+        linked = CircularDoublyLinkedList(12)
+        script = [
+            ("insert_many", "left", ["A", "B"]),
+            ("insert_many", "right", ["C", "D", "E"]),
+            ("rotate", -4),
+            ("insert_many", "left", ["F", "G"]),
+            ("remove_range", 3, "right"),
+            ("rotate", 5),
+            ("remove_range", 2, "left"),
+        ]
+        for step in script:
+            results = [getattr(carousel, step[0])(*step[1:]) for carousel in (ring, linked)]
+            self.assertEqual(results[0], results[1])
+            self.assertEqual(ring.to_list(), linked.to_list())
+            self.assertEqual(
+                [ring[i] for i in range(ring.size())],
+                [linked[i] for i in range(linked.size())],
+            )
+
+    def test_create_carousel(self) -> None:
+        self.assertIsInstance(create_carousel(3, "ring"), RingBufferCarousel)
+        self.assertIsInstance(create_carousel(3), CircularDoublyLinkedList)
+        with self.assertRaises(ValueError):
+            create_carousel(3, "tree")
+
+
+if __name__ == "__main__":
+    unittest.main()
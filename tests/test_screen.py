@@ -0,0 +1,75 @@
+import re
+import unittest
+from typing import List
+
+from emoji_carousel.screen import Screen
+
+_TOKEN = re.compile(r"\x1b\[(\d*)(?:;(\d*))?([HJK])|\n|[^\x1b\n]")
+
+
+def play(terminal: List[List[str]], cursor: List[int], data: str) -> None:
+    # Tiny terminal model: cursor moves, erase line/below, plain characters.
+    for match in _TOKEN.finditer(data):
+        token = match.group(0)
+        if token == "\n":
+            cursor[0] += 1
+            cursor[1] = 0
+        elif match.group(3) == "H":
+            cursor[0] = int(match.group(1) or 1) - 1
+            cursor[1] = int(match.group(2) or 1) - 1
+        elif match.group(3) == "K":
+            del terminal[cursor[0]][cursor[1]:]
+        elif match.group(3) == "J":
+            if match.group(1) == "2":
+                for row in terminal:
+                    row.clear()
+            else:
+                del terminal[cursor[0]][cursor[1]:]
+                for row in terminal[cursor[0] + 1:]:
+                    row.clear()
+        else:
+            row = terminal[cursor[0]]
+            row.extend(" " * (cursor[1] - len(row)))
+            row[cursor[1]:cursor[1] + 1] = [token]
+            cursor[1] += 1
+
+
+def visible(terminal: List[List[str]]) -> str:
+    return "\n".join("".join(row).rstrip() for row in terminal).rstrip("\n")
+
+
+class TestScreen(unittest.TestCase):
+    def test_diff_reproduces_frames(self) -> None:
+        frames = [
+            "  [A]   B   C\nPosition: 1/3\nmenu\n",
+            "  [B]   C   A\nPosition: 2/3\nmenu\n",
+            "  [B]   C\nmenu\n",
+            "  [B]   C   A   D\nPosition: 4/4\nmenu\nmore\n",
+        ]
+        screen = Screen()
+        terminal = [[] for _ in range(10)]
+        cursor = [0, 0]
+        for frame in frames:
+            play(terminal, cursor, screen.update(frame))
+            self.assertEqual(visible(terminal), frame.rstrip("\n"))
+            self.assertEqual(cursor, [frame.count("\n"), 0])
+            # Echoed input below the frame must not survive the next update.
+            play(terminal, cursor, ">> typed")
+
+    def test_unchanged_rows_cost_nothing(self) -> None:
+        screen = Screen()
+        screen.update("header\nA\nfooter\n")
+        update = screen.update("header\nB\nfooter\n")
+        self.assertNotIn("header", update)
+        self.assertNotIn("footer", update)
+        self.assertIn("B", update)
+
+    def test_invalidate_forces_full_redraw(self) -> None:
+        screen = Screen()
+        screen.update("one\n")
+        screen.invalidate()
+        self.assertTrue(screen.update("one\n").startswith("\x1b[H\x1b[2J"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+
+from emoji_carousel.search_index import FIELD_ALIAS, FIELD_NAME, NGramIndex
+
+
+class TestNGramIndex(unittest.TestCase):
+    def test_substring_matches(self) -> None:
+        index = NGramIndex()
+        index.add(0, "Red Apple")
+        index.add(1, "pineapple")
+        index.add(2, "grape")
+        index.add(2, "vine fruit", FIELD_ALIAS)
+        self.assertEqual(list(index.matches("apple")), [0, 1])
+        self.assertEqual(list(index.matches("ap")), [0, 1, 2])
+        self.assertEqual(list(index.matches("pplx")), [])
+        self.assertEqual(index.term(3), (2, FIELD_ALIAS, "vine fruit"))
+        self.assertEqual(index.term(0), (0, FIELD_NAME, "red apple"))
+
+    def test_grams_must_be_contiguous(self) -> None:
+        index = NGramIndex()
+        index.add(0, "abcxbcd")
+        self.assertEqual(list(index.matches("abcd")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
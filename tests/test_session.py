@@ -0,0 +1,47 @@
+import unittest
+
+from emoji_carousel.emoji_catalog import EmojiCatalog
+from emoji_carousel.session import CarouselSession
+
+GROUPS = [{"class": "Food", "emojis": {"grape": "🍇", "lemon": "🍋"}}]
+
+
+class TestCarouselSession(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session = CarouselSession(capacity=3, catalog=EmojiCatalog(GROUPS))
+
+    def test_add_delete_and_undo(self) -> None:
+        session = self.session
+        session.add("A")
+        session.add("B", "right")
+        session.add("C", "left")
+        self.assertTrue(session.is_full())
+        self.assertEqual(list(session.carousel), ["A", "C", "B"])
+        self.assertEqual(session.delete(), "C")
+        session.undo()
+        self.assertEqual(list(session.carousel), ["A", "C", "B"])
+        self.assertEqual(session.carousel.current_item(), "C")
+
+    def test_move_and_undo(self) -> None:
+        session = self.session
+        session.add("A")
+        session.add("B", "right")
+        session.move("right")
+        self.assertEqual(session.carousel.current_item(), "A")
+        session.undo()
+        self.assertEqual(session.carousel.current_item(), "B")
+        with self.assertRaises(ValueError):
+            session.move("up")
+
+    def test_errors(self) -> None:
+        with self.assertRaises(ValueError):
+            self.session.undo()
+        with self.assertRaises(ValueError):
+            self.session.shuffle()
+        self.assertIn(self.session.random_emoji().name, {"grape", "lemon"})
+        with self.assertRaises(ValueError):
+            CarouselSession(catalog=EmojiCatalog([])).random_emoji()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from emoji_carousel.emoji_catalog import EmojiCatalog
+from emoji_carousel.session_manager import SessionManager
+
+GROUPS = [{"class": "Food", "emojis": {"grape": "🍇", "lemon": "🍋"}}]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSessionManager(unittest.TestCase):
+    def setUp(self) -> None:
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.directory = Path(folder.name)
+        self.clock = FakeClock()
+        self.catalog = EmojiCatalog(GROUPS)
+
+    def manager(self, **options) -> SessionManager:
+        return SessionManager(
+            self.directory, catalog=self.catalog, clock=self.clock, **options
+        )
+
+    def test_sessions_are_independent_and_share_the_catalog(self) -> None:
+        manager = self.manager(capacity=2)
+        first = manager.get("alice")
+        second = manager.get("bob", capacity=7)
+        self.assertIs(manager.get("alice"), first)
+        first.add("🍇")
+        self.assertEqual(second.size(), 0)
+        self.assertEqual((first.capacity, second.capacity), (2, 7))
+        self.assertIs(first.catalog, second.catalog)
+        second.add("🍇")
+        self.assertIs(list(first.carousel)[0], list(second.carousel)[0])
+
+    def test_idle_sessions_are_evicted_and_reloaded(self) -> None:
+        manager = self.manager(idle_timeout=10)
+        session = manager.get("alice", capacity=3)
+        session.add("🍇")
+        session.add("🍋", "right")
+        self.clock.now = 5
+        manager.get("bob")
+        self.clock.now = 12
+        self.assertEqual(manager.evict_idle(), 1)
+        self.assertEqual(manager.live_ids(), ["bob"])
+        self.assertEqual(manager.saved_ids(), ["alice"])
+        del session
+        reloaded = manager.get("alice")
+        self.assertEqual(list(reloaded.carousel), ["🍇", "🍋"])
+        self.assertEqual(reloaded.capacity, 3)
+        reloaded.undo()
+        self.assertEqual(list(reloaded.carousel), ["🍇"])
+        self.assertEqual(manager.stats()["loaded"], 1)
+
+    def test_held_sessions_are_not_evicted(self) -> None:
+        manager = self.manager(idle_timeout=10, max_live=1)
+        with manager.hold("alice") as session:
+            session.add("🍇")
+            self.clock.now = 50
+            manager.get("bob")
+            self.assertEqual(manager.evict_idle(), 0)
+            self.assertFalse(manager.evict("alice"))
+            self.assertIn("alice", manager)
+            session.add("🍋", "right")
+        # bob went over max_live instead, since alice was held.
+        self.assertEqual(manager.live_ids(), ["alice"])
+        manager.close()
+        self.assertEqual(list(manager.get("alice").carousel), ["🍇", "🍋"])
+
+    def test_evicted_session_still_in_use_is_not_reloaded(self) -> None:
+        manager = self.manager(idle_timeout=10)
+        session = manager.get("alice")
+        session.add("🍇")
+        self.clock.now = 20
+        self.assertEqual(manager.evict_idle(), 1)
+        # The caller keeps changing its copy after the eviction.
+        session.add("🍋", "right")
+        self.assertIs(manager.get("alice"), session)
+        self.assertEqual(manager.stats()["revived"], 1)
+        self.clock.now = 40
+        manager.evict_idle()
+        session.add("🍇", "right")
+        manager.close()
+        del session
+        self.assertEqual(list(manager.get("alice").carousel), ["🍇", "🍋", "🍇"])
+
+    def test_close_while_held_saves_on_release(self) -> None:
+        manager = self.manager()
+        with manager.hold("alice") as session:
+            manager.close()
+            session.add("🍇")
+        del session
+        self.assertEqual(list(manager.get("alice").carousel), ["🍇"])
+
+    def test_capacity_must_be_positive(self) -> None:
+        manager = self.manager()
+        for capacity in (0, -1):
+            with self.assertRaises(ValueError):
+                manager.get("alice", capacity=capacity)
+        self.assertNotIn("alice", manager)
+
+    def test_max_live_evicts_least_recently_used(self) -> None:
+        manager = self.manager(idle_timeout=None, max_live=2)
+        manager.get("a")
+        manager.get("b")
+        manager.get("a")
+        manager.get("c")
+        self.assertEqual(manager.live_ids(), ["a", "c"])
+        manager.close()
+        self.assertEqual(len(manager), 0)
+        self.assertEqual(manager.saved_ids(), ["a", "b", "c"])
+
+    def test_without_directory_nothing_is_evicted(self) -> None:
+        manager = SessionManager(catalog=self.catalog, clock=self.clock, idle_timeout=1)
+        manager.get("a")
+        self.clock.now = 100
+        self.assertEqual(manager.evict_idle(), 0)
+        self.assertIn("a", manager)
+
+    def test_rejects_unsafe_ids(self) -> None:
+        manager = self.manager()
+        for session_id in ("", "../x", "a/b", ".hidden"):
+            with self.assertRaises(ValueError):
+                manager.get(session_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Modules the first prompt must not need.
+DEFERRED = [
+    "argparse",
+    "asyncio",
+    "colorama",
+    "dataclasses",
+    "difflib",
+    "emoji_carousel.catalog_cache",
+    "emoji_carousel.emoji_catalog",
+    "emoji_carousel.metrics",
+    "emoji_carousel.persistence",
+    "json",
+    "random",
+    "shlex",
+]
+
+
+def run_python(code: str) -> str:
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    return subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    ).stdout
+
+
+class TestStartup(unittest.TestCase):
+    def test_first_prompt_defers_heavy_imports(self) -> None:
+        code = (
+            "import sys\n"
+            "from emoji_carousel.app import menu_frame\n"
+            "from emoji_carousel.session import CarouselSession\n"
+            "menu_frame(CarouselSession())\n"
+            f"print(sorted(set({DEFERRED!r}) & set(sys.modules)))\n"
+        )
+        self.assertEqual(run_python(code).strip(), "[]")
+
+    def test_startup_report(self) -> None:
+        code = (
+            "import time\n"
+            "started = time.perf_counter()\n"
+            "from emoji_carousel.app import run\n"
+            "run(['--startup-report'], started)\n"
+        )
+        output = run_python(code)
+        self.assertIn("arguments:", output)
+        self.assertIn("first prompt:", output)
+        self.assertIn("catalog loaded: no", output)
+
+
+if __name__ == "__main__":
+    unittest.main()